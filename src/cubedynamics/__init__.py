@@ -27,6 +27,7 @@ Documentation inventory:
 from .version import __version__
 from .piping import Pipe, pipe
 from . import verbs
+from . import cache
 from . import tubes
 from .demo_vase import demo
 import xarray as xr
@@ -85,6 +86,7 @@ __all__ = [
     "Pipe",
     "pipe",
     "verbs",
+    "cache",
     "plot",
     "load_gridmet_cube",
     "load_prism_cube",
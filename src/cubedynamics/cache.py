@@ -0,0 +1,635 @@
+"""Unified, content-addressed download cache shared by all loaders.
+
+Downloaded files are stored once per content hash under
+``<root>/blobs/<sha[:2]>/<sha256><suffix>`` and located through small JSON
+index entries keyed by URL (``<root>/index/<hash of url>.json``) that record
+the checksum, size, ``ETag`` and ``Last-Modified`` of the response.
+
+- Writes are atomic: bodies stream into ``<root>/tmp`` while being hashed and
+  are renamed into place only when complete, so readers never see a
+  half-written file.
+- Cached entries are revalidated with conditional requests
+  (``If-None-Match`` / ``If-Modified-Since``); a ``304`` reuses the blob and
+  network errors fall back to the cached copy with a warning. Entries
+  without either validator are served from the cache as they are.
+- Files derived from downloads (e.g. members extracted from an archive) can
+  be added with :meth:`DownloadCache.put` so they count towards the cap.
+- Per-URL lock files (``fcntl.flock``) serialize downloads of the same URL
+  across threads and processes sharing a cache directory; a root lock
+  guards index updates and eviction. Locking is skipped on platforms
+  without :mod:`fcntl`.
+- The total size is capped (``CUBEDYNAMICS_CACHE_MAX_BYTES``, default
+  ``20GB``) and least-recently-used blobs are evicted first; recency is the
+  blob modification time, refreshed on every access.
+- Paths handed out by :meth:`DownloadCache.fetch_many` are never evicted by
+  the batch that produced them, and :meth:`DownloadCache.pin` protects
+  paths from eviction by any process sharing the cache while they are used.
+- :class:`~cubedynamics.streaming.TileCache` stores VirtualCube tiles in the
+  same cache, so tiles and downloads share one cap, lock set and checksums.
+
+The module-level helpers (:func:`info`, :func:`prune`, :func:`verify`,
+:func:`clear`, :func:`fetch`) operate on the default cache at
+``CUBEDYNAMICS_CACHE_DIR`` (``~/.cache/cubedynamics/downloads``), e.g.
+``cubedynamics.cache.info()``.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+import warnings
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Collection, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+from urllib.parse import urlparse
+
+import requests
+from dask.utils import parse_bytes
+
+from cubedynamics.streaming.fetch import DEFAULT_MAX_WORKERS, get_session, map_concurrent
+
+try:  # pragma: no cover - platform dependent
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("CUBEDYNAMICS_CACHE_DIR", Path.home() / ".cache" / "cubedynamics" / "downloads")
+)
+DEFAULT_MAX_BYTES = os.environ.get("CUBEDYNAMICS_CACHE_MAX_BYTES", "20GB")
+_CHUNK_SIZE = 1024 * 1024
+
+
+class ChecksumMismatch(OSError):
+    """Raised when downloaded or cached content does not match its checksum."""
+
+
+@contextlib.contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on ``path`` (no-op without fcntl)."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _url_key(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as handle:
+        json.dump(payload, handle, sort_keys=True)
+    os.replace(tmp_name, path)
+
+
+class DownloadCache:
+    """Content-addressed, size-capped cache of downloaded files.
+
+    Parameters
+    ----------
+    root : str or Path, optional
+        Cache directory. Defaults to ``CUBEDYNAMICS_CACHE_DIR`` or
+        ``~/.cache/cubedynamics/downloads``.
+    max_bytes : int or str, optional
+        Upper bound on the total size of cached blobs. Defaults to
+        ``CUBEDYNAMICS_CACHE_MAX_BYTES`` or ``"20GB"``.
+    """
+
+    def __init__(self, root: str | Path | None = None, *, max_bytes: int | str | None = None) -> None:
+        self.root = Path(root) if root is not None else DEFAULT_CACHE_DIR
+        self.max_bytes = parse_bytes(max_bytes if max_bytes is not None else DEFAULT_MAX_BYTES)
+        for sub in ("blobs", "index", "locks", "pins", "tmp"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+        self.evictions = 0
+
+    # -- layout -----------------------------------------------------------------
+    def _entry_path(self, url: str) -> Path:
+        return self.root / "index" / f"{_url_key(url)}.json"
+
+    def _blob_path(self, sha256: str, suffix: str) -> Path:
+        return self.root / "blobs" / sha256[:2] / f"{sha256}{suffix}"
+
+    def _root_lock(self):
+        return _file_lock(self.root / "locks" / "root.lock")
+
+    def _read_entry(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._entry_path(url)) as handle:
+                return json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Return every index entry (``url``, ``path``, ``sha256``, ``size``, ...)."""
+
+        entries = []
+        for path in (self.root / "index").glob("*.json"):
+            try:
+                with open(path) as handle:
+                    entries.append(json.load(handle))
+            except (FileNotFoundError, ValueError):
+                continue
+        return entries
+
+    def _blobs(self) -> List[tuple[float, int, Path]]:
+        blobs = []
+        for path in (self.root / "blobs").glob("*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            blobs.append((stat.st_mtime, stat.st_size, path))
+        return blobs
+
+    def _valid_blob(self, entry: Optional[Mapping[str, Any]]) -> Optional[Path]:
+        if not entry:
+            return None
+        path = Path(entry["path"])
+        try:
+            if path.stat().st_size == entry["size"]:
+                return path
+        except FileNotFoundError:
+            pass
+        return None
+
+    # -- public API -------------------------------------------------------------
+    def lookup(self, url: str, *, touch: bool = True) -> Optional[Path]:
+        """Return the cached file for ``url`` without any network access.
+
+        ``touch`` marks the file as recently used for eviction.
+        """
+
+        path = self._valid_blob(self._read_entry(url))
+        if path is not None and touch:
+            os.utime(path)
+        return path
+
+    def fetch(
+        self,
+        url: str,
+        *,
+        session: Optional[requests.Session] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = 120,
+        revalidate: bool = True,
+        sha256: Optional[str] = None,
+        validate: Optional[Callable[[requests.Response], None]] = None,
+    ) -> Path:
+        """Return a local path for ``url``, downloading or revalidating as needed.
+
+        Parameters
+        ----------
+        url : str
+            Remote file URL; it is also the cache key.
+        session : requests.Session, optional
+            Session for the request (defaults to the shared pooled session).
+        headers : mapping, optional
+            Extra request headers.
+        timeout : float, default 120
+            Request timeout in seconds.
+        revalidate : bool, default True
+            Send a conditional request for cached entries. When False a cached
+            copy is returned without contacting the server, as it always is
+            for entries whose response carried no ``ETag`` or
+            ``Last-Modified``.
+        sha256 : str, optional
+            Expected checksum of the content; mismatches raise
+            :class:`ChecksumMismatch` and nothing is cached.
+        validate : callable, optional
+            Called with the response before the body is stored, e.g. to reject
+            HTML error pages served with status 200.
+        """
+
+        path = self._fetch(
+            url,
+            session=session,
+            headers=headers,
+            timeout=timeout,
+            revalidate=revalidate,
+            sha256=sha256,
+            validate=validate,
+        )
+        self._evict(keep={path})
+        return path
+
+    def _fetch(
+        self,
+        url: str,
+        *,
+        session: Optional[requests.Session] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float = 120,
+        revalidate: bool = True,
+        sha256: Optional[str] = None,
+        validate: Optional[Callable[[requests.Response], None]] = None,
+    ) -> Path:
+        """:meth:`fetch` without the eviction pass."""
+
+        session = session or get_session()
+        with _file_lock(self.root / "locks" / f"{_url_key(url)}.lock"):
+            entry = self._read_entry(url)
+            cached = self._valid_blob(entry)
+            if cached is not None and sha256 is not None and entry["sha256"] != sha256:
+                cached = None
+            # Entries stored without ETag or Last-Modified cannot be
+            # revalidated, so they are served as fresh instead of refetched.
+            fresh = cached is not None and not (entry.get("etag") or entry.get("last_modified"))
+            if cached is not None and (fresh or not revalidate):
+                os.utime(cached)
+                return cached
+
+            request_headers = dict(headers or {})
+            if cached is not None:
+                if entry.get("etag"):
+                    request_headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    request_headers["If-Modified-Since"] = entry["last_modified"]
+            try:
+                resp = session.get(url, headers=request_headers, stream=True, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                if cached is None:
+                    raise
+                warnings.warn(f"Could not revalidate {url} ({exc}); using cached copy", RuntimeWarning)
+                os.utime(cached)
+                return cached
+
+            try:
+                if resp.status_code == 304 and cached is not None:
+                    entry["validated"] = time.time()
+                    _write_json_atomic(self._entry_path(url), entry)
+                    os.utime(cached)
+                    return cached
+                resp.raise_for_status()
+                if validate is not None:
+                    validate(resp)
+                return self._store(url, resp, expected=sha256)
+            finally:
+                resp.close()
+
+    def _store(self, url: str, resp: requests.Response, expected: Optional[str]) -> Path:
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self.root / "tmp", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+                    if chunk:
+                        handle.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+            sha = digest.hexdigest()
+            if expected is not None and sha != expected:
+                raise ChecksumMismatch(f"Checksum mismatch for {url}: expected {expected}, got {sha}")
+            blob = self._blob_path(sha, PurePosixPath(urlparse(url).path).suffix)
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            with self._root_lock():
+                os.replace(tmp_name, blob)
+                self._write_entry(
+                    url,
+                    {
+                        "url": url,
+                        "path": str(blob),
+                        "sha256": sha,
+                        "size": size,
+                        "etag": resp.headers.get("ETag"),
+                        "last_modified": resp.headers.get("Last-Modified"),
+                        "fetched": time.time(),
+                        "validated": time.time(),
+                    },
+                )
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        return blob
+
+    def put(self, key: str, source: str | Path) -> Path:
+        """Move the local file ``source`` into the cache under ``key``.
+
+        ``key`` plays the role of the URL for :meth:`lookup`, e.g.
+        ``"<archive url>#<member>"`` for a file extracted from a cached
+        archive. The blob keeps the suffix of ``source``; the returned path
+        is subject to the size cap like any download.
+        """
+
+        source = Path(source)
+        sha = _file_sha256(source)
+        size = source.stat().st_size
+        blob = self._blob_path(sha, source.suffix)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        with self._root_lock():
+            shutil.move(str(source), blob)
+            now = time.time()
+            self._write_entry(
+                key,
+                {
+                    "url": key,
+                    "path": str(blob),
+                    "sha256": sha,
+                    "size": size,
+                    "etag": None,
+                    "last_modified": None,
+                    "fetched": now,
+                    "validated": now,
+                },
+            )
+        self._evict(keep={blob})
+        return blob
+
+    def _write_entry(self, key: str, entry: Mapping[str, Any]) -> None:
+        """Write the index entry for ``key``; the caller holds the root lock.
+
+        A blob the key pointed to before is deleted once nothing refers to it.
+        """
+
+        previous = self._read_entry(key)
+        _write_json_atomic(self._entry_path(key), dict(entry))
+        if previous and previous["path"] != entry["path"]:
+            if not any(other.get("path") == previous["path"] for other in self.entries()):
+                Path(previous["path"]).unlink(missing_ok=True)
+
+    def discard(self, key: str) -> None:
+        """Drop the entry for ``key`` and its file (if no other entry uses it)."""
+
+        with self._root_lock():
+            entry = self._read_entry(key)
+            self._entry_path(key).unlink(missing_ok=True)
+            if entry and not any(other.get("path") == entry["path"] for other in self.entries()):
+                Path(entry["path"]).unlink(missing_ok=True)
+
+    @contextlib.contextmanager
+    def pin(self, paths: Iterable[str | Path] = ()) -> Iterator["_Pin"]:
+        """Protect ``paths`` (and any added later) from eviction while in use.
+
+        Pins are small files under ``<root>/pins`` honoured by every process
+        sharing the cache; pins left behind by dead processes are ignored.
+
+        Examples
+        --------
+        >>> with cache.pin(paths):  # doctest: +SKIP
+        ...     ds = xr.open_mfdataset(paths).load()
+        """
+
+        handle = _Pin(self.root / "pins" / f"{os.getpid()}-{uuid.uuid4().hex}.json")
+        handle.add(*paths)
+        try:
+            yield handle
+        finally:
+            handle.path.unlink(missing_ok=True)
+
+    def _pinned(self) -> set[str]:
+        pinned: set[str] = set()
+        for pin_file in (self.root / "pins").glob("*.json"):
+            try:
+                alive = _pid_alive(int(pin_file.name.split("-", 1)[0]))
+            except ValueError:
+                alive = False
+            if not alive:
+                pin_file.unlink(missing_ok=True)
+                continue
+            try:
+                with open(pin_file) as handle:
+                    pinned.update(json.load(handle))
+            except (FileNotFoundError, ValueError):
+                continue
+        return pinned
+
+    def fetch_many(
+        self,
+        urls: Sequence[str],
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        show_progress: bool = False,
+        description: str = "downloads",
+        **kwargs: Any,
+    ) -> List[Path]:
+        """Fetch several URLs concurrently; returns paths in the order of ``urls``.
+
+        Eviction runs once after the whole batch and never removes a path of
+        the batch, so every returned path exists when this returns. Wrap their
+        use in :meth:`pin` to also guard them against other processes.
+        """
+
+        urls = list(urls)
+        with self.pin() as batch:
+
+            def _one(url: str) -> Path:
+                path = self._fetch(url, **kwargs)
+                batch.add(path)
+                return path
+
+            paths = map_concurrent(
+                _one,
+                urls,
+                max_workers=max_workers,
+                show_progress=show_progress,
+                description=description,
+            )
+            self._evict(keep=set(paths))
+            for i, (url, path) in enumerate(zip(urls, paths)):
+                if not path.exists():  # evicted by another process before it was pinned
+                    paths[i] = self._fetch(url, **kwargs)
+                    batch.add(paths[i])
+            missing = [str(path) for path in paths if not path.exists()]
+            if missing:
+                raise FileNotFoundError(f"Cached files disappeared during the batch: {missing}")
+        return paths
+
+    def _remove_blobs(self, paths: Sequence[Path]) -> None:
+        doomed = {str(p) for p in paths}
+        for p in paths:
+            p.unlink(missing_ok=True)
+        for index_file in (self.root / "index").glob("*.json"):
+            try:
+                with open(index_file) as handle:
+                    if json.load(handle).get("path") in doomed:
+                        index_file.unlink(missing_ok=True)
+            except (FileNotFoundError, ValueError):
+                index_file.unlink(missing_ok=True)
+
+    def _evict(self, keep: Collection[Path] = (), max_bytes: Optional[int] = None) -> int:
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        with self._root_lock():
+            protected = {str(path) for path in keep} | self._pinned()
+            blobs = sorted(self._blobs(), key=lambda item: item[0])
+            total = sum(size for _, size, _ in blobs)
+            doomed: List[Path] = []
+            freed = 0
+            for _, size, path in blobs:
+                if total - freed <= limit:
+                    break
+                if str(path) in protected:
+                    continue
+                doomed.append(path)
+                freed += size
+            if doomed:
+                self._remove_blobs(doomed)
+                self.evictions += len(doomed)
+        return freed
+
+    def info(self) -> Dict[str, Any]:
+        """Return the cache location, entry counts and disk usage."""
+
+        blobs = self._blobs()
+        return {
+            "cache_dir": str(self.root),
+            "entries": len(self.entries()),
+            "files": len(blobs),
+            "bytes": sum(size for _, size, _ in blobs),
+            "max_bytes": self.max_bytes,
+        }
+
+    def prune(self, max_bytes: int | str | None = None, *, older_than: float | None = None) -> int:
+        """Evict least-recently-used files and return the number of bytes freed.
+
+        Parameters
+        ----------
+        max_bytes : int or str, optional
+            Target total size; defaults to the cache cap.
+        older_than : float, optional
+            Additionally remove every file not accessed for this many seconds.
+        """
+
+        freed = 0
+        if older_than is not None:
+            cutoff = time.time() - older_than
+            with self._root_lock():
+                stale = [(size, path) for mtime, size, path in self._blobs() if mtime < cutoff]
+                self._remove_blobs([path for _, path in stale])
+            freed += sum(size for size, _ in stale)
+        limit = parse_bytes(max_bytes) if max_bytes is not None else None
+        return freed + self._evict(max_bytes=limit)
+
+    def verify(self) -> List[str]:
+        """Re-hash every cached file, drop corrupted ones and return their URLs."""
+
+        corrupted = []
+        for entry in self.entries():
+            path = Path(entry["path"])
+            if not path.exists() or _file_sha256(path) != entry["sha256"]:
+                corrupted.append(entry["url"])
+                with self._root_lock():
+                    self._remove_blobs([path])
+        return corrupted
+
+    def clear(self) -> None:
+        """Delete every cached file and index entry."""
+
+        with self._root_lock():
+            self._remove_blobs([path for _, _, path in self._blobs()])
+            for index_file in (self.root / "index").glob("*.json"):
+                index_file.unlink(missing_ok=True)
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != "posix":  # pragma: no cover - os.kill(pid, 0) terminates on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # pragma: no cover - alive, owned by another user
+        return True
+    return True
+
+
+class _Pin:
+    """Pin file listing cached paths that must not be evicted."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.paths: set[str] = set()
+        self._lock = threading.Lock()
+
+    def add(self, *paths: str | Path) -> None:
+        if not paths:
+            return
+        with self._lock:
+            self.paths.update(str(p) for p in paths)
+            _write_json_atomic(self.path, sorted(self.paths))
+
+
+_DEFAULT: Optional[DownloadCache] = None
+
+
+def default_cache() -> DownloadCache:
+    """Return the process-wide default :class:`DownloadCache`."""
+
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = DownloadCache()
+    return _DEFAULT
+
+
+def configure(root: str | Path | None = None, *, max_bytes: int | str | None = None) -> DownloadCache:
+    """Replace the default cache (e.g. to point at a shared scratch directory)."""
+
+    global _DEFAULT
+    _DEFAULT = DownloadCache(root, max_bytes=max_bytes)
+    return _DEFAULT
+
+
+def fetch(url: str, **kwargs: Any) -> Path:
+    """Fetch ``url`` through the default cache; see :meth:`DownloadCache.fetch`."""
+
+    return default_cache().fetch(url, **kwargs)
+
+
+def info() -> Dict[str, Any]:
+    """Return location and disk usage of the default cache."""
+
+    return default_cache().info()
+
+
+def prune(max_bytes: int | str | None = None, *, older_than: float | None = None) -> int:
+    """Evict least-recently-used files from the default cache."""
+
+    return default_cache().prune(max_bytes, older_than=older_than)
+
+
+def verify() -> List[str]:
+    """Check the default cache against stored checksums."""
+
+    return default_cache().verify()
+
+
+def clear() -> None:
+    """Empty the default cache."""
+
+    default_cache().clear()
+
+
+__all__ = [
+    "ChecksumMismatch",
+    "DEFAULT_CACHE_DIR",
+    "DownloadCache",
+    "clear",
+    "configure",
+    "default_cache",
+    "fetch",
+    "info",
+    "prune",
+    "verify",
+]
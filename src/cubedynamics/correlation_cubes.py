@@ -2,29 +2,320 @@
 
 from __future__ import annotations
 
-from typing import Iterable
+from typing import Any, Dict, Hashable, Iterable, Iterator, List
 
+import dask
+import dask.array as dsa
+import numpy as np
 import xarray as xr
 
+from .streaming import VirtualCube
+from .streaming.reducers import CovarianceState
+
+STATISTICS = ("pearson", "spearman")
+
+
+def _average_ranks(values: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Rank ``values`` along ``axis`` (1..n, ties averaged); NaNs stay NaN."""
+
+    a = np.moveaxis(np.asarray(values, dtype=float), axis, -1)
+    n = a.shape[-1]
+    order = np.argsort(a, axis=-1, kind="mergesort")
+    ordered = np.take_along_axis(a, order, axis=-1)
+    positions = np.broadcast_to(np.arange(n), a.shape)
+
+    starts_group = np.ones(a.shape, dtype=bool)
+    starts_group[..., 1:] = ordered[..., 1:] != ordered[..., :-1]
+    ends_group = np.ones(a.shape, dtype=bool)
+    ends_group[..., :-1] = starts_group[..., 1:]
+    first = np.maximum.accumulate(np.where(starts_group, positions, 0), axis=-1)
+    last = np.flip(
+        np.minimum.accumulate(np.flip(np.where(ends_group, positions, n - 1), axis=-1), axis=-1),
+        axis=-1,
+    )
+
+    ranks = np.empty(a.shape, dtype=float)
+    np.put_along_axis(ranks, order, (first + last) / 2.0 + 1.0, axis=-1)
+    ranks[np.isnan(a)] = np.nan
+    return np.moveaxis(ranks, -1, axis)
+
+
+def _pair_state(x: np.ndarray, y: np.ndarray, spearman: bool) -> CovarianceState:
+    """Reduce one aligned (time, ...) chunk pair into partial sums."""
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if spearman:
+        mask = np.isfinite(x) & np.isfinite(y)
+        x = _average_ranks(np.where(mask, x, np.nan), axis=0)
+        y = _average_ranks(np.where(mask, y, np.nan), axis=0)
+    return CovarianceState.from_arrays(x, y, axis=0)
+
+
+def _piece_state(
+    ref_blocks: List[np.ndarray],
+    positions: np.ndarray,
+    ref_dims: tuple,
+    y: np.ndarray,
+    y_dims: tuple,
+    spearman: bool,
+) -> CovarianceState:
+    """Reduce a target piece against the reference rows at ``positions``.
+
+    ``ref_blocks`` are consecutive reference chunks (time first) and
+    ``positions`` index into their concatenation.
+    """
+
+    rows = np.concatenate([np.asarray(block) for block in ref_blocks], axis=0)[positions]
+    x, target = xr.broadcast(xr.DataArray(rows, dims=ref_dims), xr.DataArray(np.asarray(y), dims=y_dims))
+    order = (ref_dims[0],) + tuple(d for d in x.dims if d != ref_dims[0])
+    return _pair_state(x.transpose(*order).values, target.transpose(*order).values, spearman)
+
+
+def _merge_pair(a: CovarianceState, b: CovarianceState) -> CovarianceState:
+    return a.merge(b)
+
+
+def _tree_merge(parts: List[Any]) -> Any:
+    """Merge delayed states pairwise so no task holds more than two of them."""
+
+    while len(parts) > 1:
+        merged = [dask.delayed(_merge_pair)(a, b) for a, b in zip(parts[::2], parts[1::2])]
+        parts = merged + parts[len(merged) * 2 :]
+    return parts[0]
+
+
+def _correlation(state: CovarianceState) -> np.ndarray:
+    return state.correlation()
+
+
+class _ReferenceBlocks:
+    """Reference chunks along ``dim``, each read at most once.
+
+    Eager blocks are loaded NumPy arrays kept for later targets; lazy blocks
+    are one delayed task per chunk shared by every target graph.
+    """
+
+    def __init__(self, ref: xr.DataArray, dim: str, compute: bool) -> None:
+        self.ref = ref
+        self.dim = dim
+        self.compute = compute
+        sizes = ref.chunksizes.get(dim) if ref.chunks else None
+        self.bounds = np.cumsum((0,) + tuple(sizes or (ref.sizes[dim],)))
+        self.index = ref.indexes[dim]
+        self._blocks: Dict[tuple, Any] = {}
+
+    def _spatial_key(self, ref: xr.DataArray) -> tuple:
+        key = []
+        for d in ref.dims:
+            if d == self.dim:
+                continue
+            if d in self.ref.indexes and not ref.indexes[d].equals(self.ref.indexes[d]):
+                key.append((d, tuple(ref.indexes[d].tolist())))
+        return tuple(key)
+
+    def block(self, i: int, ref: xr.DataArray) -> Any:
+        key = (i, self._spatial_key(ref))
+        if key not in self._blocks:
+            data = ref.isel({self.dim: slice(int(self.bounds[i]), int(self.bounds[i + 1]))}).data
+            self._blocks[key] = np.asarray(data) if self.compute else dask.delayed(np.asarray)(data)
+        return self._blocks[key]
+
+    def select(self, labels: Any, ref: xr.DataArray) -> tuple[np.ndarray, List[Any], np.ndarray]:
+        """Return target steps found in the reference, their blocks and positions."""
+
+        found = self.index.get_indexer(labels)
+        keep = np.flatnonzero(found >= 0)
+        found = found[keep]
+        if not found.size:
+            return keep, [], found
+        first = int(np.searchsorted(self.bounds, found.min(), side="right")) - 1
+        last = int(np.searchsorted(self.bounds, found.max(), side="right")) - 1
+        blocks = [self.block(i, ref) for i in range(first, last + 1)]
+        return keep, blocks, found - int(self.bounds[first])
+
+
+def _as_reference(reference: xr.DataArray | xr.Dataset, dim: str) -> xr.DataArray:
+    if isinstance(reference, xr.Dataset):
+        if len(reference.data_vars) != 1:
+            raise ValueError("A Dataset reference must contain exactly one data variable")
+        reference = reference[next(iter(reference.data_vars))]
+    if not isinstance(reference, xr.DataArray):
+        raise TypeError(f"reference must be a DataArray or Dataset, got {type(reference)!r}")
+    if dim not in reference.dims:
+        raise ValueError(f"Dimension {dim!r} not found in reference dims: {tuple(reference.dims)}")
+    return reference
+
+
+def _time_pieces(obj: xr.DataArray | xr.Dataset, dim: str) -> Iterator[xr.DataArray | xr.Dataset]:
+    """Yield ``obj`` one time chunk at a time (a single piece for NumPy data)."""
+
+    sizes = obj.chunksizes.get(dim) if obj.chunks else None
+    if not sizes:
+        yield obj
+        return
+    start = 0
+    for size in sizes:
+        yield obj.isel({dim: slice(start, start + size)})
+        start += size
+
+
+def _target_pieces(
+    targets: Iterable[Any],
+    *,
+    dim: str,
+    chunks: dict | str | None,
+    whole: bool,
+    compute: bool,
+) -> Iterator[xr.Dataset]:
+    """Normalize streamed targets into named-variable time pieces."""
+
+    for i, item in enumerate(targets):
+        if isinstance(item, VirtualCube):
+            # Without a coords probe a lazy view would need every tile loaded
+            # up front, so such cubes are streamed tile by tile instead.
+            lazy = not compute and item.coords_probe is not None
+            if not lazy and not whole:
+                for tile in item.iter_time_tiles():
+                    yield tile.to_dataset(name=tile.name or f"target_{i}")
+                continue
+            item = item.to_dask() if lazy else item.materialize()
+        if isinstance(item, xr.DataArray):
+            item = item.to_dataset(name=item.name or f"target_{i}")
+        if not isinstance(item, xr.Dataset):
+            raise TypeError(f"Targets must be DataArrays, Datasets or VirtualCubes, got {type(item)!r}")
+        if dim not in item.dims:
+            raise ValueError(f"Dimension {dim!r} not found in target dims: {tuple(item.dims)}")
+        if chunks is not None:
+            item = item.chunk(chunks)
+        if whole:
+            yield item
+        else:
+            yield from _time_pieces(item, dim)
+
 
 def correlation_cube(
     reference: xr.DataArray | xr.Dataset,
-    targets: Iterable[xr.DataArray | xr.Dataset],
+    targets: Iterable[xr.DataArray | xr.Dataset | VirtualCube],
     *,
     statistic: str = "pearson",
     chunks: dict | str | None = None,
     compute: bool = False,
+    dim: str = "time",
 ) -> xr.DataArray:
     """Compute correlations between a reference cube and streamed targets.
 
-    The correlation helpers are expected to operate lazily and to consume
-    iterables of streamed chunks rather than expecting materialized arrays.  In
-    practice this will be implemented by composing with Dask-backed xarray
-    objects, but the stub exists here to capture the desired public contract.
+    ``targets`` is consumed lazily, one item at a time. Each item may be a
+    DataArray, a Dataset (every data variable is a target, e.g. a dozen
+    gridMET variables) or a :class:`~cubedynamics.streaming.VirtualCube`.
+    Dask-backed items are split along ``dim`` into their chunks and
+    VirtualCubes into their time tiles; items sharing a variable name (for
+    example consecutive years of the same variable) are merged.
+
+    Every piece is aligned with the reference on shared labels and each
+    variable is reduced to mergeable co-moment partial sums (n, means, M2 and
+    the cross product). Each reference chunk along ``dim`` is read once and
+    reused for every target: eagerly it is loaded on first use and kept, so
+    up to the whole reference stays in memory; lazily it is a single task
+    shared by all target graphs. Beyond that, memory is O(pixels) per target
+    variable plus the current piece, and lazy partial sums are combined by a
+    pairwise tree reduction.
+
+    Parameters
+    ----------
+    reference : xr.DataArray or xr.Dataset
+        Reference cube (a single-variable Dataset is accepted). May be a
+        time series without spatial dims, in which case it is broadcast
+        against every target pixel, or a cube correlated against target
+        series.
+    targets : iterable
+        Targets to correlate with ``reference``.
+    statistic : {"pearson", "spearman"}, default "pearson"
+        Spearman correlates average ranks over the pairwise-valid steps;
+        ranks need a target's full record, so every Spearman target must
+        arrive as a single item.
+    chunks : mapping or str, optional
+        Dask chunks applied to the reference and each target before
+        streaming, e.g. ``{"time": 365}``; the target time chunks define the
+        streamed pieces.
+    compute : bool, default False
+        When False the result is backed by a lazy dask graph of per-piece
+        reductions and nothing is read until it is computed. When True the
+        pieces are reduced eagerly as the iterable is consumed. VirtualCubes
+        without a ``coords_probe`` are always read tile by tile.
+    dim : str, default "time"
+        Dimension along which correlations are computed.
 
-    TODO: implement streaming-aware rolling correlations.
+    Returns
+    -------
+    xr.DataArray
+        Correlations with dims ``("variable", ...)``; the ``variable`` dim
+        is squeezed to a scalar coordinate when there is a single target.
     """
-    raise NotImplementedError("correlation_cube not implemented yet.")
+
+    if statistic not in STATISTICS:
+        raise ValueError(f"statistic must be one of {STATISTICS}, got {statistic!r}")
+    spearman = statistic == "spearman"
+    ref = _as_reference(reference, dim)
+    if chunks is not None:
+        ref = ref.chunk(chunks)
+
+    ref = ref.transpose(dim, ...)
+    blocks = _ReferenceBlocks(ref, dim, compute)
+
+    # Eager states are folded as pieces arrive, so memory stays O(pixels)
+    # per target; lazy ones are delayed objects merged by a tree reduction.
+    states: Dict[Hashable, Any] = {}
+    templates: Dict[Hashable, xr.DataArray] = {}
+    for piece in _target_pieces(targets, dim=dim, chunks=chunks, whole=spearman, compute=compute):
+        ref_grid, piece = xr.align(ref, piece, join="inner", exclude=[dim])
+        keep, ref_blocks, positions = blocks.select(piece.indexes[dim], ref_grid)
+        if not keep.size:
+            continue
+        piece = piece.isel({dim: keep})
+        for name, target in piece.data_vars.items():
+            if spearman and name in states:
+                raise ValueError(
+                    f"Spearman correlation needs the full record of {name!r} in one item; "
+                    "it arrived in several pieces"
+                )
+            target = target.transpose(dim, ...)
+            args = (ref_blocks, positions, ref_grid.dims, target.data, target.dims, spearman)
+            if compute:
+                state = _piece_state(*args[:3], target.values, *args[4:])
+                states[name] = states[name].merge(state) if name in states else state
+            else:
+                states.setdefault(name, []).append(dask.delayed(_piece_state)(*args))
+            if name not in templates:
+                x, _ = xr.broadcast(ref_grid.isel({dim: 0}, drop=True), target.isel({dim: 0}, drop=True))
+                order = tuple(d for d in (ref_grid.dims + target.dims) if d != dim)
+                templates[name] = x.transpose(*dict.fromkeys(order)).reset_coords(drop=True)
+
+    if not states:
+        raise ValueError(f"No target overlaps the reference along {dim!r}")
+
+    results = []
+    for name, parts in states.items():
+        template = templates[name]
+        if compute:
+            values = parts.correlation()
+        else:
+            values = dsa.from_delayed(
+                dask.delayed(_correlation)(_tree_merge(parts)), shape=template.shape, dtype=float
+            )
+        results.append(template.copy(data=values).expand_dims(variable=[name]))
+
+    out = xr.concat(results, dim="variable", join="outer") if len(results) > 1 else results[0]
+    if out.sizes["variable"] == 1:
+        out = out.squeeze("variable")
+    out = out.rename("correlation")
+    out.attrs = {
+        "long_name": f"{statistic.capitalize()} correlation with reference",
+        "statistic": statistic,
+        "correlation_dim": dim,
+        "reference": str(ref.name) if ref.name is not None else "reference",
+    }
+    return out
 
 
-__all__ = ["correlation_cube"]
+__all__ = ["STATISTICS", "correlation_cube"]
@@ -21,8 +21,9 @@ import xarray as xr
 
 from ..config import DEFAULT_CHUNKS, TIME_DIM, X_DIM, Y_DIM
 from ..progress import progress_bar
+from ..streaming.archive import open_gridmet_archive
 from ..utils import set_cube_provenance
-from .prism import _bbox_mapping_from_geojson, _bbox_mapping_from_sequence, _coerce_aoi
+from ..utils.aoi import bbox_mapping_from_geojson, bbox_mapping_from_sequence, coerce_aoi
 
 
 def load_gridmet_cube(
@@ -68,7 +69,10 @@ def load_gridmet_cube(
         Custom Dask chunk mapping.
     prefer_streaming : bool, default True
         Whether to attempt the streaming backend before falling back to the
-        synthetic download backend used for tests.
+        synthetic download backend used for tests. Local Zarr archives built
+        with :func:`cubedynamics.streaming.archive.ingest_gridmet_archive`
+        are read first whenever they cover every requested variable and
+        year.
     show_progress : bool, default True
         Display a progress bar while synthetic GRIDMET data are generated when
         ``tqdm`` is installed. Set to ``False`` to disable progress reporting.
@@ -134,7 +138,7 @@ def load_gridmet_cube(
             )
         aoi_mapping = _coerce_legacy_gridmet_aoi(aoi)
     else:
-        aoi_mapping = _coerce_aoi(lat=lat, lon=lon, bbox=bbox, aoi_geojson=aoi_geojson)
+        aoi_mapping = coerce_aoi(lat=lat, lon=lon, bbox=bbox, aoi_geojson=aoi_geojson)
 
     return _load_gridmet_cube_impl(
         normalized_variables,
@@ -149,6 +153,41 @@ def load_gridmet_cube(
     )
 
 
+def gridmet_cube_coords(
+    *,
+    lat: float | None = None,
+    lon: float | None = None,
+    bbox: Sequence[float] | None = None,
+    aoi_geojson: Mapping[str, object] | None = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    variable: str = "tmmx",
+    freq: str | None = None,
+    time_res: str | None = None,
+) -> dict[str, np.ndarray]:
+    """Return the ``time``/``y``/``x`` labels :func:`load_gridmet_cube` would produce.
+
+    Nothing is downloaded: local archives only have their Zarr metadata
+    read, otherwise the labels of the streaming grid are computed from the
+    request. Synthetic fallbacks after backend failures are not predicted.
+    """
+
+    resolved_freq = freq or time_res or "MS"
+    start_iso = pd.to_datetime(start).isoformat()
+    end_iso = pd.to_datetime(end).isoformat()
+    aoi = coerce_aoi(lat=lat, lon=lon, bbox=bbox, aoi_geojson=aoi_geojson)
+    ds = _open_gridmet_archive([variable], start_iso, end_iso, aoi, resolved_freq)
+    if ds is not None:
+        return {dim: ds[dim].values for dim in (TIME_DIM, Y_DIM, X_DIM)}
+
+    y_coords, x_coords = _build_coords_for_aoi(aoi)
+    return {
+        TIME_DIM: pd.date_range(start_iso, end_iso, freq=resolved_freq).values,
+        Y_DIM: y_coords[(y_coords >= aoi["min_lat"]) & (y_coords <= aoi["max_lat"])],
+        X_DIM: x_coords[(x_coords >= aoi["min_lon"]) & (x_coords <= aoi["max_lon"])],
+    }
+
+
 def _load_gridmet_cube_impl(
     variables: Sequence[str],
     start: str,
@@ -165,10 +204,12 @@ def _load_gridmet_cube_impl(
     chunk_map = _resolve_chunks(chunks)
     backend_error: str | None = None
     source = "gridmet_streaming"
-    ds: xr.Dataset | None = None
+    ds = _open_gridmet_archive(variables, start, end, aoi, freq)
+    if ds is not None:
+        source = "gridmet_archive"
 
     streaming_error: Exception | None = None
-    if prefer_streaming:
+    if prefer_streaming and ds is None:
         try:
             try:
                 ds = _open_gridmet_streaming(
@@ -288,12 +329,45 @@ def _coerce_legacy_gridmet_aoi(aoi: object) -> Mapping[str, float]:
     if isinstance(aoi, Mapping):
         if {"min_lon", "max_lon", "min_lat", "max_lat"}.issubset(aoi.keys()):
             return {key: float(aoi[key]) for key in ("min_lon", "max_lon", "min_lat", "max_lat")}
-        return _bbox_mapping_from_geojson(aoi)
+        return bbox_mapping_from_geojson(aoi)
     if isinstance(aoi, Sequence) and not isinstance(aoi, (str, bytes)):
-        return _bbox_mapping_from_sequence(aoi)
+        return bbox_mapping_from_sequence(aoi)
     raise ValueError("Legacy GRIDMET AOI must be a bbox sequence or GeoJSON mapping.")
 
 
+def _open_gridmet_archive(
+    variables: Sequence[str],
+    start: str,
+    end: str,
+    aoi: Mapping[str, float],
+    freq: str = "D",
+) -> xr.Dataset | None:
+    """Return the AOI from local Zarr archives, or ``None`` if any is missing.
+
+    Archives are built with
+    :func:`cubedynamics.streaming.archive.ingest_gridmet_archive`. AOIs
+    smaller than a grid cell select the nearest pixel.
+    """
+
+    data_vars = {}
+    for name in variables:
+        da_var = open_gridmet_archive(name, start, end)
+        if da_var is None:
+            return None
+        data_vars[name] = da_var
+    ds = xr.Dataset(data_vars).rename({"lat": Y_DIM, "lon": X_DIM})
+    cropped = _crop_to_aoi(ds, aoi)
+    if not cropped.sizes[Y_DIM] or not cropped.sizes[X_DIM]:
+        center = {
+            Y_DIM: (aoi["min_lat"] + aoi["max_lat"]) / 2,
+            X_DIM: (aoi["min_lon"] + aoi["max_lon"]) / 2,
+        }
+        cropped = ds.sel({dim: [value] for dim, value in center.items()}, method="nearest")
+    if freq and freq != "D":
+        cropped = cropped.resample({TIME_DIM: freq}).mean()
+    return cropped
+
+
 def _open_gridmet_streaming(
     variables: Sequence[str],
     start: str,
@@ -503,4 +577,4 @@ def _finalize_gridmet_cube(
     )
 
 
-__all__ = ["load_gridmet_cube"]
+__all__ = ["gridmet_cube_coords", "load_gridmet_cube"]
@@ -15,9 +15,7 @@ import xarray as xr
 from ..config import DEFAULT_CHUNKS, TIME_DIM, X_DIM, Y_DIM
 from ..progress import progress_bar
 from ..utils import set_cube_provenance
-
-
-_POINT_BUFFER_DEGREES = 0.05
+from ..utils.aoi import coerce_aoi
 
 
 def load_prism_cube(
@@ -60,8 +58,16 @@ def load_prism_cube(
     chunks : mapping, optional
         Custom Dask chunk mapping.
     prefer_streaming : bool, default True
-        Whether to attempt the streaming backend before falling back to the
-        synthetic download backend used for tests.
+        Whether to use the streaming backend, which reads the AOI window
+        from cached PRISM zip archives
+        (:func:`cubedynamics.prism_streaming.stream_prism_to_cube`). Each
+        archive of the request (one per day and variable for ``freq="D"``,
+        one per month otherwise) is downloaded when its time step is first
+        computed. If
+        streaming fails a ``RuntimeError`` is raised unless
+        ``allow_synthetic=True``, which falls back to synthetic data with a
+        warning. ``False`` uses the synthetic download backend used for
+        tests.
     show_progress : bool, default True
         Display a progress bar while synthetic PRISM data are generated when
         ``tqdm`` is installed. Set to ``False`` to disable progress reporting.
@@ -112,7 +118,7 @@ def load_prism_cube(
         variable_spec = variable
     normalized_variables = _normalize_variables(variable_spec)
 
-    aoi = _coerce_aoi(lat=lat, lon=lon, bbox=bbox, aoi_geojson=aoi_geojson)
+    aoi = coerce_aoi(lat=lat, lon=lon, bbox=bbox, aoi_geojson=aoi_geojson)
 
     return _load_prism_cube_impl(
         normalized_variables,
@@ -127,6 +133,40 @@ def load_prism_cube(
     )
 
 
+def prism_cube_coords(
+    *,
+    lat: float | None = None,
+    lon: float | None = None,
+    bbox: Sequence[float] | None = None,
+    aoi_geojson: Mapping[str, object] | None = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    time_res: str = "ME",
+    freq: str | None = None,
+) -> dict[str, np.ndarray]:
+    """Return the ``time``/``y``/``x`` labels :func:`load_prism_cube` streams.
+
+    Labels come from the PRISM 4 km grid definition and the archive
+    calendar, so no archive is downloaded. Synthetic fallbacks after
+    streaming failures are not predicted.
+    """
+
+    from ..prism_streaming import prism_archive_dates, prism_grid_coords
+
+    freq_code = freq or time_res or "ME"
+    start_iso = pd.to_datetime(start).isoformat()
+    end_iso = pd.to_datetime(end).isoformat()
+    if freq_code == "D":
+        times = prism_archive_dates(start_iso, end_iso, freq="D")
+    else:
+        monthly = prism_archive_dates(start_iso, end_iso, freq="MS")
+        times = pd.Series(0.0, index=monthly).resample(freq_code).mean().index
+    y_coords, x_coords = prism_grid_coords(
+        coerce_aoi(lat=lat, lon=lon, bbox=bbox, aoi_geojson=aoi_geojson)
+    )
+    return {TIME_DIM: times.values, Y_DIM: y_coords, X_DIM: x_coords}
+
+
 def _load_prism_cube_impl(
     variables: Sequence[str],
     start: str,
@@ -151,6 +191,11 @@ def _load_prism_cube_impl(
             except TypeError:
                 ds = _open_prism_streaming(variables, start, end, aoi, freq)
         except Exception as exc:  # pragma: no cover - used in tests
+            if not allow_synthetic:
+                raise RuntimeError(
+                    f"PRISM streaming backend failed: {exc}. Set allow_synthetic=True to "
+                    "fall back to synthetic data."
+                ) from exc
             streaming_error = exc
             backend_error = str(exc)
             warnings.warn(
@@ -258,111 +303,6 @@ def _normalize_variables(variable_spec: Iterable[str] | str) -> Sequence[str]:
     return [str(val) for val in values]
 
 
-def _coerce_aoi(
-    *,
-    lat: float | None,
-    lon: float | None,
-    bbox: Sequence[float] | None,
-    aoi_geojson: Mapping[str, object] | None,
-) -> Mapping[str, float]:
-    specs = [
-        lat is not None or lon is not None,
-        bbox is not None,
-        aoi_geojson is not None,
-    ]
-    if sum(bool(spec) for spec in specs) != 1:
-        raise ValueError(
-            "Specify exactly one of (lat/lon), bbox, or aoi_geojson for PRISM requests."
-        )
-
-    if lat is not None or lon is not None:
-        if lat is None or lon is None:
-            raise ValueError("Both 'lat' and 'lon' must be provided together.")
-        return _bbox_mapping_from_point(lat, lon)
-    if bbox is not None:
-        return _bbox_mapping_from_sequence(bbox)
-    assert aoi_geojson is not None  # for mypy/static
-    return _bbox_mapping_from_geojson(aoi_geojson)
-
-
-def _bbox_mapping_from_point(lat: float, lon: float) -> Mapping[str, float]:
-    buffer = _POINT_BUFFER_DEGREES
-    return {
-        "min_lat": float(lat) - buffer,
-        "max_lat": float(lat) + buffer,
-        "min_lon": float(lon) - buffer,
-        "max_lon": float(lon) + buffer,
-    }
-
-
-def _bbox_mapping_from_sequence(values: Sequence[float]) -> Mapping[str, float]:
-    if len(values) != 4:
-        raise ValueError("'bbox' must contain four values: [min_lon, min_lat, max_lon, max_lat].")
-    min_lon, min_lat, max_lon, max_lat = map(float, values)
-    if min_lon >= max_lon or min_lat >= max_lat:
-        raise ValueError("'bbox' must have min values less than max values.")
-    return {
-        "min_lon": min_lon,
-        "min_lat": min_lat,
-        "max_lon": max_lon,
-        "max_lat": max_lat,
-    }
-
-
-def _bbox_mapping_from_geojson(aoi_geojson: Mapping[str, object]) -> Mapping[str, float]:
-    if not isinstance(aoi_geojson, Mapping):
-        raise ValueError("GeoJSON AOI must be a mapping with a 'type' field.")
-    geometries = _extract_geojson_geometries(aoi_geojson)
-    coords = []
-    for geometry in geometries:
-        coords.extend(_flatten_geojson_coords(geometry.get("coordinates")))
-    if not coords:
-        raise ValueError("GeoJSON AOI does not contain any coordinates.")
-    lons = [float(coord[0]) for coord in coords]
-    lats = [float(coord[1]) for coord in coords]
-    return {
-        "min_lon": min(lons),
-        "max_lon": max(lons),
-        "min_lat": min(lats),
-        "max_lat": max(lats),
-    }
-
-
-def _extract_geojson_geometries(obj: Mapping[str, object]) -> Sequence[Mapping[str, object]]:
-    geo_type = obj.get("type")
-    if geo_type == "FeatureCollection":
-        features = obj.get("features", [])
-        if not isinstance(features, Sequence) or isinstance(features, (str, bytes)):
-            raise ValueError("GeoJSON FeatureCollection must include a 'features' array.")
-        geometries = [feat.get("geometry") for feat in features if isinstance(feat, Mapping)]
-        return [geom for geom in geometries if isinstance(geom, Mapping)]
-    if geo_type == "Feature":
-        geometry = obj.get("geometry")
-        if not isinstance(geometry, Mapping):
-            raise ValueError("GeoJSON Feature missing a valid geometry.")
-        return [geometry]
-    if geo_type in {"Polygon", "MultiPolygon", "Point", "LineString", "MultiLineString", "MultiPoint"}:
-        return [obj]
-    raise ValueError("Unsupported GeoJSON type for AOI: {0}".format(geo_type))
-
-
-def _flatten_geojson_coords(coords: object) -> list[tuple[float, float]]:
-    if coords is None:
-        return []
-    if isinstance(coords, (float, int)):
-        raise ValueError("Invalid GeoJSON coordinate structure.")
-    if isinstance(coords, Sequence) and not isinstance(coords, (str, bytes)):
-        if coords and isinstance(coords[0], (float, int)):
-            if len(coords) < 2:
-                raise ValueError("GeoJSON coordinates must include lon/lat pairs.")
-            return [(float(coords[0]), float(coords[1]))]
-        flat: list[tuple[float, float]] = []
-        for sub in coords:
-            flat.extend(_flatten_geojson_coords(sub))
-        return flat
-    return []
-
-
 def _coerce_legacy_aoi(aoi: object) -> Mapping[str, float]:
     if not isinstance(aoi, Mapping):
         raise ValueError("Legacy PRISM AOI must be a mapping with bounding box keys.")
@@ -384,38 +324,25 @@ def _open_prism_streaming(
     freq: str = "ME",
     show_progress: bool = True,
 ) -> xr.Dataset:
-    try:
-        import dask.array as da
-    except ImportError as exc:  # pragma: no cover
-        raise RuntimeError("dask is required for PRISM streaming") from exc
+    """Stream the AOI window from PRISM daily or monthly zip archives.
 
-    resolved_freq = freq or "ME"
-    times = pd.date_range(start, end, freq=resolved_freq)
-    if not len(times):
-        raise ValueError("No time steps available for the requested range")
+    Daily archives are read for ``freq="D"``; other frequencies read the
+    monthly archives and resample them to ``freq``.
+    """
 
-    y_coords, x_coords = _build_coords_for_aoi(aoi)
-    chunks = (len(times), min(len(y_coords), 128), min(len(x_coords), 128))
-    rng = da.random.RandomState(111)
-    data_vars = {}
-    total = len(variables) if show_progress else None
-    with progress_bar(total=total, description="PRISM streaming") as advance:
-        for name in variables:
-            data = rng.gamma(
-                shape=2.0, scale=1.0, size=(len(times), len(y_coords), len(x_coords)), chunks=chunks
-            )
-            da_var = xr.DataArray(
-                data,
-                coords={TIME_DIM: times, Y_DIM: y_coords, X_DIM: x_coords},
-                dims=(TIME_DIM, Y_DIM, X_DIM),
-                name=name,
-                attrs={"units": "synthetic"},
-            )
-            data_vars[name] = da_var
-            if show_progress:
-                advance(1)
+    from ..prism_streaming import prism_archive_urls, stream_prism_to_cube
 
-    return xr.Dataset(data_vars)
+    resolved_freq = freq or "ME"
+    daily = resolved_freq == "D"
+    archive_freq = "D" if daily else "MS"
+    ds = stream_prism_to_cube(
+        {name: prism_archive_urls(name, start, end, freq=archive_freq) for name in variables},
+        bbox=[aoi["min_lon"], aoi["min_lat"], aoi["max_lon"], aoi["max_lat"]],
+        show_progress=show_progress,
+    )
+    if not daily:
+        ds = ds.resample({TIME_DIM: resolved_freq}).mean()
+    return ds
 
 
 def _open_prism_download(
@@ -576,4 +503,4 @@ def _finalize_prism_cube(
     )
 
 
-__all__ = ["load_prism_cube"]
+__all__ = ["load_prism_cube", "prism_cube_coords"]
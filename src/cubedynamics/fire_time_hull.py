@@ -26,6 +26,9 @@ from shapely.geometry import LineString, MultiPolygon, Point, Polygon
 from shapely.ops import unary_union
 from shapely.prepared import prep
 
+from . import cache as download_cache
+from .streaming.archive import open_gridmet_archive
+
 
 def _union_all(geoms):
     try:
@@ -65,6 +68,70 @@ _FIRED_FILE_MAP = {
 }
 
 
+def _fired_zip_url(download_id: str) -> str:
+    return f"https://scholar.colorado.edu/downloads/{download_id}"
+
+
+def _fired_from_download_cache(
+    *,
+    which: str,
+    prefer: str,
+    download: bool,
+    dataset_page: str,
+    download_id: str,
+    timeout: int,
+) -> Path:
+    """Return the FIRED layer stored in the shared download cache.
+
+    GeoPackages are kept as cache entries keyed ``<zip url>#<file name>``, so
+    they count towards the cache size cap and ``cache.info()``. Shapefiles
+    span several sidecar files sharing one stem and are extracted to
+    ``<download cache>/fired`` instead.
+    """
+
+    cache = download_cache.default_cache()
+    alt_ext = "shp" if prefer == "gpkg" else "gpkg"
+    shapefile_dir = cache.root / "fired"
+    for ext in (prefer, alt_ext):
+        name = _FIRED_FILE_MAP[(which, ext)]
+        if ext == "gpkg":
+            path = cache.lookup(f"{_fired_zip_url(download_id)}#{name}")
+        else:
+            path = shapefile_dir / name if (shapefile_dir / name).exists() else None
+        if path is not None:
+            return path
+
+    primary = _FIRED_FILE_MAP[(which, prefer)]
+    if not download:
+        raise FileNotFoundError(
+            f"FIRED file {primary} is not in the download cache at {cache.root}. "
+            "Pass download=True to fetch it, or pass cache_dir pointing at a folder "
+            "that holds the file."
+        )
+
+    staging_root = cache.root / "tmp"
+    with tempfile.TemporaryDirectory(dir=staging_root) as staging:
+        out_path = Path(staging) / primary
+        _download_and_extract_fired_to_cache(
+            which=which,
+            prefer=prefer,
+            out_path=out_path,
+            dataset_page=dataset_page,
+            download_id=download_id,
+            timeout=timeout,
+        )
+        extracted = [p for p in Path(staging).iterdir() if p.suffix in (".gpkg", ".shp")]
+        if not extracted:
+            raise FileNotFoundError(f"Expected FIRED file at {out_path} after download.")
+        chosen = out_path if out_path.exists() else extracted[0]
+        if chosen.suffix == ".gpkg":
+            return cache.put(f"{_fired_zip_url(download_id)}#{chosen.name}", chosen)
+        shapefile_dir.mkdir(parents=True, exist_ok=True)
+        for member in Path(staging).iterdir():
+            shutil.move(str(member), shapefile_dir / member.name)
+        return shapefile_dir / chosen.name
+
+
 def _download_and_extract_fired_to_cache(
     *,
     which: str,
@@ -99,30 +166,23 @@ def _download_and_extract_fired_to_cache(
             "continuing with direct ZIP download."
         )
 
-    zip_url = f"https://scholar.colorado.edu/downloads/{download_id}"
-    resp = session.get(
+    def _reject_html(resp: requests.Response) -> None:
+        content_type = resp.headers.get("Content-Type", "")
+        if "html" in content_type.lower():
+            raise RuntimeError(
+                "Expected FIRED ZIP download but received HTML; check network/proxy/auth."
+            )
+
+    zip_url = _fired_zip_url(download_id)
+    zpath = download_cache.fetch(
         zip_url,
+        session=session,
         headers=headers,
-        stream=True,
         timeout=timeout,
-        allow_redirects=True,
+        validate=_reject_html,
     )
 
-    content_type = resp.headers.get("Content-Type", "")
-    if "html" in content_type.lower():
-        raise RuntimeError(
-            "Expected FIRED ZIP download but received HTML; check network/proxy/auth."
-        )
-
-    resp.raise_for_status()
-
     with tempfile.TemporaryDirectory() as tmpdir:
-        zpath = Path(tmpdir) / "fired.zip"
-        with open(zpath, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=1 << 20):
-                if chunk:
-                    f.write(chunk)
-
         with zipfile.ZipFile(zpath, "r") as zf:
             names = zf.namelist()
             chosen = None
@@ -189,9 +249,11 @@ def load_fired_conus_ak(
     """
     Load FIRED CONUS+AK polygons from a local cache, with optional download.
 
-    Expected layout (default):
+    By default the layer is looked up in the shared download cache
+    (:mod:`cubedynamics.cache`), where the extracted GeoPackage is stored as
+    a regular, size-capped entry. With ``cache_dir`` the expected layout is:
 
-        ~/.fired_cache/
+        <cache_dir>/
             fired_conus-ak_daily_nov2001-march2021.gpkg
             fired_conus-ak_events_nov2001-march2021.gpkg  (optional)
 
@@ -203,8 +265,9 @@ def load_fired_conus_ak(
         Preferred file format to load; falls back to the alternate format if
         the ZIP download is missing the preferred one.
     cache_dir :
-        Optional override for the cache directory. Defaults to
-        Path.home() / ".fired_cache".
+        Optional folder holding the FIRED files, used instead of the
+        download cache. Files already placed in the legacy
+        ``~/.fired_cache`` are still used.
     download : bool
         If True, stream the FIRED ZIP from CU Scholar when the expected cache
         file is missing, then cache and load it. Defaults to False to preserve
@@ -236,7 +299,22 @@ def load_fired_conus_ak(
     if prefer not in {"gpkg", "shp"}:
         raise ValueError("prefer must be 'gpkg' or 'shp'")
 
-    cache_dir = Path(cache_dir or (Path.home() / ".fired_cache"))
+    if cache_dir is None:
+        legacy = Path.home() / ".fired_cache"
+        if (legacy / _FIRED_FILE_MAP[(which, prefer)]).exists():
+            cache_dir = legacy
+    if cache_dir is None:
+        path = _fired_from_download_cache(
+            which=which,
+            prefer=prefer,
+            download=download,
+            dataset_page=dataset_page,
+            download_id=download_id,
+            timeout=timeout,
+        )
+        return _read_fired(path)
+
+    cache_dir = Path(cache_dir)
     cache_dir.mkdir(parents=True, exist_ok=True)
 
     path = cache_dir / _FIRED_FILE_MAP[(which, prefer)]
@@ -267,6 +345,10 @@ def load_fired_conus_ak(
         elif not path.exists():
             raise FileNotFoundError(f"Expected FIRED file at {path} after download.")
 
+    return _read_fired(path)
+
+
+def _read_fired(path: Path) -> gpd.GeoDataFrame:
     gdf = gpd.read_file(path)
     if gdf.crs:
         gdf = gdf.to_crs("EPSG:4326")
@@ -832,17 +914,24 @@ def _gridmet_urls_for_var_years(variable: str, years: Iterable[int]) -> List[str
     return [f"https://www.northwestknowledge.net/metdata/data/{variable}_{y}.nc" for y in years]
 
 
-def _download_gridmet_files_to_cache(urls: Sequence[str], cache_dir: Path) -> List[Path]:
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    paths: List[Path] = []
+_LEGACY_GRIDMET_DIR = Path.home() / ".cache" / "cubedynamics" / "gridmet"
+
+
+def _gridmet_cache(urls: Sequence[str], cache_dir: str | Path | None = None) -> "download_cache.DownloadCache":
+    """Return the cache for gridMET files, importing files of the old flat layout.
+
+    Earlier versions stored ``<variable>_<year>.nc`` directly in ``cache_dir``
+    (default ``~/.cache/cubedynamics/gridmet``); such files are moved into the
+    download cache instead of being downloaded again.
+    """
+
+    cache = download_cache.default_cache() if cache_dir is None else download_cache.DownloadCache(cache_dir)
+    legacy_dir = _LEGACY_GRIDMET_DIR if cache_dir is None else Path(cache_dir)
     for url in urls:
-        fname = cache_dir / Path(url).name
-        if not fname.exists():
-            resp = requests.get(url, timeout=60)
-            resp.raise_for_status()
-            fname.write_bytes(resp.content)
-        paths.append(fname)
-    return paths
+        legacy = legacy_dir / Path(url).name
+        if legacy.is_file() and cache.lookup(url) is None:
+            cache.put(url, legacy)
+    return cache
 
 
 def _load_real_gridmet_cube(
@@ -854,15 +943,25 @@ def _load_real_gridmet_cube(
     variable: str = "tmmx",
     cache_dir: str | Path | None = None,
 ) -> xr.DataArray:
-    cache_dir = Path(cache_dir or Path.home() / ".cache" / "cubedynamics" / "gridmet")
-    years = range(start.year, end.year + 1)
-    urls = _gridmet_urls_for_var_years(variable, years)
-    paths = _download_gridmet_files_to_cache(urls, cache_dir)
-
-    ds = xr.open_mfdataset([str(p) for p in paths], combine="by_coords")
-    if "day" in ds.dims:
-        ds = ds.rename({"day": "time"})
-    ds = ds.sel(time=slice(start, end))
+    archived = open_gridmet_archive(variable, start, end)
+    if archived is not None:
+        ds = archived.to_dataset()
+    else:
+        years = range(start.year, end.year + 1)
+        urls = _gridmet_urls_for_var_years(variable, years)
+        cache = _gridmet_cache(urls, cache_dir)
+        paths = cache.fetch_many(urls, show_progress=len(urls) > 1, description="gridMET files")
+        # The point series is read while the files are pinned so no other
+        # process sharing the cache evicts them mid-read.
+        with cache.pin(paths), xr.open_mfdataset([str(p) for p in paths], combine="by_coords") as ds:
+            if "day" in ds.dims:
+                ds = ds.rename({"day": "time"})
+            return _gridmet_point_series(ds.sel(time=slice(start, end)), lat, lon, variable).load()
+    return _gridmet_point_series(ds.sel(time=slice(start, end)), lat, lon, variable)
+
+
+def _gridmet_point_series(ds: xr.Dataset, lat: float, lon: float, variable: str) -> xr.DataArray:
+    """Select the grid point nearest to ``lat``/``lon`` as a (time, y, x) cube."""
 
     # nearest grid point
     y_name = "lat" if "lat" in ds.coords else "y"
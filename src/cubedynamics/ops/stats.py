@@ -2,29 +2,55 @@
 
 from __future__ import annotations
 
+from typing import Iterable
+
 import xarray as xr
 
 from ..config import STD_EPS
+from ..correlation_cubes import correlation_cube as _streaming_correlation_cube
 from ..deprecations import warn_deprecated
+from ..streaming import VirtualCube
 from ..verbs import stats as _verbs_stats
 
 
-def correlation_cube(other: xr.DataArray | xr.Dataset | None, dim: str = "time"):
-    """Factory placeholder for a future correlation cube operation.
+def correlation_cube(
+    other: xr.DataArray | xr.Dataset | Iterable[xr.DataArray | xr.Dataset],
+    dim: str = "time",
+    *,
+    statistic: str = "pearson",
+    compute: bool = False,
+):
+    """Correlate the piped cube with one or more target cubes along ``dim``.
 
     Parameters
     ----------
     other:
-        The comparison cube captured by the factory.
+        Target cube, a Dataset of target variables, or an iterable of
+        targets streamed through
+        :func:`cubedynamics.correlation_cubes.correlation_cube`.
     dim:
-        Dimension over which correlations would be computed once implemented.
+        Dimension over which correlations are computed.
+    statistic:
+        ``"pearson"`` or ``"spearman"``.
+    compute:
+        Reduce eagerly, or return a lazy dask-backed result (default), as
+        in :func:`cubedynamics.correlation_cubes.correlation_cube`.
+
+    Returns
+    -------
+    callable
+        Operation mapping the reference cube to a per-pixel correlation
+        cube (with a ``variable`` dimension for multiple targets).
     """
 
-    if other is None or not isinstance(dim, str):
-        raise NotImplementedError("correlation_cube is not implemented yet.")
+    if other is None:
+        raise ValueError("correlation_cube requires a target cube via 'other'")
+    targets = [other] if isinstance(other, (xr.DataArray, xr.Dataset, VirtualCube)) else other
 
-    def _inner(da: xr.DataArray | xr.Dataset):  # pragma: no cover - stub
-        raise NotImplementedError("correlation_cube is not implemented yet.")
+    def _inner(da: xr.DataArray | xr.Dataset) -> xr.DataArray:
+        return _streaming_correlation_cube(
+            da, targets, statistic=statistic, compute=compute, dim=dim
+        )
 
     return _inner
 
@@ -1,35 +1,442 @@
 """Streaming-first helpers for PRISM datasets.
 
-The real PRISM readers still live under ``code/cubedynamics`` today, but the
-public interface is defined here so that we can publish a lightweight package.
-Future contributions MUST preserve a streaming-first mindset.
+PRISM distributes one zip archive per variable and time step. Each archive
+holds a single raster (a ``.bil`` with its ``.hdr`` sidecar, or a ``.tif``
+in newer releases) next to metadata files. :func:`stream_prism_to_cube`
+opens the raster member in place through GDAL's ``/vsizip/`` handler, so
+nothing is extracted, and reads only the window covering the AOI.
+
+Archives given as URLs are downloaded into the shared download cache
+(:mod:`cubedynamics.cache`) by the task that reads their time step, so
+building a cube fetches only the archive that defines the grid. Cached
+archives are reused without contacting the server, because PRISM limits how
+often one file may be downloaded; clear the cache to pick up re-released
+provisional grids. With ``preferred_driver="vsicurl"`` they are read
+remotely instead, and only the zip directory and the byte ranges under the
+AOI window are transferred. Every time step becomes one lazy task of a
+dask-backed ``(time, y, x)`` cube, so steps are read in parallel on compute.
 """
 
 from __future__ import annotations
 
-from typing import Iterable, Mapping, Sequence
+import math
+import re
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlparse
 
+import dask
+import dask.array as dsa
+import numpy as np
+import pandas as pd
 import xarray as xr
 
+from . import cache as download_cache
+from .config import TIME_DIM, X_DIM, Y_DIM
+from .streaming.fetch import DEFAULT_MAX_WORKERS, get_session, map_concurrent
+from .streaming.http_range import HTTPRangeFile, RangeRequestsUnsupported
+from .utils.aoi import bbox_mapping_from_geojson, bbox_mapping_from_sequence
+
+PRISM_BASE_URL = "https://services.nacse.org/prism/data/get/us/4km"
+_DRIVERS = ("cache", "vsicurl")
+_MEMBER_PATTERN = re.compile(
+    r"^prism_(?P<variable>[a-z0-9]+)_.*_(?P<date>\d{8}|\d{6}|\d{4})(?:_bil)?\.(?:bil|tif)$",
+    re.IGNORECASE,
+)
+_DATE_FORMATS = {8: "%Y%m%d", 6: "%Y%m", 4: "%Y"}
+
+# PRISM 4 km grid (1405 x 621 cells of 2.5 arc-minutes) served by the web service.
+PRISM_GRID: Mapping[str, float] = {
+    "west": -125.0 - 1 / 48,
+    "north": 49.9375,
+    "resolution": 1 / 24,
+    "width": 1405,
+    "height": 621,
+}
+
+
+def prism_url(variable: str, date: str | pd.Timestamp, *, freq: str = "D") -> str:
+    """Return the PRISM web-service URL of one archive.
+
+    ``freq="D"`` addresses the daily archive of ``date``; ``"MS"`` the
+    monthly archive of its month.
+    """
+
+    stamp = pd.Timestamp(date)
+    label = stamp.strftime("%Y%m%d") if freq == "D" else stamp.strftime("%Y%m")
+    return f"{PRISM_BASE_URL}/{variable}/{label}"
+
+
+def prism_archive_urls(
+    variable: str,
+    start: str | pd.Timestamp,
+    end: str | pd.Timestamp,
+    *,
+    freq: str = "D",
+) -> List[str]:
+    """Return the daily (``"D"``) or monthly (``"MS"``) archive URLs covering ``[start, end]``."""
+
+    return [prism_url(variable, stamp, freq=freq) for stamp in prism_archive_dates(start, end, freq=freq)]
+
+
+def prism_archive_dates(
+    start: str | pd.Timestamp,
+    end: str | pd.Timestamp,
+    *,
+    freq: str = "D",
+) -> pd.DatetimeIndex:
+    """Return the time labels of the daily or monthly archives covering ``[start, end]``."""
+
+    if freq == "D":
+        return pd.date_range(start, end, freq="D")
+    if freq == "MS":
+        return pd.period_range(start, end, freq="M").to_timestamp()
+    raise ValueError("freq must be 'D' (daily archives) or 'MS' (monthly archives)")
+
+
+def prism_grid_coords(bbox: Optional[Mapping[str, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the ``(y, x)`` pixel centers of :data:`PRISM_GRID` inside ``bbox``.
+
+    Mirrors the window :func:`stream_prism_to_cube` reads from the 4 km
+    archives, cropped to centers within the AOI, without opening any archive.
+    """
+
+    res = PRISM_GRID["resolution"]
+    y = PRISM_GRID["north"] - (np.arange(int(PRISM_GRID["height"])) + 0.5) * res
+    x = PRISM_GRID["west"] + (np.arange(int(PRISM_GRID["width"])) + 0.5) * res
+    if bbox is None:
+        return y, x
+    return (
+        y[(y >= bbox["min_lat"]) & (y <= bbox["max_lat"])],
+        x[(x >= bbox["min_lon"]) & (x <= bbox["max_lon"])],
+    )
+
+
+def _is_url(archive: str) -> bool:
+    return urlparse(str(archive)).scheme in {"http", "https"}
+
+
+def _parse_member(name: str) -> Optional[Tuple[str, pd.Timestamp]]:
+    match = _MEMBER_PATTERN.match(PurePosixPath(name).name)
+    if match is None:
+        return None
+    date = match.group("date")
+    return match.group("variable").lower(), pd.to_datetime(date, format=_DATE_FORMATS[len(date)])
+
+
+def _parse_service_url(url: str) -> Optional[Tuple[str, pd.Timestamp]]:
+    """Return ``(variable, timestamp)`` encoded in a :func:`prism_url`, if it is one."""
+
+    prefix = f"{PRISM_BASE_URL.rstrip('/')}/"
+    if not url.startswith(prefix):
+        return None
+    match = re.fullmatch(r"(?P<variable>[a-z0-9]+)/(?P<date>\d{8}|\d{6})", url[len(prefix) :], re.IGNORECASE)
+    if match is None:
+        return None
+    date = match.group("date")
+    return match.group("variable").lower(), pd.to_datetime(date, format=_DATE_FORMATS[len(date)])
+
+
+def _raster_member(archive: str | Path, driver: str) -> Tuple[str, str, pd.Timestamp]:
+    """Return ``(member, variable, timestamp)`` of the raster inside ``archive``.
+
+    Only the zip central directory is read; for remote archives it is
+    fetched with HTTP range requests.
+    """
+
+    if driver == "vsicurl":
+        handle = HTTPRangeFile(str(archive), session=get_session(), block_size=64 * 1024)
+    else:
+        handle = open(archive, "rb")
+    with handle, zipfile.ZipFile(handle) as zf:
+        names = zf.namelist()
+    for name in names:
+        parsed = _parse_member(name)
+        if parsed is not None:
+            return (name, *parsed)
+    raise ValueError(f"No PRISM .bil/.tif raster found in archive {archive}")
+
+
+def _gdal_path(archive: str | Path, member: str, driver: str) -> str:
+    # Braces delimit the archive, so cached blobs need no ``.zip`` suffix.
+    if driver == "vsicurl":
+        return f"/vsizip/{{/vsicurl/{archive}}}/{member}"
+    return f"/vsizip/{{{Path(archive).resolve()}}}/{member}"
+
+
+def _locate_archive(
+    archive: str,
+    driver: str,
+    cache: Optional[download_cache.DownloadCache],
+) -> Tuple[Tuple[str, str, Optional[str]], str, pd.Timestamp]:
+    """Return ``((archive, how, member), variable, timestamp)`` of one archive.
+
+    ``how`` is ``"cache"`` for files on disk, ``"vsicurl"`` for remote reads
+    and ``"fetch"`` for URLs that the step's read task downloads into
+    ``cache``. Cold PRISM web-service URLs carry their variable and date, so
+    they are not requested here at all and ``member`` stays ``None`` until
+    the download; other cold URLs have only their zip directory read.
+    """
+
+    if not _is_url(archive):
+        member, variable, stamp = _raster_member(archive, "cache")
+        return (archive, "cache", member), variable, stamp
+    if driver == "vsicurl":
+        member, variable, stamp = _raster_member(archive, "vsicurl")
+        return (archive, "vsicurl", member), variable, stamp
+    cached = cache.lookup(archive)
+    if cached is None:
+        parsed = _parse_service_url(archive)
+        if parsed is not None:
+            return (archive, "fetch", None), *parsed
+        try:
+            member, variable, stamp = _raster_member(archive, "vsicurl")
+            return (archive, "fetch", member), variable, stamp
+        except RangeRequestsUnsupported:
+            cached = cache.fetch(archive, revalidate=False)
+    member, variable, stamp = _raster_member(cached, "cache")
+    return (archive, "fetch", member), variable, stamp
+
+
+@contextmanager
+def _step_source(
+    step: Tuple[str, str, Optional[str]],
+    cache: Optional[download_cache.DownloadCache],
+) -> Iterator[str]:
+    """Yield the GDAL path of one step, downloading ``"fetch"`` archives first."""
+
+    archive, how, member = step
+    if how != "fetch":
+        yield _gdal_path(archive, member, how)
+        return
+    with cache.pin() as pin:
+        path = cache.fetch(archive, revalidate=False)
+        pin.add(path)
+        if not path.exists():  # evicted by another process before it was pinned
+            path = cache.fetch(archive, revalidate=False)
+            pin.add(path)
+        if member is None:
+            member = _raster_member(path, "cache")[0]
+        yield _gdal_path(path, member, "cache")
+
+
+def _read_step(
+    step: Tuple[str, str, Optional[str]],
+    window: Tuple[int, int, int, int],
+    transform,
+    cache: Optional[download_cache.DownloadCache],
+) -> np.ndarray:
+    with _step_source(step, cache) as path:
+        return _read_window(path, window, transform)
+
+
+def _aoi_window(
+    transform, width: int, height: int, bbox: Optional[Mapping[str, float]]
+) -> Tuple[int, int, int, int]:
+    """Return ``(row0, row1, col0, col1)`` of the pixels intersecting ``bbox``."""
+
+    if bbox is None:
+        return 0, height, 0, width
+    # Round away floating-point noise so AOI edges on pixel edges stay exact.
+    col0 = math.floor(round((bbox["min_lon"] - transform.c) / transform.a, 6))
+    col1 = math.ceil(round((bbox["max_lon"] - transform.c) / transform.a, 6))
+    row0 = math.floor(round((bbox["max_lat"] - transform.f) / transform.e, 6))
+    row1 = math.ceil(round((bbox["min_lat"] - transform.f) / transform.e, 6))
+    row0, row1 = max(row0, 0), min(max(row1, row0 + 1), height)
+    col0, col1 = max(col0, 0), min(max(col1, col0 + 1), width)
+    if row0 >= row1 or col0 >= col1:
+        raise ValueError("The AOI does not intersect the PRISM grid")
+    return row0, row1, col0, col1
+
+
+def _read_window(path: str, window: Tuple[int, int, int, int], transform) -> np.ndarray:
+    """Read one AOI window as float32 with nodata mapped to NaN."""
+
+    import rasterio
+    from rasterio.windows import Window
+
+    row0, row1, col0, col1 = window
+    with rasterio.open(path) as src:
+        if not src.transform.almost_equals(transform):
+            raise ValueError(f"{path} is not on the same grid as the other PRISM archives")
+        data = src.read(1, window=Window(col0, row0, col1 - col0, row1 - row0), out_dtype="float32")
+        if src.nodata is not None:
+            data[data == src.nodata] = np.nan
+    return data
+
+
+def _normalize_sources(
+    source: str | Mapping[str, str | Iterable[str]] | Iterable[str],
+) -> List[Tuple[Optional[str], str]]:
+    """Return ``(variable or None, archive)`` pairs from any accepted ``source``."""
+
+    if source is None:
+        raise ValueError("stream_prism_to_cube requires at least one PRISM zip archive")
+    if isinstance(source, Mapping):
+        pairs = []
+        for variable, archives in source.items():
+            archives = [archives] if isinstance(archives, (str, Path)) else list(archives)
+            pairs.extend((str(variable), str(archive)) for archive in archives)
+    elif isinstance(source, (str, Path)):
+        pairs = [(None, str(source))]
+    elif isinstance(source, Iterable):
+        pairs = [(None, str(archive)) for archive in source]
+    else:
+        raise ValueError(f"Unsupported PRISM source of type {type(source).__name__}")
+    if not pairs:
+        raise ValueError("stream_prism_to_cube requires at least one PRISM zip archive")
+    for _, archive in pairs:
+        if not _is_url(archive) and not zipfile.is_zipfile(archive):
+            raise ValueError(f"{archive} is not a readable PRISM zip archive")
+    return pairs
+
 
 def stream_prism_to_cube(
-    source: str | Mapping[str, str] | Iterable[str],
+    source: str | Mapping[str, str | Iterable[str]] | Iterable[str],
     variables: Sequence[str] | None = None,
     *,
     chunks: dict | str | None = None,
     preferred_driver: str | None = None,
-    **stream_kwargs,
+    bbox: Sequence[float] | None = None,
+    aoi_geojson: Mapping[str, object] | None = None,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    cache_dir: str | Path | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    show_progress: bool = False,
 ) -> xr.Dataset:
-    """Stream PRISM data into an xarray object.
+    """Stream PRISM zip archives into a lazy ``(time, y, x)`` Dataset.
 
-    Implementations should only fetch the bytes required to satisfy the request
-    rather than downloading entire yearly stacks.  The ``preferred_driver``
-    parameter leaves room for deciding between rasterio, fsspec, or GDAL-based
-    readers depending on what can yield streaming-friendly file objects.
+    Parameters
+    ----------
+    source : str, iterable of str, or mapping
+        PRISM zip archives as local paths or HTTP(S) URLs, one time step
+        each. Variables and dates are parsed from the raster member names
+        (``PRISM_ppt_stable_4kmD2_20200101_bil.bil``,
+        ``prism_tmean_us_25m_202001.tif``). A mapping ``{variable: archives}``
+        assigns the variable explicitly.
+    variables : sequence of str, optional
+        Variables to keep; all variables found are returned by default.
+    chunks : dict or str, optional
+        Dask chunking of the result. Defaults to one time step per chunk.
+    preferred_driver : {"cache", "vsicurl"}, optional
+        ``"cache"`` (default) downloads each remote archive into the download
+        cache when its time step is first computed. ``"vsicurl"`` reads
+        remote archives in place with HTTP range requests and caches nothing.
+    bbox : sequence of float, optional
+        AOI as ``[min_lon, min_lat, max_lon, max_lat]``.
+    aoi_geojson : mapping, optional
+        AOI as a GeoJSON Feature or geometry. Only one of ``bbox`` and
+        ``aoi_geojson`` may be given; without either the full grid is read.
+    start, end : datetime-like, optional
+        Inclusive time range used to filter the archives.
+    cache_dir : str or Path, optional
+        Download cache directory (see :mod:`cubedynamics.cache`). Archives
+        already cached there are not revalidated.
+    max_workers : int, default 4
+        Concurrent archive inspections (local or remote zip directories)
+        while the cube is built.
+    show_progress : bool, default False
+        Report progress of those inspections.
 
-    TODO: implement the actual streaming logic.
+    Returns
+    -------
+    xarray.Dataset
+        One float32 variable per PRISM variable, with dims ``(time, y, x)``
+        and pixel-center coordinates in the archive CRS (NAD83 degrees).
+
+    Notes
+    -----
+    All archives must share one grid; the window is derived from the first
+    archive and every read checks its transform. PRISM's web service limits
+    how often a file may be downloaded, so repeated requests should go
+    through the cache rather than ``"vsicurl"``.
+
+    Examples
+    --------
+    >>> from cubedynamics.prism_streaming import prism_archive_urls, stream_prism_to_cube
+    >>> urls = prism_archive_urls("ppt", "2020-07-01", "2020-07-31")
+    >>> ds = stream_prism_to_cube(urls, bbox=[-105.4, 40.0, -105.2, 40.1])  # doctest: +SKIP
     """
-    raise NotImplementedError("stream_prism_to_cube not implemented yet.")
+
+    driver = preferred_driver or "cache"
+    if driver not in _DRIVERS:
+        raise ValueError(f"preferred_driver must be one of {_DRIVERS}, got {preferred_driver!r}")
+    if bbox is not None and aoi_geojson is not None:
+        raise ValueError("Specify at most one of bbox or aoi_geojson.")
+    aoi = None
+    if bbox is not None:
+        aoi = bbox_mapping_from_sequence(bbox)
+    elif aoi_geojson is not None:
+        aoi = bbox_mapping_from_geojson(aoi_geojson)
+
+    pairs = _normalize_sources(source)
+    cache = None
+    if driver == "cache" and any(_is_url(archive) for _, archive in pairs):
+        cache = download_cache.default_cache() if cache_dir is None else download_cache.DownloadCache(cache_dir)
+
+    located = map_concurrent(
+        lambda archive: _locate_archive(archive, driver, cache),
+        [archive for _, archive in pairs],
+        max_workers=max_workers,
+        show_progress=show_progress,
+        description="PRISM archives",
+    )
+    steps: Dict[str, Dict[pd.Timestamp, Tuple[str, str, Optional[str]]]] = {}
+    for (explicit, _), (step, parsed_var, stamp) in zip(pairs, located):
+        name = explicit or parsed_var
+        if variables is not None and name not in variables:
+            continue
+        if (start is not None and stamp < pd.Timestamp(start)) or (end is not None and stamp > pd.Timestamp(end)):
+            continue
+        by_time = steps.setdefault(name, {})
+        if stamp in by_time:
+            raise ValueError(f"Several PRISM archives provide {name!r} for {stamp.date()}")
+        by_time[stamp] = step
+    missing = [name for name in (variables or []) if name not in steps]
+    if missing or not steps:
+        raise ValueError(f"No PRISM archives found for {missing or 'the requested period'}")
+
+    import rasterio
+
+    first_step = next(iter(next(iter(steps.values())).values()))
+    with _step_source(first_step, cache) as first_path, rasterio.open(first_path) as first:
+        transform, crs = first.transform, first.crs
+        window = _aoi_window(transform, first.width, first.height, aoi)
+    row0, row1, col0, col1 = window
+    shape = (row1 - row0, col1 - col0)
+    y_coords = transform.f + (np.arange(row0, row1) + 0.5) * transform.e
+    x_coords = transform.c + (np.arange(col0, col1) + 0.5) * transform.a
+
+    data_vars = {}
+    for name, by_time in steps.items():
+        times = sorted(by_time)
+        reads = [
+            dsa.from_delayed(
+                dask.delayed(_read_step, pure=True)(by_time[stamp], window, transform, cache),
+                shape=shape,
+                dtype=np.float32,
+            )
+            for stamp in times
+        ]
+        data_vars[name] = xr.DataArray(
+            dsa.stack(reads),
+            coords={TIME_DIM: pd.DatetimeIndex(times), Y_DIM: y_coords, X_DIM: x_coords},
+            dims=(TIME_DIM, Y_DIM, X_DIM),
+            name=name,
+            attrs={"crs": crs.to_string()} if crs else {},
+        )
+    ds = xr.Dataset(data_vars)
+    return ds.chunk(chunks) if chunks is not None else ds
 
 
-__all__ = ["stream_prism_to_cube"]
+__all__ = [
+    "PRISM_GRID",
+    "prism_archive_dates",
+    "prism_archive_urls",
+    "prism_grid_coords",
+    "prism_url",
+    "stream_prism_to_cube",
+]
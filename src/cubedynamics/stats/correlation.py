@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import warnings
+from typing import Iterator, Mapping, Sequence
+
 import numpy as np
 import xarray as xr
+from dask.utils import parse_bytes
 
-from ..utils.reference import center_pixel_indices, center_pixel_series
-from .rolling import rolling_pairwise_stat_cube
+from ..utils.reference import center_pixel_indices, center_pixel_series, reference_series
+from .rolling import _window_starts, rolling_corr_cube
 
 
 def pearson_corr_stat(x: np.ndarray, y: np.ndarray) -> float:
@@ -31,13 +35,16 @@ def rolling_corr_vs_center(
     min_t: int = 5,
     time_dim: str = "time",
 ) -> xr.DataArray:
-    """Build a rolling-window correlation cube vs the center pixel."""
+    """Build a rolling-window correlation cube vs the center pixel.
+
+    Uses the cumulative-sum engine :func:`~cubedynamics.stats.rolling.rolling_corr_cube`,
+    which matches applying :func:`pearson_corr_stat` to every window.
+    """
 
     ref = center_pixel_series(zcube, time_dim=time_dim)
-    corr_cube = rolling_pairwise_stat_cube(
+    corr_cube = rolling_corr_cube(
         cube=zcube,
         ref=ref,
-        stat_func=pearson_corr_stat,
         window_days=window_days,
         min_t=min_t,
         time_dim=time_dim,
@@ -51,3 +58,335 @@ def rolling_corr_vs_center(
         }
     )
     return corr_cube
+
+
+def _centred(x: np.ndarray) -> tuple[np.ndarray, np.ndarray | None, np.ndarray | None, np.ndarray]:
+    """Return centred ``x`` (gaps zeroed), its float mask, squares and flat columns.
+
+    Mask and squares are ``None`` for gap-free inputs, which take the fast path.
+    """
+
+    mask = np.isfinite(x)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        x0 = np.where(mask, x - np.nanmean(x, axis=0), 0.0)
+    if mask.all():
+        return x0, None, None, np.ptp(x, axis=0) == 0
+    return x0, mask.astype(np.float64), np.square(x0), np.zeros(x.shape[1], dtype=bool)
+
+
+def _corr_centred(a: tuple, b: tuple) -> np.ndarray:
+    """Correlate two :func:`_centred` inputs."""
+
+    a0, fa, a2, flat_a = a
+    b0, fb, b2, flat_b = b
+    if fa is None and fb is None:
+        sxy = a0.T @ b0
+        sxx = np.einsum("tp,tp->p", a0, a0)[:, None]
+        syy = np.einsum("tk,tk->k", b0, b0)[None, :]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = sxy / np.sqrt(sxx * syy)
+        r[flat_a[:, None] | flat_b[None, :] | (a0.shape[0] < 2)] = np.nan
+        return np.clip(r, -1.0, 1.0)
+
+    fa, a2 = (np.ones_like(a0), np.square(a0)) if fa is None else (fa, a2)
+    fb, b2 = (np.ones_like(b0), np.square(b0)) if fb is None else (fb, b2)
+    n = fa.T @ fb
+    sx = a0.T @ fb
+    sy = fa.T @ b0
+    sxx = a2.T @ fb
+    syy = fa.T @ b2
+    sxy = a0.T @ b0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        r = cov / np.sqrt(var_x * var_y)
+    degenerate = (n < 2) | (var_x <= 1e-10 * sxx) | (var_y <= 1e-10 * syy)
+    r[degenerate] = np.nan
+    return np.clip(r, -1.0, 1.0)
+
+
+def corr_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise-complete Pearson correlations between the columns of two arrays.
+
+    Parameters
+    ----------
+    a : numpy.ndarray
+        Array of shape ``(T, P)``, one series per column.
+    b : numpy.ndarray
+        Array of shape ``(T, K)``.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(P, K)`` matrix of correlations. NaNs are skipped pair by pair via
+        matrix products of the validity masks, so the whole block costs six
+        ``(P, T) @ (T, K)`` products (one for gap-free inputs).
+    """
+
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    return _corr_centred(_centred(a), _centred(b))
+
+
+def iter_corr_matrix_blocks(
+    values: np.ndarray,
+    block_rows: int,
+    *,
+    upper: bool = False,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Yield ``(row_start, block)`` row blocks of the full correlation matrix.
+
+    ``values`` has shape ``(T, P)`` and is centred once up front; each block
+    correlates ``block_rows`` columns against all ``P`` columns, so only
+    ``block_rows × P`` correlations exist at once. With ``upper=True`` a
+    block only covers the columns from ``row_start`` on (block column ``j``
+    is matrix column ``row_start + j``), skipping the lower triangle.
+    """
+
+    prepared = _centred(np.asarray(values, dtype=np.float64))
+    n_pixels = values.shape[1]
+
+    def _columns(index: slice) -> tuple:
+        return tuple(None if part is None else part[..., index] for part in prepared)
+
+    for start in range(0, n_pixels, block_rows):
+        rows = _columns(slice(start, start + block_rows))
+        yield start, _corr_centred(rows, _columns(slice(start if upper else 0, n_pixels)))
+
+
+def _rolling_corr_refs_numpy(
+    x: np.ndarray,
+    refs: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    block_elements: int = 2**22,
+) -> np.ndarray:
+    """Correlate ``x`` (..., T) with ``refs`` (T, K) for every window."""
+
+    lead = x.shape[:-1]
+    flat = x.reshape(-1, x.shape[-1]).T
+    n_pixels = flat.shape[1]
+    out = np.full((n_pixels, refs.shape[1], starts.size), np.nan, dtype=np.float32)
+    for w, (s, e) in enumerate(zip(starts, ends)):
+        window = slice(s, e + 1)
+        step = max(block_elements // max(e + 1 - s, 1), 1)
+        for p0 in range(0, n_pixels, step):
+            out[p0 : p0 + step, :, w] = corr_matrix(flat[window, p0 : p0 + step], refs[window])
+    return out.reshape(lead + out.shape[1:])
+
+
+def rolling_corr_vs_references(
+    zcube: xr.DataArray,
+    references: Sequence | Mapping,
+    window_days: int | None = 90,
+    min_t: int = 5,
+    time_dim: str = "time",
+    y_dim: str = "y",
+    x_dim: str = "x",
+) -> xr.DataArray:
+    """Build rolling-window correlation cubes vs K reference locations at once.
+
+    References are resolved with
+    :func:`~cubedynamics.utils.reference.reference_series`. For every window
+    all pixels are correlated with all references through one blocked matrix
+    product (see :func:`corr_matrix`), so the windowing work is shared by the
+    K references. ``window_days=None`` correlates the full record instead and
+    drops the window dimension.
+    """
+
+    refs = reference_series(zcube, references, y_dim=y_dim, x_dim=x_dim, time_dim=time_dim)
+    ref_values = np.asarray(refs.transpose(time_dim, "reference").values, dtype=np.float64)
+    times = zcube[time_dim].values
+    end_dim = f"{time_dim}_window_end"
+    if window_days is None:
+        starts = np.array([0])
+        ends = np.array([times.size - 1])
+    else:
+        starts = _window_starts(times, window_days)
+        ends = np.arange(times.size)
+        keep = (ends - starts + 1) >= min_t
+        starts, ends = starts[keep], ends[keep]
+    if starts.size == 0:
+        raise ValueError(f"No window contains at least min_t={min_t} time steps")
+
+    cube = zcube.chunk({time_dim: -1}) if zcube.chunks is not None else zcube
+    corr = xr.apply_ufunc(
+        _rolling_corr_refs_numpy,
+        cube,
+        input_core_dims=[[time_dim]],
+        output_core_dims=[["reference", end_dim]],
+        exclude_dims={time_dim},
+        dask="parallelized",
+        output_dtypes=[np.float32],
+        dask_gufunc_kwargs={"output_sizes": {"reference": refs.sizes["reference"], end_dim: starts.size}},
+        kwargs={"refs": ref_values, "starts": starts, "ends": ends},
+    )
+    corr = corr.assign_coords(reference=refs["reference"].values)
+    if window_days is None:
+        corr = corr.isel({end_dim: 0}, drop=True).transpose("reference", ...)
+    else:
+        corr = corr.assign_coords({end_dim: times[ends]}).transpose(end_dim, "reference", ...)
+    corr = corr.rename(zcube.name or "corr")
+    corr.attrs.update(
+        {
+            "long_name": "Pearson correlation vs reference locations",
+            "window_days": "full" if window_days is None else window_days,
+            "min_time_points": min_t,
+        }
+    )
+    return corr
+
+
+def _lag_spectra(v: np.ndarray, nfft: int) -> np.ndarray:
+    """Real FFTs of the centred series, its validity mask and its squares."""
+
+    mask = np.isfinite(v)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        v0 = np.where(mask, v - np.nanmean(v, axis=-1, keepdims=True), 0.0)
+    return np.fft.rfft(np.stack([v0, mask.astype(np.float64), np.square(v0)]), n=nfft, axis=-1)
+
+
+def _lag_nfft(n_time: int) -> int:
+    """FFT length that keeps every lag of a ``n_time`` record free of wrap-around."""
+
+    return 1 << int(np.ceil(np.log2(max(2 * n_time - 1, 1))))
+
+
+def _lagged_corr_numpy(
+    x: np.ndarray,
+    y: np.ndarray,
+    lags: np.ndarray,
+    min_t: int,
+    block_pixels: int | None = None,
+) -> np.ndarray:
+    """Pearson r of ``x[t]`` vs ``y[t - lag]`` for every lag, along the last axis.
+
+    The per-lag sums over the overlapping, pairwise-valid steps (n, Σx, Σy,
+    Σx², Σy², Σxy) are all cross-correlations, computed together with one
+    batch of real FFTs. Pixels are processed ``block_pixels`` at a time, and
+    an input holding a single series is transformed once and shared by
+    every block instead of being broadcast to every pixel.
+    """
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    shape = np.broadcast_shapes(x.shape, y.shape)
+    n_time = shape[-1]
+    n_pixels = int(np.prod(shape[:-1], dtype=np.int64))
+    nfft = _lag_nfft(n_time)
+
+    def _flat(v: np.ndarray) -> tuple[np.ndarray | None, np.ndarray | None]:
+        if int(np.prod(v.shape[:-1], dtype=np.int64)) == 1:
+            return None, _lag_spectra(v.reshape(1, n_time), nfft)
+        return np.broadcast_to(v, shape).reshape(n_pixels, n_time), None
+
+    x_flat, fx_shared = _flat(x)
+    y_flat, fy_shared = _flat(y)
+    if fy_shared is not None:
+        fy_shared = np.conj(fy_shared)
+
+    step = max(1, int(block_pixels or n_pixels))
+    out = np.empty((n_pixels, lags.size), dtype=np.float32)
+    for start in range(0, n_pixels, step):
+        rows = slice(start, start + step)
+        fx = fx_shared if x_flat is None else _lag_spectra(x_flat[rows], nfft)
+        fy = fy_shared if y_flat is None else np.conj(_lag_spectra(y_flat[rows], nfft))
+        out[rows] = _lagged_corr_spectra(fx, fy, lags, nfft, min_t)
+    return out.reshape(shape[:-1] + (lags.size,))
+
+
+def _lagged_corr_spectra(
+    fx: np.ndarray,
+    fy: np.ndarray,
+    lags: np.ndarray,
+    nfft: int,
+    min_t: int,
+) -> np.ndarray:
+    """Finish :func:`_lagged_corr_numpy` from ``x`` spectra and conjugated ``y`` spectra."""
+
+    def _xcorr(a: int, b: int) -> np.ndarray:
+        # irfft(A * conj(B))[k] = sum_t a[t + k] b[t]; negative lags wrap.
+        return np.fft.irfft(fx[a] * fy[b], n=nfft, axis=-1)[..., lags % nfft]
+
+    sxy = _xcorr(0, 0)
+    n = np.rint(_xcorr(1, 1))
+    sx = _xcorr(0, 1)
+    sy = _xcorr(1, 0)
+    sxx = _xcorr(2, 1)
+    syy = _xcorr(1, 2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        r = cov / np.sqrt(var_x * var_y)
+    degenerate = (n < max(min_t, 2)) | (var_x <= 1e-10 * sxx) | (var_y <= 1e-10 * syy)
+    r = np.clip(r, -1.0, 1.0)
+    r[degenerate] = np.nan
+    return r.astype(np.float32)
+
+
+def lagged_corr_cube(
+    cube: xr.DataArray,
+    other: xr.DataArray,
+    max_lag: int,
+    min_lag: int = 0,
+    min_t: int = 5,
+    time_dim: str = "time",
+    memory_budget: int | str = "256MB",
+) -> xr.DataArray:
+    """Correlate ``cube[t]`` with ``other[t - lag]`` for every lag at once.
+
+    Positive lags mean ``other`` leads ``cube``. Lags count time steps, so
+    both inputs are aligned on ``time_dim`` and assumed regularly sampled.
+    ``other`` may be a cube on the same grid or a single series, whose
+    spectrum is computed once and shared by every pixel. Dask inputs are
+    processed per spatial chunk with ``time_dim`` in a single chunk, and
+    within each chunk (or a NumPy input) pixels are transformed in blocks
+    sized so the FFT buffers of length ``nfft = 2**ceil(log2(2T - 1))``
+    stay within ``memory_budget``.
+    """
+
+    if max_lag < min_lag:
+        raise ValueError("max_lag must be >= min_lag")
+    cube, other = xr.align(cube, other, join="inner")
+    if abs(min_lag) >= cube.sizes[time_dim] or abs(max_lag) >= cube.sizes[time_dim]:
+        raise ValueError("Lags must be shorter than the overlapping record")
+    if cube.chunks is not None:
+        cube = cube.chunk({time_dim: -1})
+    if other.chunks is not None:
+        other = other.chunk({time_dim: -1})
+
+    lags = np.arange(min_lag, max_lag + 1)
+    n_time = cube.sizes[time_dim]
+    nfft = _lag_nfft(n_time)
+    # Per pixel: three half-spectra (~3 * nfft floats) per transformed input,
+    # one spectral product and its inverse, the six lag sums and the centred
+    # series, all float64.
+    sides = 2 if set(other.dims) - {time_dim} else 1
+    per_pixel = 8 * (nfft * (3 * sides + 2) + 6 * lags.size + 4 * n_time)
+    block_pixels = max(1, parse_bytes(memory_budget) // per_pixel)
+    corr = xr.apply_ufunc(
+        _lagged_corr_numpy,
+        cube,
+        other,
+        input_core_dims=[[time_dim], [time_dim]],
+        output_core_dims=[["lag"]],
+        exclude_dims={time_dim},
+        dask="parallelized",
+        output_dtypes=[np.float32],
+        dask_gufunc_kwargs={"output_sizes": {"lag": lags.size}},
+        kwargs={"lags": lags, "min_t": min_t, "block_pixels": block_pixels},
+    )
+    corr = corr.assign_coords(lag=lags).transpose("lag", ...)
+    corr = corr.rename(cube.name or "corr")
+    corr.attrs.update(
+        {
+            "long_name": "Lagged Pearson correlation (other leads by lag steps)",
+            "min_time_points": min_t,
+        }
+    )
+    return corr
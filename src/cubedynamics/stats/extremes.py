@@ -0,0 +1,242 @@
+"""Vectorized extreme-value fitting (GEV by L-moments) and return levels.
+
+All engines take block maxima with time on the last axis and fit every
+leading (pixel) index at once from probability-weighted moments, so a whole
+cube is fitted with a handful of array operations instead of one numerical
+optimisation per pixel. They can be fed directly to
+``xr.apply_ufunc(..., dask="parallelized")``.
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import Sequence
+
+import numpy as np
+import xarray as xr
+
+_BLOCK_ELEMENTS = 2**22
+_EULER_GAMMA = 0.5772156649015329
+_LANCZOS_G = 7.0
+_LANCZOS_COEFFS = (
+    0.99999999999980993,
+    676.5203681218851,
+    -1259.1392167224028,
+    771.32342877765313,
+    -176.61502916214059,
+    12.507343278686905,
+    -0.13857109526572012,
+    9.9843695780195716e-6,
+    1.5056327351493116e-7,
+)
+
+
+def _gamma(x: np.ndarray) -> np.ndarray:
+    """Vectorized gamma function (Lanczos approximation with reflection)."""
+
+    x = np.asarray(x, dtype=np.float64)
+    reflect = x < 0.5
+    z = np.where(reflect, 1.0 - x, x) - 1.0
+    series = np.full_like(z, _LANCZOS_COEFFS[0])
+    for i, coeff in enumerate(_LANCZOS_COEFFS[1:], start=1):
+        series = series + coeff / (z + i)
+    t = z + _LANCZOS_G + 0.5
+    value = np.sqrt(2 * np.pi) * t ** (z + 0.5) * np.exp(-t) * series
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(reflect, np.pi / (np.sin(np.pi * x) * value), value)
+
+
+def gev_fit_lmoments(maxima: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Fit a GEV to every series by L-moments (Hosking, 1985).
+
+    Parameters
+    ----------
+    maxima : numpy.ndarray
+        Block maxima with the sample on the last axis. NaNs are ignored per
+        series; fewer than three valid values give NaN parameters.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(location, scale, shape)`` with Hosking's sign convention for the
+        shape ``k`` (``k > 0`` is bounded above, equal to SciPy's ``c``).
+    """
+
+    x = np.sort(np.asarray(maxima, dtype=np.float64), axis=-1)  # NaNs sort last
+    n = np.isfinite(x).sum(axis=-1).astype(np.float64)[..., None]
+    i = np.arange(x.shape[-1], dtype=np.float64)  # 0-based rank
+    valid = i < n
+    xv = np.where(valid, x, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        w1 = i / (n - 1)
+        w2 = w1 * (i - 1) / (n - 2)
+        b0 = xv.sum(axis=-1) / n[..., 0]
+        b1 = np.where(valid, w1 * xv, 0.0).sum(axis=-1) / n[..., 0]
+        b2 = np.where(valid, w2 * xv, 0.0).sum(axis=-1) / n[..., 0]
+        l1 = b0
+        l2 = 2 * b1 - b0
+        t3 = (6 * b2 - 6 * b1 + b0) / l2
+
+        c = 2.0 / (3.0 + t3) - np.log(2.0) / np.log(3.0)
+        k = 7.8590 * c + 2.9554 * c * c
+        gumbel = np.abs(k) < 1e-6
+        safe_k = np.where(gumbel, 1.0, k)
+        g = _gamma(1.0 + safe_k)
+        scale = np.where(gumbel, l2 / np.log(2.0), l2 * safe_k / ((1.0 - 2.0 ** (-safe_k)) * g))
+        location = np.where(gumbel, l1 - _EULER_GAMMA * scale, l1 - scale * (1.0 - g) / safe_k)
+    bad = (n[..., 0] < 3) | ~(l2 > 0)
+    location = np.where(bad, np.nan, location)
+    scale = np.where(bad, np.nan, scale)
+    shape = np.where(bad, np.nan, np.where(gumbel, 0.0, k))
+    return location, scale, shape
+
+
+def gev_return_levels(
+    location: np.ndarray,
+    scale: np.ndarray,
+    shape: np.ndarray,
+    periods: Sequence[float],
+) -> np.ndarray:
+    """Return levels for ``periods`` (in blocks), stacked on a new last axis."""
+
+    periods = np.asarray(periods, dtype=np.float64)
+    if np.any(periods <= 1):
+        raise ValueError("Return periods must be greater than 1")
+    y = -np.log1p(-1.0 / periods)
+    mu = np.asarray(location)[..., None]
+    sigma = np.asarray(scale)[..., None]
+    k = np.asarray(shape)[..., None]
+    gumbel = np.abs(k) < 1e-6
+    safe_k = np.where(gumbel, 1.0, k)
+    return np.where(gumbel, mu - sigma * np.log(y), mu + sigma / safe_k * (1.0 - y**safe_k))
+
+
+def bootstrap_return_levels(
+    maxima: np.ndarray,
+    periods: Sequence[float],
+    *,
+    n_bootstrap: int = 200,
+    ci: float = 0.9,
+    seed: int | None = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Percentile bootstrap bounds of GEV return levels for every series.
+
+    All resamples of a block of series are drawn and fitted in one batched
+    call: every series is resampled (with replacement) from its own valid
+    values, so the resamples keep the per-series sample size. The uniform
+    draws behind the resample indices come from ``seed`` once and are shared
+    by every series, so a series gets the same interval however the cube is
+    blocked, chunked or tiled.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        ``(lower, upper)`` with ``periods`` on the last axis.
+    """
+
+    if not 0 < ci < 1:
+        raise ValueError("ci must be between 0 and 1")
+    x = np.sort(np.asarray(maxima, dtype=np.float64), axis=-1)
+    lead = x.shape[:-1]
+    flat = x.reshape(-1, x.shape[-1])
+    n_max = flat.shape[-1]
+    n_periods = len(periods)
+    lower = np.full((flat.shape[0], n_periods), np.nan)
+    upper = np.full_like(lower, np.nan)
+    draws = np.random.default_rng(seed).random((n_bootstrap, n_max))
+    alpha = (1.0 - ci) / 2.0
+
+    step = max(_BLOCK_ELEMENTS // max(n_bootstrap * n_max, 1), 1)
+    for start in range(0, flat.shape[0], step):
+        block = flat[start : start + step]
+        n = np.isfinite(block).sum(axis=-1)
+        index = np.minimum((draws * n[:, None, None]).astype(np.int64), n_max - 1)
+        samples = np.take_along_axis(block[:, None, :], index, axis=-1)
+        samples = np.where(np.arange(n_max) < n[:, None, None], samples, np.nan)
+        levels = gev_return_levels(*gev_fit_lmoments(samples), periods)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            lower[start : start + step] = np.nanquantile(levels, alpha, axis=1)
+            upper[start : start + step] = np.nanquantile(levels, 1.0 - alpha, axis=1)
+    return lower.reshape(lead + (n_periods,)), upper.reshape(lead + (n_periods,))
+
+
+def _return_levels_numpy(
+    maxima: np.ndarray,
+    periods: Sequence[float],
+    n_bootstrap: int,
+    ci: float,
+    seed: int | None,
+) -> tuple[np.ndarray, ...]:
+    location, scale, shape = gev_fit_lmoments(maxima)
+    levels = gev_return_levels(location, scale, shape, periods)
+    if n_bootstrap > 0:
+        lower, upper = bootstrap_return_levels(
+            maxima, periods, n_bootstrap=n_bootstrap, ci=ci, seed=seed
+        )
+    else:
+        lower = upper = np.full_like(levels, np.nan)
+    return location, scale, shape, levels, lower, upper
+
+
+def return_levels_dataset(
+    da: xr.DataArray,
+    periods: Sequence[float] = (10, 50, 100),
+    *,
+    dim: str = "time",
+    block: str | None = "YS",
+    n_bootstrap: int = 0,
+    ci: float = 0.9,
+    seed: int | None = 0,
+) -> xr.Dataset:
+    """GEV parameters and return levels for every pixel of ``da``.
+
+    ``block`` is the resampling frequency used to form block maxima along a
+    datetime ``dim`` (annual by default); ``None`` treats ``da`` as block
+    maxima already. With ``n_bootstrap > 0`` the ``ci`` percentile interval
+    is returned as ``return_level_lower`` / ``return_level_upper``.
+    """
+
+    if dim not in da.dims:
+        raise ValueError(f"Dimension {dim!r} not found in object dims: {tuple(da.dims)}")
+    periods = [float(p) for p in np.atleast_1d(periods)]
+    maxima = da.resample({dim: block}).max(skipna=True) if block is not None else da
+    if maxima.chunks is not None:
+        maxima = maxima.chunk({dim: -1})
+
+    outputs = xr.apply_ufunc(
+        _return_levels_numpy,
+        maxima,
+        input_core_dims=[[dim]],
+        output_core_dims=[[], [], [], ["return_period"], ["return_period"], ["return_period"]],
+        dask="parallelized",
+        output_dtypes=[np.float64] * 6,
+        dask_gufunc_kwargs={"output_sizes": {"return_period": len(periods)}},
+        kwargs={"periods": periods, "n_bootstrap": n_bootstrap, "ci": ci, "seed": seed},
+    )
+    names = (
+        "location",
+        "scale",
+        "shape",
+        "return_level",
+        "return_level_lower",
+        "return_level_upper",
+    )
+    out = xr.Dataset(dict(zip(names, outputs))).assign_coords(return_period=periods)
+    if n_bootstrap <= 0:
+        out = out.drop_vars(["return_level_lower", "return_level_upper"])
+    out = out.transpose("return_period", ...)
+    out["return_level"].attrs.update({"units": da.attrs.get("units", ""), "long_name": "GEV return level"})
+    out["shape"].attrs["long_name"] = "GEV shape (Hosking k; positive is bounded above)"
+    out.attrs.update({"gev_method": "lmoments", "block": block or "none", "n_blocks": maxima.sizes[dim]})
+    if n_bootstrap > 0:
+        out.attrs.update({"n_bootstrap": n_bootstrap, "ci": ci})
+    return out
+
+
+__all__ = [
+    "bootstrap_return_levels",
+    "gev_fit_lmoments",
+    "gev_return_levels",
+    "return_levels_dataset",
+]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import warnings
 from collections.abc import Callable
 
 import xarray as xr
@@ -9,6 +10,8 @@ import numpy as np
 
 StatFunc = Callable[[np.ndarray, np.ndarray], float]
 
+_REL_TOL = 1e-10
+
 
 def _empty_result(cube: xr.DataArray, time_dim: str, end_dim: str) -> xr.DataArray:
     template = cube.isel({time_dim: slice(0, 0)}).rename({time_dim: end_dim})
@@ -63,3 +66,108 @@ def rolling_pairwise_stat_cube(
         }
     )
     return cube_out
+
+
+def _window_starts(times: np.ndarray, window_days: int) -> np.ndarray:
+    """Return the first index of each ``[t - window_days, t]`` label window."""
+
+    return np.searchsorted(times, times - np.timedelta64(window_days, "D"), side="left")
+
+
+def _windowed_sum(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Sum ``values`` over ``[starts[i], ends[i]]`` along the last axis via a cumsum."""
+
+    csum = np.zeros(values.shape[:-1] + (values.shape[-1] + 1,), dtype=np.float64)
+    np.cumsum(values, axis=-1, out=csum[..., 1:])
+    return csum[..., ends + 1] - csum[..., starts]
+
+
+def _rolling_corr_numpy(
+    x: np.ndarray,
+    y: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> np.ndarray:
+    """Windowed Pearson r along the last axis from NaN-aware running sums."""
+
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    valid = ~(np.isnan(x) | np.isnan(y))
+    # Centering each series first keeps the cumulative sums small, which
+    # avoids cancellation in Σx² - (Σx)²/n over long records.
+    with np.errstate(invalid="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        x = x - np.nanmean(np.where(valid, x, np.nan), axis=-1, keepdims=True)
+        y = y - np.nanmean(np.where(valid, y, np.nan), axis=-1, keepdims=True)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+
+    n = _windowed_sum(valid.astype(np.float64), starts, ends)
+    sx = _windowed_sum(x, starts, ends)
+    sy = _windowed_sum(y, starts, ends)
+    sxx = _windowed_sum(x * x, starts, ends)
+    syy = _windowed_sum(y * y, starts, ends)
+    sxy = _windowed_sum(x * y, starts, ends)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        # Running-sum differences leave rounding residue for constant windows;
+        # treat variances that are negligible relative to Σx² as zero.
+        degenerate = (var_x <= _REL_TOL * sxx) | (var_y <= _REL_TOL * syy) | (n < 2)
+        r = cov / np.sqrt(var_x * var_y)
+    r = np.clip(r, -1.0, 1.0)
+    r[degenerate] = np.nan
+    return r.astype(np.float32)
+
+
+def rolling_corr_cube(
+    cube: xr.DataArray,
+    ref: xr.DataArray,
+    window_days: int,
+    min_t: int = 5,
+    time_dim: str = "time",
+) -> xr.DataArray:
+    """Rolling-window Pearson correlation vs a reference in one vectorized pass.
+
+    Equivalent to ``rolling_pairwise_stat_cube(cube, ref, pearson_corr_stat,
+    ...)`` but computes the windowed sums of x, y, x², y² and xy from
+    cumulative sums along ``time_dim``, so the cost is O(T × pixels)
+    regardless of the window length. Dask inputs are processed per spatial
+    chunk with ``time_dim`` in a single chunk.
+    """
+
+    end_dim = f"{time_dim}_window_end"
+    times = cube[time_dim].values
+    starts = _window_starts(times, window_days)
+    ends = np.arange(times.size)
+    keep = (ends - starts + 1) >= min_t
+    if not keep.any():
+        return _empty_result(cube, time_dim=time_dim, end_dim=end_dim)
+
+    if cube.chunks is not None:
+        cube = cube.chunk({time_dim: -1})
+    if ref.chunks is not None:
+        ref = ref.chunk({time_dim: -1})
+
+    out = xr.apply_ufunc(
+        _rolling_corr_numpy,
+        cube,
+        ref,
+        input_core_dims=[[time_dim], [time_dim]],
+        output_core_dims=[[end_dim]],
+        exclude_dims={time_dim},
+        dask="parallelized",
+        output_dtypes=[np.float32],
+        dask_gufunc_kwargs={"output_sizes": {end_dim: int(keep.sum())}},
+        kwargs={"starts": starts[keep], "ends": ends[keep]},
+    )
+    out = out.assign_coords({end_dim: times[keep]}).transpose(end_dim, ...)
+    out = out.rename(cube.name or "stat")
+    out.attrs.update(
+        {
+            "window_days": window_days,
+            "min_time_points": min_t,
+        }
+    )
+    return out
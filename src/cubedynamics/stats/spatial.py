@@ -1,9 +1,23 @@
-"""Spatial cube math primitives."""
+"""Spatial cube math primitives.
+
+Neighbourhood filters operate on the trailing ``(y, x)`` axes of a NumPy
+block. Box sums come from cumulative-sum (integral image) differences, so
+their cost per pixel does not depend on the kernel size; weighted kernels
+are applied separably, one axis at a time. Missing values are handled by
+normalized convolution: values and validity weights are filtered alike and
+divided. Dask cubes are filtered chunk by chunk with
+:func:`dask.array.map_overlap` and a halo equal to the kernel radius, so
+results at chunk boundaries match the in-memory computation exactly. Sums
+are accumulated in float64 and results are returned in the input's floating
+dtype (float64 for integer input).
+"""
 
 from __future__ import annotations
 
-from typing import Hashable, Literal
+from typing import Callable, Hashable, Literal
 
+import dask.array as dsa
+import numpy as np
 import xarray as xr
 
 from ..config import X_DIM, Y_DIM
@@ -25,21 +39,220 @@ def spatial_coarsen_mean(
     return da.coarsen({y_dim: factor_y, x_dim: factor_x}, boundary="trim").mean()
 
 
+def _window_sums(values: np.ndarray, radius: int, axis: int) -> np.ndarray:
+    """Sum over ``[i - radius, i + radius]`` along ``axis`` (clipped at edges)."""
+
+    n = values.shape[axis]
+    cumulative = np.cumsum(values, axis=axis)
+    pad = [(0, 0)] * values.ndim
+    pad[axis] = (1, 0)
+    cumulative = np.pad(cumulative, pad)
+    index = np.arange(n)
+    upper = np.take(cumulative, np.minimum(index + radius + 1, n), axis=axis)
+    lower = np.take(cumulative, np.maximum(index - radius, 0), axis=axis)
+    return upper - lower
+
+
+def _weighted_sums(values: np.ndarray, weights: np.ndarray, axis: int) -> np.ndarray:
+    """Correlate ``values`` with a centered 1-D kernel along ``axis`` (zero padded)."""
+
+    radius = weights.size // 2
+    n = values.shape[axis]
+    pad = [(0, 0)] * values.ndim
+    pad[axis] = (radius, radius)
+    padded = np.pad(values, pad)
+    out = np.zeros_like(values)
+    for offset, weight in enumerate(weights):
+        out += weight * np.take(padded, np.arange(offset, offset + n), axis=axis)
+    return out
+
+
+def _box_filter_numpy(block: np.ndarray, radius_y: int, radius_x: int, min_count: int) -> np.ndarray:
+    values = np.asarray(block, dtype=np.float64)
+    valid = np.isfinite(values)
+    total = np.where(valid, values, 0.0)
+    count = valid.astype(np.float64)
+    for axis, radius in ((-2, radius_y), (-1, radius_x)):
+        total = _window_sums(total, radius, axis)
+        count = _window_sums(count, radius, axis)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(count >= max(min_count, 1), total / count, np.nan)
+
+
+def _separable_filter_numpy(
+    block: np.ndarray,
+    weights_y: np.ndarray,
+    weights_x: np.ndarray,
+    min_weight: float,
+) -> np.ndarray:
+    values = np.asarray(block, dtype=np.float64)
+    valid = np.isfinite(values)
+    total = np.where(valid, values, 0.0)
+    norm = valid.astype(np.float64)
+    for axis, weights in ((-2, weights_y), (-1, weights_x)):
+        total = _weighted_sums(total, weights, axis)
+        norm = _weighted_sums(norm, weights, axis)
+    full = weights_y.sum() * weights_x.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(norm > max(min_weight * full, 1e-12 * full), total / norm, np.nan)
+
+
+def _apply_spatial_filter(
+    da: xr.DataArray,
+    func: Callable[..., np.ndarray],
+    halo_y: int,
+    halo_x: int,
+    y_dim: Hashable,
+    x_dim: Hashable,
+    **kwargs,
+) -> xr.DataArray:
+    """Run a ``(..., y, x)`` block filter, with a halo for dask-backed data."""
+
+    for dim in (y_dim, x_dim):
+        if dim not in da.dims:
+            raise ValueError(f"Dimension {dim!r} not found in object dims: {tuple(da.dims)}")
+    dtype = da.dtype if np.issubdtype(da.dtype, np.floating) else np.dtype(np.float64)
+
+    def _block(block: np.ndarray, **block_kwargs) -> np.ndarray:
+        return func(block, **block_kwargs).astype(dtype, copy=False)
+
+    ordered = da.transpose(..., y_dim, x_dim)
+    data = ordered.data
+    if isinstance(data, dsa.Array):
+        depth = {data.ndim - 2: halo_y, data.ndim - 1: halo_x}
+        filtered = data.map_overlap(
+            _block,
+            depth=depth,
+            boundary="none",
+            dtype=dtype,
+            meta=np.array((), dtype=dtype),
+            **kwargs,
+        )
+    else:
+        filtered = _block(np.asarray(data), **kwargs)
+    return ordered.copy(data=filtered).transpose(*da.dims)
+
+
+def spatial_box_filter(
+    da: xr.DataArray,
+    size: int | tuple[int, int] = 3,
+    y_dim: Hashable = Y_DIM,
+    x_dim: Hashable = X_DIM,
+    min_count: int = 1,
+) -> xr.DataArray:
+    """Mean of the valid values in a centered ``size`` box around each pixel.
+
+    Window sums come from integral images, so the cost per pixel is constant
+    in ``size``. NaNs are ignored and windows are clipped at the array edges;
+    pixels whose window has fewer than ``min_count`` valid values are NaN.
+    """
+
+    size_y, size_x = (size, size) if np.isscalar(size) else size
+    if size_y < 1 or size_x < 1 or size_y % 2 == 0 or size_x % 2 == 0:
+        raise ValueError("size must be a positive odd integer")
+    return _apply_spatial_filter(
+        da,
+        _box_filter_numpy,
+        size_y // 2,
+        size_x // 2,
+        y_dim,
+        x_dim,
+        radius_y=size_y // 2,
+        radius_x=size_x // 2,
+        min_count=min_count,
+    )
+
+
+def spatial_convolve(
+    da: xr.DataArray,
+    kernel_y: np.ndarray,
+    kernel_x: np.ndarray | None = None,
+    y_dim: Hashable = Y_DIM,
+    x_dim: Hashable = X_DIM,
+    min_weight: float = 0.0,
+) -> xr.DataArray:
+    """NaN-normalized separable convolution with odd-length 1-D kernels.
+
+    The kernel is applied along ``y`` then ``x`` (``kernel_x`` defaults to
+    ``kernel_y``). Values and validity weights are filtered alike and
+    divided, so missing values and array edges renormalize the kernel
+    instead of biasing the result toward zero. Pixels whose valid kernel
+    weight is at most ``min_weight`` times the full weight are NaN.
+    """
+
+    weights_y = np.asarray(kernel_y, dtype=np.float64)
+    weights_x = weights_y if kernel_x is None else np.asarray(kernel_x, dtype=np.float64)
+    for weights in (weights_y, weights_x):
+        if weights.ndim != 1 or weights.size % 2 == 0:
+            raise ValueError("Kernels must be one-dimensional with an odd length")
+    return _apply_spatial_filter(
+        da,
+        _separable_filter_numpy,
+        weights_y.size // 2,
+        weights_x.size // 2,
+        y_dim,
+        x_dim,
+        weights_y=weights_y,
+        weights_x=weights_x,
+        min_weight=min_weight,
+    )
+
+
+def gaussian_kernel(sigma: float, truncate: float = 4.0) -> np.ndarray:
+    """Normalized 1-D Gaussian kernel with radius ``round(truncate * sigma)``."""
+
+    if sigma <= 0:
+        raise ValueError("sigma must be positive")
+    radius = int(truncate * sigma + 0.5)
+    offsets = np.arange(-radius, radius + 1, dtype=np.float64)
+    weights = np.exp(-0.5 * (offsets / sigma) ** 2)
+    return weights / weights.sum()
+
+
+def spatial_gaussian_filter(
+    da: xr.DataArray,
+    sigma: float | tuple[float, float] = 1.0,
+    y_dim: Hashable = Y_DIM,
+    x_dim: Hashable = X_DIM,
+    truncate: float = 4.0,
+    min_weight: float = 0.0,
+) -> xr.DataArray:
+    """Separable, NaN-normalized Gaussian smoothing over the y/x dimensions.
+
+    ``sigma`` is in pixels (one value or ``(sigma_y, sigma_x)``); the kernel
+    is truncated at ``truncate`` standard deviations.
+    """
+
+    sigma_y, sigma_x = (sigma, sigma) if np.isscalar(sigma) else sigma
+    return spatial_convolve(
+        da,
+        gaussian_kernel(sigma_y, truncate),
+        gaussian_kernel(sigma_x, truncate),
+        y_dim=y_dim,
+        x_dim=x_dim,
+        min_weight=min_weight,
+    )
+
+
 def spatial_smooth_mean(
     da: xr.DataArray,
     kernel_size: int = 3,
     y_dim: Hashable = Y_DIM,
     x_dim: Hashable = X_DIM,
 ) -> xr.DataArray:
-    """Apply a boxcar spatial mean filter over the y/x dimensions."""
+    """Apply a boxcar spatial mean filter over the y/x dimensions.
+
+    Pixels whose window is incomplete (array edges or missing values) are
+    NaN; use :func:`spatial_box_filter` to average the valid values instead.
+    """
 
     if kernel_size < 1:
         raise ValueError("kernel_size must be >= 1")
     if kernel_size % 2 == 0:
         raise ValueError("kernel_size must be an odd integer")
-    return da.rolling(
-        {y_dim: kernel_size, x_dim: kernel_size}, center=True
-    ).mean()
+    return spatial_box_filter(
+        da, kernel_size, y_dim=y_dim, x_dim=x_dim, min_count=kernel_size * kernel_size
+    )
 
 
 def mask_by_threshold(
@@ -8,6 +8,7 @@ import numpy as np
 import xarray as xr
 
 from ..utils.reference import center_pixel_indices, center_pixel_series
+from .rolling import _window_starts
 
 
 def _rank_1d(a: np.ndarray) -> np.ndarray:
@@ -61,6 +62,99 @@ def partial_tail_spearman(
     return (left, right, diff)
 
 
+_BATCH_ELEMENTS = 2**24
+
+
+def _batch_ranks(a: np.ndarray) -> np.ndarray:
+    """Ordinal ranks (1..n) along the last axis; NaNs sort last."""
+
+    order = np.argsort(a, axis=-1, kind="mergesort")
+    ranks = np.empty(a.shape, dtype=float)
+    positions = np.broadcast_to(np.arange(1, a.shape[-1] + 1, dtype=float), a.shape)
+    np.put_along_axis(ranks, order, positions, axis=-1)
+    return ranks
+
+
+def _tail_spearman_batch(
+    x: np.ndarray,
+    y: np.ndarray,
+    b: float,
+    min_t: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized :func:`partial_tail_spearman` over all leading axes.
+
+    ``x`` and ``y`` hold one window per row along the last axis. Every row is
+    ranked by a single batched ``argsort`` and the tail masks are boolean
+    arrays of the same shape, so no Python code runs per pixel.
+    """
+
+    valid = ~(np.isnan(x) | np.isnan(y))
+    n = valid.sum(axis=-1)
+    n_f = n.astype(float)[..., None]
+    u = np.where(valid, _batch_ranks(np.where(valid, x, np.nan)) / (n_f + 1.0), 0.0)
+    v = np.where(valid, _batch_ranks(np.where(valid, y, np.nan)) / (n_f + 1.0), 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u_dev = np.where(valid, u - u.sum(axis=-1, keepdims=True) / n_f, 0.0)
+        v_dev = np.where(valid, v - v.sum(axis=-1, keepdims=True) / n_f, 0.0)
+        u_var = (u_dev**2).sum(axis=-1) / (n - 1)
+        v_var = (v_dev**2).sum(axis=-1) / (n - 1)
+        denom = (n - 1) * np.sqrt(u_var * v_var)
+    usable = (n >= min_t) & (denom > 0)
+
+    uv_sum = u + v
+    left_mask = valid & (uv_sum > 0.0) & (uv_sum < 2.0 * b)
+    right_mask = valid & (uv_sum > 2.0 * b) & (uv_sum < 2.0)
+    cross = u_dev * v_dev
+
+    def _tail_corr(mask: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.where(mask, cross, 0.0).sum(axis=-1) / denom
+        return np.where(usable & (mask.sum(axis=-1) >= min_t), corr, np.nan)
+
+    left = _tail_corr(left_mask)
+    right = _tail_corr(right_mask)
+    return left, right, left - right
+
+
+def _rolling_tail_dep_numpy(
+    x: np.ndarray,
+    y: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    b: float,
+    min_t: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Tail dependence for every ``[starts[i], ends[i]]`` window along the last axis.
+
+    Windows of equal length are gathered from a sliding-window view and
+    processed together in batches of at most ``_BATCH_ELEMENTS`` values.
+    """
+
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+    lead = x.shape[:-1]
+    outputs = tuple(np.full(lead + (starts.size,), np.nan, dtype=np.float32) for _ in range(3))
+    lengths = ends - starts + 1
+    n_pixels = max(int(np.prod(lead)), 1)
+
+    for length in np.unique(lengths):
+        x_view = np.lib.stride_tricks.sliding_window_view(x, int(length), axis=-1)
+        y_view = np.lib.stride_tricks.sliding_window_view(y, int(length), axis=-1)
+        window_ids = np.flatnonzero(lengths == length)
+        batch = max(_BATCH_ELEMENTS // (n_pixels * int(length)), 1)
+        for offset in range(0, window_ids.size, batch):
+            ids = window_ids[offset : offset + batch]
+            results = _tail_spearman_batch(
+                x_view[..., starts[ids], :],
+                y_view[..., starts[ids], :],
+                b=b,
+                min_t=min_t,
+            )
+            for out, result in zip(outputs, results):
+                out[..., ids] = result
+    return outputs
+
+
 def rolling_tail_dep_vs_center(
     zcube: xr.DataArray,
     window_days: int = 90,
@@ -68,49 +162,45 @@ def rolling_tail_dep_vs_center(
     b: float = 0.5,
     time_dim: str = "time",
 ) -> tuple[xr.DataArray, xr.DataArray, xr.DataArray]:
-    """Build rolling-window tail-dependence cubes vs the center pixel."""
+    """Build rolling-window tail-dependence cubes vs the center pixel.
+
+    Each window ``[t - window_days, t]`` is evaluated for all pixels at once
+    (batched ranking, boolean tail masks), matching
+    :func:`partial_tail_spearman` applied pixel by pixel. Dask inputs are
+    processed per spatial chunk with ``time_dim`` in a single chunk.
+    """
 
     ref = center_pixel_series(zcube, time_dim=time_dim)
     end_dim = f"{time_dim}_window_end"
-    bottoms: list[xr.DataArray] = []
-    tops: list[xr.DataArray] = []
-    diffs: list[xr.DataArray] = []
-    end_times: list[np.datetime64] = []
-
-    for t_end in zcube[time_dim].values:
-        t_start = t_end - np.timedelta64(window_days, "D")
-        cube_sub = zcube.sel({time_dim: slice(t_start, t_end)})
-        ref_sub = ref.sel({time_dim: slice(t_start, t_end)})
-        if cube_sub.sizes.get(time_dim, 0) < min_t:
-            continue
-        bottom, top, diff = xr.apply_ufunc(
-            partial_tail_spearman,
-            cube_sub,
-            ref_sub,
-            input_core_dims=[[time_dim], [time_dim]],
-            output_core_dims=[[], [], []],
-            vectorize=True,
-            dask="parallelized",
-            output_dtypes=[np.float32, np.float32, np.float32],
-            kwargs={"b": b, "min_t": min_t},
-        )
-        bottoms.append(bottom.expand_dims({end_dim: [t_end]}))
-        tops.append(top.expand_dims({end_dim: [t_end]}))
-        diffs.append(diff.expand_dims({end_dim: [t_end]}))
-        end_times.append(t_end)
+    times = zcube[time_dim].values
+    starts = _window_starts(times, window_days)
+    ends = np.arange(times.size)
+    keep = (ends - starts + 1) >= min_t
 
-    if not end_times:
+    if not keep.any():
         template = zcube.isel({time_dim: slice(0, 0)}).rename({time_dim: end_dim})
         empty = xr.full_like(template, np.nan, dtype="float32")
         return empty, empty.copy(), empty.copy()
 
-    bottom_cube = xr.concat(bottoms, dim=end_dim)
-    top_cube = xr.concat(tops, dim=end_dim)
-    diff_cube = xr.concat(diffs, dim=end_dim)
-    coords = {end_dim: np.array(end_times)}
-    bottom_cube = bottom_cube.assign_coords(coords)
-    top_cube = top_cube.assign_coords(coords)
-    diff_cube = diff_cube.assign_coords(coords)
+    cube = zcube.chunk({time_dim: -1}) if zcube.chunks is not None else zcube
+    if ref.chunks is not None:
+        ref = ref.chunk({time_dim: -1})
+    n_windows = int(keep.sum())
+    cubes = xr.apply_ufunc(
+        _rolling_tail_dep_numpy,
+        cube,
+        ref,
+        input_core_dims=[[time_dim], [time_dim]],
+        output_core_dims=[[end_dim], [end_dim], [end_dim]],
+        exclude_dims={time_dim},
+        dask="parallelized",
+        output_dtypes=[np.float32, np.float32, np.float32],
+        dask_gufunc_kwargs={"output_sizes": {end_dim: n_windows}},
+        kwargs={"starts": starts[keep], "ends": ends[keep], "b": b, "min_t": min_t},
+    )
+    bottom_cube, top_cube, diff_cube = (
+        da.assign_coords({end_dim: times[keep]}).transpose(end_dim, ...) for da in cubes
+    )
 
     y_idx, x_idx = center_pixel_indices(zcube)
     for da in (bottom_cube, top_cube, diff_cube):
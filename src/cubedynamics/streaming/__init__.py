@@ -1,10 +1,22 @@
 """Streaming data helpers for CubeDynamics."""
+from .archive import ingest_gridmet_archive, open_gridmet_archive
+from .cache import TileCache
 from .gridmet import stream_gridmet_to_cube
+from .http_range import HTTPRangeFile
+from .reducers import CovarianceState, HistogramState, MomentState, merge_states
 from .virtual import VirtualCube, make_spatial_tiler, make_time_tiler
 
 __all__ = [
+    "CovarianceState",
+    "HTTPRangeFile",
+    "HistogramState",
+    "MomentState",
+    "TileCache",
     "VirtualCube",
+    "ingest_gridmet_archive",
     "make_spatial_tiler",
     "make_time_tiler",
+    "merge_states",
+    "open_gridmet_archive",
     "stream_gridmet_to_cube",
 ]
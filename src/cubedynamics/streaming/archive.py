@@ -0,0 +1,297 @@
+"""Time-series friendly Zarr archives built from yearly NetCDF files.
+
+gridMET publishes one NetCDF file per variable and year, chunked for
+CONUS-wide daily maps. Reading a point or a county through those files
+decodes whole continental chunks for every day. The helpers here rechunk the
+yearly files once into a local Zarr store per variable with long time chunks
+and small spatial tiles (``366 x 32 x 32`` by default), so a point
+time-series touches about one small chunk per year.
+
+Archives grow incrementally: each ingest appends only the years that are not
+yet stored, keeping the time axis sorted. Years already present are skipped,
+so re-running an ingest is cheap; a partially stored trailing year (such as
+the current one) is topped up with the days published since.
+
+Canonical API:
+- :func:`ingest_gridmet_archive`
+- :func:`open_gridmet_archive`
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from cubedynamics.progress import progress_bar
+from cubedynamics.streaming.fetch import DEFAULT_MAX_WORKERS
+
+DEFAULT_ARCHIVE_DIR = Path(
+    os.environ.get("CUBEDYNAMICS_ARCHIVE_DIR", Path.home() / ".cache" / "cubedynamics" / "archive")
+)
+ARCHIVE_CHUNKS: Mapping[str, int] = {"time": 366, "lat": 32, "lon": 32}
+_ARCHIVE_DIMS = ("time", "lat", "lon")
+
+
+def gridmet_archive_path(variable: str, root: str | Path | None = None) -> Path:
+    """Return the Zarr store holding the archived gridMET ``variable``."""
+
+    return Path(root or DEFAULT_ARCHIVE_DIR) / "gridmet" / f"{variable}.zarr"
+
+
+def archive_years(store: str | Path) -> List[int]:
+    """Return the sorted calendar years stored in ``store`` (empty if missing)."""
+
+    if not Path(store).exists():
+        return []
+    with xr.open_zarr(str(store), consolidated=False) as ds:
+        if "time" not in ds.coords or not ds.sizes.get("time"):
+            return []
+        return sorted({int(year) for year in ds["time"].dt.year.values})
+
+
+def _stored_span(store: str | Path) -> Optional[tuple[pd.Timestamp, pd.Timestamp]]:
+    """Return the first and last stored time steps (``None`` if empty)."""
+
+    if not Path(store).exists():
+        return None
+    with xr.open_zarr(str(store), consolidated=False) as ds:
+        if "time" not in ds.coords or not ds.sizes.get("time"):
+            return None
+        times = ds["time"].values
+        return pd.Timestamp(times[0]), pd.Timestamp(times[-1])
+
+
+def _pending_years(store: str | Path, years: Sequence[int]) -> List[int]:
+    """Return the ``years`` still to ingest, including a partially stored last year."""
+
+    stored = set(archive_years(store))
+    pending = [year for year in years if year not in stored]
+    span = _stored_span(store)
+    if span is not None:
+        last = span[1]
+        if last.year in years and last.normalize() < pd.Timestamp(year=last.year, month=12, day=31):
+            pending.append(last.year)
+    return sorted(pending)
+
+
+def _time_chunks(length: int, offset: int, size: int) -> tuple[int, ...]:
+    """Split ``length`` steps so boundaries align with ``size`` after ``offset``."""
+
+    chunks = []
+    first = size - offset % size
+    if first < size:
+        chunks.append(min(first, length))
+    remaining = length - sum(chunks)
+    chunks.extend([size] * (remaining // size))
+    if remaining % size:
+        chunks.append(remaining % size)
+    return tuple(chunks)
+
+
+def append_to_archive(
+    store: str | Path,
+    da: xr.DataArray,
+    *,
+    chunks: Optional[Mapping[str, int]] = None,
+) -> Path:
+    """Append a ``(time, lat, lon)`` slab to the Zarr archive at ``store``.
+
+    The first call creates the store with ``chunks`` (default
+    :data:`ARCHIVE_CHUNKS`); later calls append along ``time``. Dask chunks
+    are aligned to the store's chunk boundaries before writing so concurrent
+    chunk writes never overlap.
+
+    Parameters
+    ----------
+    store : str or Path
+        Target Zarr store, one per variable.
+    da : xarray.DataArray
+        Named slab with dims ``time``, ``lat`` and ``lon``. Its first time
+        step must come after the last one already stored, and its spatial
+        grid must match the store.
+    chunks : mapping, optional
+        Zarr chunk sizes for a new store; ignored when appending.
+
+    Returns
+    -------
+    Path
+        The store path.
+    """
+
+    if da.name is None:
+        raise ValueError("Archived DataArrays must be named")
+    missing = [dim for dim in _ARCHIVE_DIMS if dim not in da.dims]
+    if missing:
+        raise ValueError(f"Archive slabs need dims {_ARCHIVE_DIMS}; missing {missing}")
+    store = Path(store)
+    name = str(da.name)
+    da = da.transpose(*_ARCHIVE_DIMS).sortby("time")
+    payload = da.to_dataset()
+    for var in payload.variables.values():
+        var.encoding = {}
+
+    if not store.exists():
+        sizes = {**ARCHIVE_CHUNKS, **(chunks or {})}
+        chunk_shape = tuple(
+            da.sizes[dim] if int(sizes[dim]) == -1 else int(sizes[dim]) for dim in _ARCHIVE_DIMS
+        )
+        payload = payload.chunk(dict(zip(_ARCHIVE_DIMS, chunk_shape)))
+        store.parent.mkdir(parents=True, exist_ok=True)
+        payload.to_zarr(
+            str(store),
+            mode="w",
+            encoding={
+                name: {"chunks": chunk_shape},
+                "time": {"units": "days since 1900-01-01", "dtype": "int64"},
+            },
+            consolidated=False,
+        )
+        return store
+
+    with xr.open_zarr(str(store), consolidated=False) as existing:
+        if name not in existing.data_vars:
+            raise ValueError(f"Archive {store} does not hold {name!r}")
+        for dim in ("lat", "lon"):
+            if not np.allclose(existing[dim].values, da[dim].values):
+                raise ValueError(f"Spatial grid along {dim!r} does not match archive {store}")
+        if existing.sizes["time"] and da["time"].values[0] <= existing["time"].values[-1]:
+            raise ValueError(
+                f"Cannot append data starting {pd.Timestamp(da['time'].values[0]).date()} to "
+                f"{store}, which already ends {pd.Timestamp(existing['time'].values[-1]).date()}. "
+                "Rebuild the archive to insert earlier periods."
+            )
+        stored_length = existing.sizes["time"]
+        zarr_chunks = existing[name].encoding["preferred_chunks"]
+
+    time_chunks = _time_chunks(da.sizes["time"], stored_length, zarr_chunks["time"])
+    payload = payload.chunk({"time": time_chunks, "lat": zarr_chunks["lat"], "lon": zarr_chunks["lon"]})
+    payload.to_zarr(str(store), append_dim="time", consolidated=False)
+    return store
+
+
+def _normalize_gridmet_year(ds: xr.Dataset, variable: str) -> xr.DataArray:
+    if "day" in ds.dims or "day" in ds.coords:
+        ds = ds.rename({"day": "time"})
+    if variable not in ds.data_vars and len(ds.data_vars) == 1:
+        (only_var,) = tuple(ds.data_vars)
+        ds = ds.rename({only_var: variable})
+    da = ds[variable]
+    return da.drop_vars([coord for coord in da.coords if coord not in _ARCHIVE_DIMS])
+
+
+def ingest_gridmet_archive(
+    variables: str | Sequence[str],
+    years: Iterable[int],
+    root: str | Path | None = None,
+    *,
+    cache_dir: str | Path | None = None,
+    chunks: Optional[Mapping[str, int]] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    show_progress: bool = True,
+) -> Dict[str, Path]:
+    """Rechunk yearly gridMET files into per-variable Zarr archives.
+
+    Parameters
+    ----------
+    variables : str or sequence of str
+        gridMET variable names, e.g. ``"tmmx"`` or ``["pr", "vpd"]``.
+    years : iterable of int
+        Years to ingest. Years already in an archive are skipped, except a
+        last stored year that ends before December 31 (e.g. the current
+        year), which is topped up with the days published since. New years
+        must come after the last stored year.
+    root : str or Path, optional
+        Archive directory. Defaults to ``CUBEDYNAMICS_ARCHIVE_DIR`` or
+        ``~/.cache/cubedynamics/archive``.
+    cache_dir : str or Path, optional
+        Download cache for the yearly NetCDF files (see
+        :mod:`cubedynamics.cache`); files already cached are reused.
+    chunks : mapping, optional
+        Zarr chunk sizes for new archives. Defaults to
+        :data:`ARCHIVE_CHUNKS` (``time=366, lat=32, lon=32``).
+    max_workers : int, default 4
+        Concurrent downloads of missing yearly files.
+    show_progress : bool, default True
+        Report download and ingest progress.
+
+    Returns
+    -------
+    dict
+        Mapping ``variable -> Path`` of the archive stores.
+
+    Examples
+    --------
+    >>> from cubedynamics.streaming.archive import ingest_gridmet_archive
+    >>> stores = ingest_gridmet_archive(["tmmx", "pr"], range(2000, 2021))  # doctest: +SKIP
+    """
+
+    from cubedynamics.streaming.gridmet import _STREAM_ENGINE, download_gridmet_files
+
+    names = [variables] if isinstance(variables, str) else list(variables)
+    requested = sorted({int(year) for year in years})
+    pending = {name: _pending_years(gridmet_archive_path(name, root), requested) for name in names}
+    files = download_gridmet_files(
+        [name for name in names if pending[name]],
+        sorted({year for todo in pending.values() for year in todo}),
+        cache_dir,
+        max_workers=max_workers,
+        show_progress=show_progress,
+    )
+
+    stores = {}
+    total = sum(len(todo) for todo in pending.values()) if show_progress else None
+    with progress_bar(total=total, description="gridMET archive") as advance:
+        for name in names:
+            store = gridmet_archive_path(name, root)
+            for year in pending[name]:
+                with xr.open_dataset(files[(name, year)], engine=_STREAM_ENGINE, chunks={}) as ds:
+                    da = _normalize_gridmet_year(ds, name)
+                    span = _stored_span(store)
+                    if span is not None:
+                        # A partially ingested year only gains the days after its last step.
+                        da = da.sel(time=da["time"] > np.datetime64(span[1]))
+                    if da.sizes["time"]:
+                        append_to_archive(store, da, chunks=chunks)
+                if show_progress:
+                    advance(1)
+            stores[name] = store
+    return stores
+
+
+def open_gridmet_archive(
+    variable: str,
+    start: str | pd.Timestamp,
+    end: str | pd.Timestamp,
+    root: str | Path | None = None,
+) -> Optional[xr.DataArray]:
+    """Open the archived gridMET ``variable`` for ``[start, end]``.
+
+    Returns ``None`` when no archive exists or it does not cover every day
+    of the requested range (a missing year, or a trailing year ingested
+    before ``end`` was published), so callers can fall back to remote reads.
+    """
+
+    store = gridmet_archive_path(variable, root)
+    span = _stored_span(store)
+    start_ts, end_ts = pd.Timestamp(start), pd.Timestamp(end)
+    if span is None or span[0] > start_ts.normalize() or span[1] < end_ts.normalize():
+        return None
+    if not set(range(start_ts.year, end_ts.year + 1)) <= set(archive_years(store)):
+        return None
+    ds = xr.open_zarr(str(store), consolidated=False)
+    return ds[variable].sel(time=slice(start_ts, end_ts))
+
+
+__all__ = [
+    "ARCHIVE_CHUNKS",
+    "append_to_archive",
+    "archive_years",
+    "gridmet_archive_path",
+    "ingest_gridmet_archive",
+    "open_gridmet_archive",
+]
@@ -0,0 +1,285 @@
+"""On-disk tile cache for :class:`~cubedynamics.streaming.VirtualCube`.
+
+Tiles are keyed by a stable hash of the loader identity plus the full loader
+keyword arguments for the tile (base ``loader_kwargs`` merged with the tile
+spec) and stored as compressed NetCDF files in the unified download cache
+(:mod:`cubedynamics.cache`), which caps its size and evicts
+least-recently-used files first. Loaders whose identity is unknown (lambdas,
+closures, stateful callables without a ``cache_token``) are not cached.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+import warnings
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from dask.utils import parse_bytes
+
+from .. import cache as download_cache
+
+_DATAARRAY_VARIABLE = "__xarray_dataarray_variable__"
+_NO_TOKEN = object()
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, np.datetime64):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    return repr(value)
+
+
+def _loader_identity(loader: Callable[..., Any] | None) -> Any:
+    """Return a JSON-serialisable identity for ``loader`` (``None`` if unknown)."""
+
+    if loader is None:
+        return ""
+    token = getattr(loader, "cache_token", _NO_TOKEN)
+    if token is not _NO_TOKEN:
+        return None if token is None else ["cache_token", str(token)]
+    if isinstance(loader, functools.partial):
+        func = _loader_identity(loader.func)
+        return None if func is None else [func, list(loader.args), dict(loader.keywords)]
+    if inspect.ismethod(loader):
+        owner = _loader_identity(loader.__self__)
+        return None if owner is None else [owner, loader.__name__]
+    if inspect.isfunction(loader) or inspect.isbuiltin(loader) or isinstance(loader, type):
+        qualname = loader.__qualname__
+        if "<lambda>" in qualname or "<locals>" in qualname:
+            # Lambdas and closures share a name across definitions and capture
+            # state the name does not reflect.
+            return None
+        return f"{loader.__module__}.{qualname}"
+    # Callable instances carry state (baselines, statistics) that their class
+    # name does not reflect; they must expose a ``cache_token``.
+    return None
+
+
+def loader_token(loader: Callable[..., Any] | None) -> Optional[str]:
+    """Return a stable token identifying ``loader``, or ``None`` if it has none.
+
+    Module-level functions and classes are identified by module and qualified
+    name, :func:`functools.partial` objects by their function and bound
+    arguments. Lambdas, closures and callable instances are only identified
+    through a ``cache_token`` attribute (a string, or a property returning one
+    that reflects the instance state); without it they are not cacheable.
+    """
+
+    identity = _loader_identity(loader)
+    if identity is None:
+        return None
+    payload = json.dumps(identity, sort_keys=True, default=_json_default)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def tile_key(loader: Callable[..., Any] | None, kwargs: Mapping[str, Any]) -> str:
+    """Return a stable hex digest identifying one tile request.
+
+    Parameters
+    ----------
+    loader : callable, optional
+        Tile loader; its identity (see :func:`loader_token`) is part of the
+        key so different variables sharing the same AOI/time kwargs do not
+        collide.
+    kwargs : mapping
+        Full keyword arguments passed to ``loader`` for the tile.
+
+    Raises
+    ------
+    ValueError
+        If ``loader`` cannot be identified, e.g. a lambda or closure without
+        a ``cache_token``.
+    """
+
+    token = loader_token(loader) if loader is not None else ""
+    if token is None:
+        raise ValueError(
+            f"Tile loader {loader!r} cannot be identified for caching; use a module-level "
+            "function or functools.partial, or set a 'cache_token' attribute"
+        )
+    payload = json.dumps(
+        {"loader": token, "kwargs": dict(kwargs)},
+        sort_keys=True,
+        default=_json_default,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TileCache:
+    """Size-capped LRU cache of tiles stored as compressed NetCDF files.
+
+    Tiles live in a :class:`~cubedynamics.cache.DownloadCache` under keys
+    ``"tile:<tile key>"``, so they share its content-addressed storage,
+    checksums, locking and least-recently-used eviction with downloaded
+    files.
+
+    Parameters
+    ----------
+    cache_dir : str or Path, optional
+        Cache directory. Defaults to the download cache directory
+        (``CUBEDYNAMICS_CACHE_DIR``), so tiles and downloads share one cap.
+    max_bytes : int or str, optional
+        Upper bound on the total size of the cache directory. Defaults to
+        the download cache cap (``CUBEDYNAMICS_CACHE_MAX_BYTES``).
+    complevel : int, default 4
+        zlib compression level used when writing tiles.
+
+    Notes
+    -----
+    Recency is tracked through file modification times, so the LRU order
+    survives across Python sessions and notebooks sharing a cache directory.
+    ``hits`` and ``misses`` count activity for this instance, ``evictions``
+    the files its writes evicted.
+    """
+
+    suffix = ".nc"
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        *,
+        max_bytes: int | str | None = None,
+        complevel: int = 4,
+    ) -> None:
+        self.store = download_cache.DownloadCache(cache_dir, max_bytes=max_bytes)
+        self.cache_dir = self.store.root
+        self.complevel = complevel
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self.store.max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int | str) -> None:
+        self.store.max_bytes = parse_bytes(value)
+
+    @property
+    def evictions(self) -> int:
+        return self.store.evictions
+
+    @staticmethod
+    def _entry_key(key: str) -> str:
+        return f"tile:{key}"
+
+    def path_for(self, key: str) -> Optional[Path]:
+        """Return the cached file for ``key`` (``None`` if absent) without touching it."""
+
+        return self.store.lookup(self._entry_key(key), touch=False)
+
+    def get(self, key: str) -> Optional[xr.DataArray]:
+        """Return the cached tile for ``key`` or ``None`` on a miss."""
+
+        path = self.store.lookup(self._entry_key(key))
+        if path is None:
+            self.misses += 1
+            return None
+        try:
+            with xr.open_dataarray(path) as cached:
+                tile = cached.load()
+        except (OSError, ValueError):
+            # Corrupt or evicted mid-read: drop it and treat as a miss.
+            self.store.discard(self._entry_key(key))
+            self.misses += 1
+            return None
+        self.hits += 1
+        return tile
+
+    def put(self, key: str, tile: xr.DataArray) -> None:
+        """Write ``tile`` under ``key`` atomically and enforce the size cap."""
+
+        name = tile.name if tile.name is not None else _DATAARRAY_VARIABLE
+        encoding = {name: {"zlib": True, "complevel": self.complevel}}
+        fd, tmp_name = tempfile.mkstemp(dir=self.store.root / "tmp", suffix=self.suffix)
+        os.close(fd)
+        try:
+            tile.to_netcdf(tmp_name, encoding=encoding)
+            self.store.put(self._entry_key(key), tmp_name)
+        except Exception as exc:  # pragma: no cover - depends on backend/attrs
+            warnings.warn(f"Could not cache tile {key[:12]}: {exc}", RuntimeWarning, stacklevel=2)
+        finally:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def wrap(self, loader: Callable[..., xr.DataArray]) -> Callable[..., xr.DataArray]:
+        """Return a loader that consults the cache before calling ``loader``.
+
+        The wrapper is picklable whenever ``loader`` is, so cached loaders can
+        be shipped to process-pool workers. Loaders that cannot be identified
+        (see :func:`loader_token`) are returned unwrapped with a warning, since
+        their tiles could collide with those of another loader.
+        """
+
+        if loader_token(loader) is None:
+            warnings.warn(
+                f"Tile cache disabled for {loader!r}: it cannot be identified; use a module-level "
+                "function or functools.partial, or set a 'cache_token' attribute",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+            return loader
+        return _CachedLoader(self, loader)
+
+    def _tile_entries(self) -> list[Dict[str, Any]]:
+        return [entry for entry in self.store.entries() if str(entry.get("url", "")).startswith("tile:")]
+
+    def info(self) -> Dict[str, Any]:
+        """Return counters and current disk usage of the cached tiles."""
+
+        entries = self._tile_entries()
+        return {
+            "cache_dir": str(self.cache_dir),
+            "tiles": len(entries),
+            "bytes": sum(int(entry.get("size", 0)) for entry in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def clear(self) -> None:
+        """Delete every cached tile (downloads in the same directory are kept)."""
+
+        for entry in self._tile_entries():
+            self.store.discard(entry["url"])
+
+
+class _CachedLoader:
+    """Picklable loader wrapper that reads through a :class:`TileCache`."""
+
+    def __init__(self, cache: TileCache, loader: Callable[..., xr.DataArray]) -> None:
+        self.cache = cache
+        self.loader = loader
+
+    @property
+    def cache_token(self) -> Optional[str]:
+        return loader_token(self.loader)
+
+    def __call__(self, **kwargs: Any) -> xr.DataArray:
+        key = tile_key(self.loader, kwargs)
+        tile = self.cache.get(key)
+        if tile is not None:
+            return tile
+        tile = self.loader(**kwargs)
+        self.cache.put(key, tile)
+        return tile
+
+
+__all__ = ["TileCache", "loader_token", "tile_key"]
@@ -0,0 +1,117 @@
+"""Pooled, concurrent HTTP downloads for streaming loaders.
+
+All remote reads share one :class:`requests.Session` so TCP/TLS connections
+are kept alive between files, and transient failures (connection errors,
+429 and 5xx responses) are retried with exponential backoff.
+:func:`map_concurrent` runs several transfers on a bounded thread pool.
+Whole files are downloaded through :mod:`cubedynamics.cache`, which streams
+them to disk and deduplicates them.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, List, Optional, Sequence, TypeVar
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from cubedynamics.progress import progress_bar
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+_Item = TypeVar("_Item")
+_Result = TypeVar("_Result")
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def make_session(
+    *,
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF,
+    pool_maxsize: int = 16,
+) -> requests.Session:
+    """Return a keep-alive session that retries idempotent requests.
+
+    Parameters
+    ----------
+    retries : int, default 3
+        Retries for connection errors and 429/5xx responses.
+    backoff_factor : float, default 0.5
+        Exponential backoff factor between retries (0.5 s, 1 s, 2 s, ...).
+    pool_maxsize : int, default 16
+        Connections kept per host; should be at least the number of workers.
+    """
+
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide shared session, creating it on first use."""
+
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = make_session()
+        return _SESSION
+
+
+def map_concurrent(
+    func: Callable[[_Item], _Result],
+    items: Sequence[_Item],
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    show_progress: bool = False,
+    description: str = "downloads",
+) -> List[_Result]:
+    """Apply ``func`` to ``items`` on a bounded thread pool, preserving order.
+
+    Progress is reported through :func:`cubedynamics.progress.progress_bar`
+    as items complete. The first failure is re-raised after pending work is
+    cancelled.
+    """
+
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    results: List[Any] = [None] * len(items)
+    total = len(items) if show_progress else None
+    with progress_bar(total=total, description=description) as advance:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(func, item): i for i, item in enumerate(items)}
+            try:
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    advance(1)
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+    return results
+
+
+__all__ = [
+    "DEFAULT_MAX_WORKERS",
+    "get_session",
+    "make_session",
+    "map_concurrent",
+]
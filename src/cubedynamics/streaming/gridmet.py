@@ -11,15 +11,19 @@ Canonical API:
 
 from __future__ import annotations
 
-import io
-from typing import Any, Dict, Optional, Sequence
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
 
 import numpy as np
-import requests
 import xarray as xr
 from xarray.backends.plugins import list_engines
 
+from cubedynamics import cache as download_cache
 from cubedynamics.progress import progress_bar
+from cubedynamics.streaming.fetch import DEFAULT_MAX_WORKERS, get_session
+from cubedynamics.streaming.http_range import HTTPRangeFile, RangeRequestsUnsupported
 
 GRIDMET_BASE_URL = "https://www.northwestknowledge.net/metdata/data"
 _ENGINE_PREFERENCE = ("h5netcdf", "netcdf4", "scipy")
@@ -83,26 +87,9 @@ def _select_stream_engine() -> Optional[str]:
 
 
 _STREAM_ENGINE = _select_stream_engine()
-
-
-def _prepare_stream_target(buf: io.BytesIO, engine: Optional[str]) -> Any:
-    """Return an object suitable for xr.open_dataset for the chosen engine."""
-
-    if engine == "netcdf4":
-        # The netCDF4 backend cannot consume BytesIO objects directly, but it can
-        # read from a ``bytes`` or ``memoryview`` buffer. ``getbuffer`` avoids an
-        # extra copy while keeping the in-memory constraint intact.
-        return memoryview(buf.getbuffer())
-
-    if engine == "scipy":
-        # SciPy prefers plain bytes. ``getvalue`` makes a copy, but we only fall
-        # back here when h5netcdf/netCDF4 are unavailable.
-        return buf.getvalue()
-
-    # Default to BytesIO for h5netcdf (the validated path) and for any other
-    # engines that support file-like objects.
-    buf.seek(0)
-    return buf
+# Byte-range reads need a backend that accepts seekable file objects and reads
+# HDF5 chunks lazily; h5netcdf (backed by h5py) is the one that does both.
+_RANGE_READS = _STREAM_ENGINE == "h5netcdf" and importlib.util.find_spec("h5py") is not None
 
 
 def _bbox_from_geojson(aoi_geojson: Dict) -> Dict[str, float]:
@@ -122,26 +109,67 @@ def _bbox_from_geojson(aoi_geojson: Dict) -> Dict[str, float]:
     }
 
 
+def gridmet_url(variable: str, year: int) -> str:
+    """Return the URL of the yearly gridMET NetCDF file for ``variable``."""
+
+    return f"{GRIDMET_BASE_URL}/{variable}_{year}.nc"
+
+
+def _download_cache(cache_dir: str | Path | None) -> download_cache.DownloadCache:
+    if cache_dir is None:
+        return download_cache.default_cache()
+    return download_cache.DownloadCache(cache_dir)
+
+
+def download_gridmet_files(
+    variables: str | Sequence[str],
+    years: Iterable[int],
+    cache_dir: str | Path | None = None,
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    show_progress: bool = True,
+) -> Dict[Tuple[str, int], Path]:
+    """Download yearly gridMET files for several variables and years concurrently.
+
+    Files are streamed into the download cache (:mod:`cubedynamics.cache`, or
+    a :class:`~cubedynamics.cache.DownloadCache` rooted at ``cache_dir``) over
+    the shared keep-alive session with at most ``max_workers`` transfers in
+    flight; cached files are only revalidated.
+
+    Returns
+    -------
+    dict
+        Mapping ``(variable, year) -> Path`` of the local files.
+    """
+
+    names = [variables] if isinstance(variables, str) else list(variables)
+    keys = [(name, int(year)) for name in names for year in years]
+    paths = _download_cache(cache_dir).fetch_many(
+        [gridmet_url(name, year) for name, year in keys],
+        max_workers=max_workers,
+        show_progress=show_progress,
+        description="gridMET files",
+    )
+    return dict(zip(keys, paths))
+
+
 def _open_gridmet_year(
     variable: str,
     year: int,
     chunks: Optional[Dict[str, int]] = None,
+    cache_dir: str | Path | None = None,
 ) -> xr.Dataset:
     """
-    Download a single gridMET year fully in memory and open it with the best
-    available xarray backend (preferring the validated h5netcdf path).
+    Open a single gridMET year with the best available xarray backend.
+
+    With h5netcdf/h5py the file is opened lazily over HTTP ``Range`` requests
+    (:class:`~cubedynamics.streaming.http_range.HTTPRangeFile`), so only the
+    HDF5 metadata and the chunks intersecting the later AOI/time selection are
+    transferred. Other backends, or servers without range support, fall back
+    to streaming the full year into the download cache and opening it from
+    disk.
     """
-    url = f"{GRIDMET_BASE_URL}/{variable}_{year}.nc"
-
-    resp = requests.get(url, stream=True, timeout=120)
-    resp.raise_for_status()
-
-    buf = io.BytesIO()
-    for chunk in resp.iter_content(chunk_size=1024 * 1024):  # 1 MB chunks
-        if not chunk:
-            break
-        buf.write(chunk)
-    buf.seek(0)
+    url = gridmet_url(variable, year)
 
     open_kwargs = {
         "decode_times": True,
@@ -155,8 +183,18 @@ def _open_gridmet_year(
 
     open_kwargs["engine"] = _STREAM_ENGINE
 
-    stream_target = _prepare_stream_target(buf, _STREAM_ENGINE)
-    ds = xr.open_dataset(stream_target, **open_kwargs)
+    remote = None
+    if _RANGE_READS:
+        try:
+            remote = HTTPRangeFile(url, session=get_session())
+        except RangeRequestsUnsupported:
+            remote = None
+
+    if remote is not None:
+        ds = xr.open_dataset(remote, **open_kwargs)
+    else:
+        path = _download_cache(cache_dir).fetch(url)
+        ds = xr.open_dataset(path, **open_kwargs)
 
     # gridMET uses "day" as the time dimension; normalize to "time"
     if "day" in ds.dims:
@@ -184,6 +222,7 @@ def stream_gridmet_to_cube(
     freq: str = "D",
     chunks: Optional[Dict[str, int]] = None,
     show_progress: bool = True,
+    max_workers: int = DEFAULT_MAX_WORKERS,
 ) -> xr.DataArray:
     """Stream a gridMET subset as an ``xarray.DataArray`` cube for a given AOI.
 
@@ -203,6 +242,8 @@ def stream_gridmet_to_cube(
         opening the streamed dataset.
     show_progress : bool, default True
         Whether to render a small progress bar while downloading yearly tiles.
+    max_workers : int, default 4
+        Number of yearly files opened or downloaded concurrently.
 
     Returns
     -------
@@ -212,9 +253,14 @@ def stream_gridmet_to_cube(
 
     Notes
     -----
-    - Data are streamed year-by-year from the gridMET endpoint without writing
-      to disk; chunking is preserved when a suitable backend (h5netcdf/netCDF4)
-      is available.
+    - Yearly files are fetched concurrently over one keep-alive session with
+      retries; chunking is preserved when a suitable backend
+      (h5netcdf/netCDF4) is available.
+    - With h5netcdf the yearly files are read through HTTP range requests, so
+      only the HDF5 chunks intersecting the AOI and time window are
+      downloaded instead of the full CONUS file. Otherwise whole years are
+      streamed into the shared download cache (:mod:`cubedynamics.cache`)
+      rather than into memory.
     - The function keeps outputs lazy when ``chunks`` is provided and will only
       materialize small index computations such as resampling.
     - AOIs smaller than the native grid resolution are padded slightly to avoid
@@ -237,16 +283,19 @@ def stream_gridmet_to_cube(
     start_year = int(start[:4])
     end_year = int(end[:4])
 
-    # 1) Load all needed years into a list of Datasets
+    # 1) Load all needed years concurrently, keeping the list in year order
     year_chunks = chunks or {"time": 366}
-    ds_list = []
-    total_years = end_year - start_year + 1
-    with progress_bar(total=total_years if show_progress else None, description="gridMET years") as advance:
-        for year in range(start_year, end_year + 1):
-            ds_y = _open_gridmet_year(variable, year, chunks=year_chunks)
-            ds_list.append(ds_y)
-            if show_progress:
-                advance(1)
+    years = list(range(start_year, end_year + 1))
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1")
+    with progress_bar(total=len(years) if show_progress else None, description="gridMET years") as advance:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_open_gridmet_year, variable, year, chunks=year_chunks) for year in years]
+            ds_list = []
+            for future in futures:
+                ds_list.append(future.result())
+                if show_progress:
+                    advance(1)
 
     # 2) Concatenate along the normalized time axis and clip to [start, end]
     ds = xr.concat(ds_list, dim="time")
@@ -283,4 +332,4 @@ def stream_gridmet_to_cube(
     return da
 
 
-__all__ = ["stream_gridmet_to_cube"]
+__all__ = ["download_gridmet_files", "gridmet_url", "stream_gridmet_to_cube"]
@@ -0,0 +1,173 @@
+"""Seekable, block-cached HTTP file backed by ``Range`` requests.
+
+HDF5 readers (h5py via the h5netcdf engine) only touch the superblock, the
+object headers, the chunk B-tree and the chunks intersecting a selection.
+Handing them an :class:`HTTPRangeFile` instead of a fully downloaded buffer
+therefore transfers just those byte ranges: a county-sized AOI reads a few
+chunks of a CONUS-wide yearly file instead of the whole file.
+"""
+
+from __future__ import annotations
+
+import io
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import requests
+
+DEFAULT_BLOCK_SIZE = 512 * 1024
+DEFAULT_MAX_BLOCKS = 256
+
+
+class RangeRequestsUnsupported(OSError):
+    """Raised when a server ignores or rejects HTTP ``Range`` requests."""
+
+
+class HTTPRangeFile(io.RawIOBase):
+    """Read-only file object that fetches byte ranges of a remote file on demand.
+
+    Parameters
+    ----------
+    url : str
+        HTTP(S) URL of the remote file.
+    session : requests.Session, optional
+        Session used for all requests (connection pooling). A private session
+        is created when omitted.
+    block_size : int, default 512 KiB
+        Granularity of fetches and of the block cache. Contiguous missing
+        blocks of one read are fetched with a single request.
+    max_blocks : int, default 256
+        Number of blocks kept in the least-recently-used cache.
+    timeout : float, default 120
+        Timeout in seconds for every HTTP request.
+
+    Attributes
+    ----------
+    size : int
+        Length of the remote file in bytes.
+    bytes_fetched, requests_made : int
+        Transfer counters, useful to check how much of the file was read.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        session: Optional[requests.Session] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        max_blocks: int = DEFAULT_MAX_BLOCKS,
+        timeout: float = 120,
+    ) -> None:
+        super().__init__()
+        if block_size <= 0 or max_blocks <= 0:
+            raise ValueError("block_size and max_blocks must be positive")
+        self.url = url
+        self.block_size = int(block_size)
+        self.max_blocks = int(max_blocks)
+        self.timeout = timeout
+        self._session = session or requests.Session()
+        self._blocks: "OrderedDict[int, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pos = 0
+        self.bytes_fetched = 0
+        self.requests_made = 0
+        self.size = self._remote_size()
+
+    def _remote_size(self) -> int:
+        resp = self._session.get(self.url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self.timeout)
+        try:
+            resp.raise_for_status()
+            if resp.status_code != 206 or "Content-Range" not in resp.headers:
+                raise RangeRequestsUnsupported(f"Server does not honour Range requests for {self.url}")
+            total = resp.headers["Content-Range"].rsplit("/", 1)[-1]
+            if not total.isdigit():
+                raise RangeRequestsUnsupported(f"Unknown content length for {self.url}")
+            return int(total)
+        finally:
+            resp.close()
+
+    def _fetch(self, first: int, last: int) -> Dict[int, bytes]:
+        """Fetch blocks ``first..last`` (inclusive) with one request."""
+
+        start = first * self.block_size
+        stop = min((last + 1) * self.block_size, self.size) - 1
+        resp = self._session.get(
+            self.url, headers={"Range": f"bytes={start}-{stop}"}, timeout=self.timeout
+        )
+        resp.raise_for_status()
+        if resp.status_code != 206:
+            raise RangeRequestsUnsupported(f"Server ignored a Range request for {self.url}")
+        data = resp.content
+        if len(data) != stop - start + 1:
+            raise OSError(f"Short range read from {self.url}: expected {stop - start + 1} bytes, got {len(data)}")
+        self.requests_made += 1
+        self.bytes_fetched += len(data)
+        return {
+            block: data[(block - first) * self.block_size : (block - first + 1) * self.block_size]
+            for block in range(first, last + 1)
+        }
+
+    def _read_range(self, start: int, stop: int) -> bytes:
+        first = start // self.block_size
+        last = (stop - 1) // self.block_size
+        # Blocks of this read are collected before anything is evicted, so a
+        # read spanning more than ``max_blocks`` blocks still succeeds.
+        blocks: Dict[int, bytes] = {}
+        for block in range(first, last + 1):
+            if block in self._blocks:
+                self._blocks.move_to_end(block)
+                blocks[block] = self._blocks[block]
+        missing = [b for b in range(first, last + 1) if b not in blocks]
+        run_start = None
+        for i, block in enumerate(missing):
+            if run_start is None:
+                run_start = block
+            if i + 1 == len(missing) or missing[i + 1] != block + 1:
+                blocks.update(self._fetch(run_start, block))
+                run_start = None
+        for block in missing:
+            self._blocks[block] = blocks[block]
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        data = b"".join(blocks[block] for block in range(first, last + 1))
+        offset = start - first * self.block_size
+        return data[offset : offset + stop - start]
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence!r}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        with self._lock:
+            start = self._pos
+            stop = min(start + len(view), self.size)
+            if stop <= start:
+                return 0
+            data = self._read_range(start, stop)
+            view[: len(data)] = data
+            self._pos = start + len(data)
+            return len(data)
+
+
+__all__ = ["DEFAULT_BLOCK_SIZE", "HTTPRangeFile", "RangeRequestsUnsupported"]
@@ -0,0 +1,464 @@
+"""Mergeable streaming reducers for tiled cubes.
+
+Each tile is collapsed in a single vectorized NumPy call into a partial
+:class:`MomentState` (count, mean, M2). Partial states are combined with the
+Chan et al. parallel update, so tiles can be reduced in any order and merged
+afterwards without revisiting the data.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+import xarray as xr
+
+EXECUTORS = ("serial", "thread", "process")
+
+_State = TypeVar("_State")
+
+
+@dataclass
+class MomentState:
+    """Partial first/second moment state for a streaming reduction.
+
+    Parameters
+    ----------
+    count : numpy.ndarray
+        Number of finite values seen for every output element.
+    mean : numpy.ndarray
+        Running mean for every output element (``0`` where ``count == 0``).
+    m2 : numpy.ndarray
+        Sum of squared deviations from ``mean``.
+
+    Notes
+    -----
+    States are merged with the pairwise update of Chan, Golub & LeVeque
+    (1979), which is exact up to floating point rounding and independent of
+    the order in which tiles arrive.
+    """
+
+    count: np.ndarray
+    mean: np.ndarray
+    m2: np.ndarray
+
+    @classmethod
+    def empty(cls, shape: Sequence[int] | int) -> "MomentState":
+        """Return the identity state (zero observations) for ``shape``."""
+
+        return cls(
+            count=np.zeros(shape, dtype=np.int64),
+            mean=np.zeros(shape, dtype=float),
+            m2=np.zeros(shape, dtype=float),
+        )
+
+    @classmethod
+    def from_array(
+        cls,
+        data: np.ndarray,
+        axis: int | Sequence[int] | None = None,
+    ) -> "MomentState":
+        """Collapse ``data`` along ``axis`` into a state, ignoring NaNs.
+
+        Parameters
+        ----------
+        data : array-like
+            Tile values. Non-finite values are treated as missing.
+        axis : int or sequence of int, optional
+            Axes to reduce. ``None`` reduces over every axis.
+        """
+
+        values = np.asarray(data, dtype=float)
+        if axis is not None and not isinstance(axis, int):
+            axis = tuple(axis)
+        mask = np.isfinite(values)
+        filled = np.where(mask, values, 0.0)
+
+        count = mask.sum(axis=axis, dtype=np.int64)
+        total = filled.sum(axis=axis)
+        safe = np.maximum(count, 1)
+        mean = np.where(count > 0, total / safe, 0.0)
+
+        expanded = mean if axis is None else np.expand_dims(mean, axis)
+        deviation = np.where(mask, values - expanded, 0.0)
+        m2 = np.square(deviation).sum(axis=axis)
+        return cls(count=np.asarray(count), mean=np.asarray(mean), m2=np.asarray(m2))
+
+    @classmethod
+    def from_groups(
+        cls,
+        data: np.ndarray,
+        groups: np.ndarray,
+        n_groups: int,
+    ) -> "MomentState":
+        """Collapse axis 0 of ``data`` into ``n_groups`` per-group states.
+
+        ``groups`` holds the integer group (``0 <= g < n_groups``) of every
+        slice along axis 0, e.g. the day-of-year of each time step. The
+        result has shape ``(n_groups,) + data.shape[1:]``.
+        """
+
+        values = np.asarray(data, dtype=float)
+        groups = np.asarray(groups, dtype=np.int64)
+        mask = np.isfinite(values)
+        filled = np.where(mask, values, 0.0)
+
+        out_shape = (n_groups,) + values.shape[1:]
+        count = np.zeros(out_shape, dtype=np.int64)
+        total = np.zeros(out_shape, dtype=float)
+        np.add.at(count, groups, mask.astype(np.int64))
+        np.add.at(total, groups, filled)
+        mean = np.where(count > 0, total / np.maximum(count, 1), 0.0)
+
+        deviation = np.where(mask, values - mean[groups], 0.0)
+        m2 = np.zeros(out_shape, dtype=float)
+        np.add.at(m2, groups, np.square(deviation))
+        return cls(count=count, mean=mean, m2=m2)
+
+    def roll(self, shift: int) -> "MomentState":
+        """Circularly shift the leading (group) axis, e.g. for day-of-year windows."""
+
+        return MomentState(
+            count=np.roll(self.count, shift, axis=0),
+            mean=np.roll(self.mean, shift, axis=0),
+            m2=np.roll(self.m2, shift, axis=0),
+        )
+
+    def merge(self, other: "MomentState") -> "MomentState":
+        """Combine two partial states with the parallel (Chan) update."""
+
+        count = self.count + other.count
+        safe = np.maximum(count, 1)
+        delta = other.mean - self.mean
+        weight = np.where(count > 0, other.count / safe, 0.0)
+        mean = self.mean + delta * weight
+        m2 = self.m2 + other.m2 + np.square(delta) * np.where(
+            count > 0, self.count * other.count / safe, 0.0
+        )
+        return MomentState(count=count, mean=mean, m2=m2)
+
+    def variance(self, ddof: int = 0) -> np.ndarray:
+        """Return the variance implied by the state (NaN where undefined)."""
+
+        denom = self.count - ddof
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(denom > 0, self.m2 / np.maximum(denom, 1), np.nan)
+
+    def finalize_mean(self) -> np.ndarray:
+        """Return the mean with NaN where no finite values were observed."""
+
+        return np.where(self.count > 0, self.mean, np.nan)
+
+
+@dataclass
+class HistogramState:
+    """Mergeable fixed-edge histogram sketch for streaming quantiles.
+
+    Parameters
+    ----------
+    edges : numpy.ndarray
+        Monotonically increasing bin edges shared by every output element.
+    counts : numpy.ndarray
+        Counts with shape ``(..., len(edges) - 1)``.
+    below, above : numpy.ndarray
+        Number of finite values smaller than ``edges[0]`` or larger than
+        ``edges[-1]``.
+
+    Notes
+    -----
+    Memory is ``len(edges) + 1`` integers per output element no matter how
+    many values are streamed through. Quantiles are interpolated linearly
+    inside the bin holding the target rank, so for any quantile whose exact
+    value lies inside ``[edges[0], edges[-1]]`` the absolute error is at most
+    the width of that bin. Quantiles that fall among out-of-range values are
+    clamped to the nearest edge.
+    """
+
+    edges: np.ndarray
+    counts: np.ndarray
+    below: np.ndarray
+    above: np.ndarray
+
+    @classmethod
+    def from_array(
+        cls,
+        data: np.ndarray,
+        edges: np.ndarray,
+        axis: int | Sequence[int] | None = None,
+    ) -> "HistogramState":
+        """Histogram ``data`` along ``axis`` in one vectorized pass."""
+
+        edges = np.asarray(edges, dtype=float)
+        values = np.asarray(data, dtype=float)
+        ndim = values.ndim
+        if axis is None:
+            axes: Tuple[int, ...] = tuple(range(ndim))
+        elif isinstance(axis, int):
+            axes = (axis % ndim,)
+        else:
+            axes = tuple(a % ndim for a in axis)
+        kept = [a for a in range(ndim) if a not in axes]
+        moved = np.transpose(values, kept + list(axes))
+        out_shape = moved.shape[: len(kept)]
+        n_out = int(np.prod(out_shape, dtype=np.int64))
+        flat = moved.reshape(n_out, -1)
+
+        nbins = edges.size - 1
+        # Slot 0 holds values below the range, slot nbins + 1 values above it.
+        slots = np.searchsorted(edges, flat, side="right")
+        slots = np.where(flat == edges[-1], nbins, slots)
+        finite = np.isfinite(flat)
+        offsets = np.arange(n_out, dtype=np.int64)[:, None] * (nbins + 2)
+        packed = np.bincount(
+            (offsets + slots)[finite], minlength=n_out * (nbins + 2)
+        ).reshape(out_shape + (nbins + 2,))
+        return cls(
+            edges=edges,
+            counts=packed[..., 1:-1].astype(np.int64),
+            below=packed[..., 0].astype(np.int64),
+            above=packed[..., -1].astype(np.int64),
+        )
+
+    def merge(self, other: "HistogramState") -> "HistogramState":
+        """Add the counts of two sketches built on the same edges."""
+
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Cannot merge histograms with different bin edges")
+        return HistogramState(
+            edges=self.edges,
+            counts=self.counts + other.counts,
+            below=self.below + other.below,
+            above=self.above + other.above,
+        )
+
+    @property
+    def total(self) -> np.ndarray:
+        """Number of finite values observed for every output element."""
+
+        return self.counts.sum(axis=-1) + self.below + self.above
+
+    def quantile(self, q: float | Sequence[float]) -> np.ndarray:
+        """Approximate quantile(s) with shape ``(len(q), ...)`` or ``(...)``."""
+
+        qs = np.atleast_1d(np.asarray(q, dtype=float))
+        if np.any((qs < 0) | (qs > 1)):
+            raise ValueError("Quantiles must be in the range [0, 1]")
+
+        full = np.concatenate(
+            [self.below[..., None], self.counts, self.above[..., None]], axis=-1
+        )
+        cumulative = np.cumsum(full, axis=-1)
+        total = cumulative[..., -1]
+        lefts = np.concatenate([[self.edges[0]], self.edges[:-1], [self.edges[-1]]])
+        widths = np.concatenate([[0.0], np.diff(self.edges), [0.0]])
+
+        results = []
+        for value in qs:
+            target = value * total
+            # First non-empty slot whose cumulative count reaches the target,
+            # so q=0 and leading empty bins resolve to the first observed bin.
+            reached = (cumulative >= target[..., None]) & (full > 0)
+            slot = np.argmax(reached, axis=-1)
+            before = np.take_along_axis(cumulative, slot[..., None], axis=-1)[..., 0]
+            in_bin = np.take_along_axis(full, slot[..., None], axis=-1)[..., 0]
+            before = before - in_bin
+            with np.errstate(invalid="ignore", divide="ignore"):
+                frac = np.where(in_bin > 0, (target - before) / np.maximum(in_bin, 1), 0.0)
+            estimate = lefts[slot] + np.clip(frac, 0.0, 1.0) * widths[slot]
+            results.append(np.where(total > 0, estimate, np.nan))
+
+        stacked = np.stack(results)
+        return stacked if np.ndim(q) else stacked[0]
+
+
+@dataclass
+class CovarianceState:
+    """Partial co-moment state for streaming Pearson correlation.
+
+    Parameters
+    ----------
+    count : numpy.ndarray
+        Number of pairs where both values are finite.
+    mean_x, mean_y : numpy.ndarray
+        Running means over those pairs.
+    m2_x, m2_y : numpy.ndarray
+        Sums of squared deviations from ``mean_x`` and ``mean_y``.
+    c_xy : numpy.ndarray
+        Sum of cross products of the deviations.
+
+    Notes
+    -----
+    This carries the same information as the raw sums (n, Σx, Σy, Σx², Σy²,
+    Σxy) but in centered form, so merging many chunks of large-valued data
+    (e.g. temperatures in Kelvin) does not suffer from cancellation.
+    """
+
+    count: np.ndarray
+    mean_x: np.ndarray
+    mean_y: np.ndarray
+    m2_x: np.ndarray
+    m2_y: np.ndarray
+    c_xy: np.ndarray
+
+    @classmethod
+    def from_arrays(cls, x: np.ndarray, y: np.ndarray, axis: int = 0) -> "CovarianceState":
+        """Collapse paired arrays along ``axis``, skipping pairs with a NaN."""
+
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        mask = np.isfinite(x) & np.isfinite(y)
+        count = mask.sum(axis=axis, dtype=np.int64)
+        safe = np.maximum(count, 1)
+        mean_x = np.where(mask, x, 0.0).sum(axis=axis) / safe
+        mean_y = np.where(mask, y, 0.0).sum(axis=axis) / safe
+        dx = np.where(mask, x - np.expand_dims(mean_x, axis), 0.0)
+        dy = np.where(mask, y - np.expand_dims(mean_y, axis), 0.0)
+        return cls(
+            count=count,
+            mean_x=mean_x,
+            mean_y=mean_y,
+            m2_x=np.square(dx).sum(axis=axis),
+            m2_y=np.square(dy).sum(axis=axis),
+            c_xy=(dx * dy).sum(axis=axis),
+        )
+
+    def merge(self, other: "CovarianceState") -> "CovarianceState":
+        """Combine two partial states with the parallel (Chan) update."""
+
+        count = self.count + other.count
+        safe = np.maximum(count, 1)
+        weight = np.where(count > 0, other.count / safe, 0.0)
+        cross = np.where(count > 0, self.count * other.count / safe, 0.0)
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        return CovarianceState(
+            count=count,
+            mean_x=self.mean_x + dx * weight,
+            mean_y=self.mean_y + dy * weight,
+            m2_x=self.m2_x + other.m2_x + np.square(dx) * cross,
+            m2_y=self.m2_y + other.m2_y + np.square(dy) * cross,
+            c_xy=self.c_xy + other.c_xy + dx * dy * cross,
+        )
+
+    def correlation(self) -> np.ndarray:
+        """Pearson r; NaN with fewer than two pairs or a constant series."""
+
+        # Rounding leaves tiny positive M2 for constant series; treat as zero.
+        flat_x = self.m2_x <= 1e-12 * self.count * np.square(self.mean_x)
+        flat_y = self.m2_y <= 1e-12 * self.count * np.square(self.mean_y)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            r = self.c_xy / np.sqrt(self.m2_x * self.m2_y)
+        valid = (self.count >= 2) & ~flat_x & ~flat_y
+        return np.where(valid, np.clip(r, -1.0, 1.0), np.nan)
+
+
+def merge_states(states: Iterable[_State]) -> _State:
+    """Merge an iterable of mergeable states (e.g. :class:`MomentState`) into one.
+
+    Raises
+    ------
+    ValueError
+        If ``states`` is empty.
+    """
+
+    states = list(states)
+    if not states:
+        raise ValueError("merge_states requires at least one state")
+    return reduce(lambda a, b: a.merge(b), states)
+
+
+def tile_moments(
+    tile: xr.DataArray,
+    dims: Sequence[str],
+    reduce_dims: Sequence[str],
+) -> Tuple[MomentState, Dict[str, np.ndarray]]:
+    """Collapse one tile over ``reduce_dims``.
+
+    Returns
+    -------
+    tuple
+        The partial :class:`MomentState` and the coordinate labels of the
+        dimensions that were kept, in ``dims`` order.
+    """
+
+    ordered = tile.transpose(*[d for d in dims if d in tile.dims])
+    axes = tuple(ordered.dims.index(d) for d in reduce_dims if d in ordered.dims)
+    state = MomentState.from_array(np.asarray(ordered.data), axis=axes)
+    kept = {
+        str(d): np.asarray(ordered[d].values)
+        for d in ordered.dims
+        if d not in reduce_dims and d in ordered.coords
+    }
+    return state, kept
+
+
+def _load_and_reduce(
+    loader: Callable[..., xr.DataArray],
+    kwargs: Mapping[str, Any],
+    dims: Sequence[str],
+    reduce_dims: Sequence[str],
+) -> Tuple[MomentState, Dict[str, np.ndarray]]:
+    return tile_moments(loader(**kwargs), dims, reduce_dims)
+
+
+def reduce_tile_specs(
+    loader: Callable[..., xr.DataArray],
+    specs: Iterable[Mapping[str, Any]],
+    dims: Sequence[str],
+    reduce_dims: Sequence[str],
+    *,
+    executor: str = "process",
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[MomentState, Dict[str, np.ndarray]]]:
+    """Load and reduce tiles on a worker pool, yielding partials as they finish.
+
+    Each worker loads one tile and returns only its compact
+    :class:`MomentState` plus kept coordinate labels, so the parent process
+    never holds raw tile data. Partials arrive in completion order; because
+    merging is order independent the final state is deterministic up to
+    floating point rounding.
+
+    Parameters
+    ----------
+    loader : callable
+        Tile loader. For ``executor="process"`` it must be picklable (a
+        module-level function or :func:`functools.partial` of one).
+    specs : iterable of mapping
+        Full keyword arguments for each tile.
+    dims, reduce_dims : sequence of str
+        Cube dimension order and the dimensions to collapse.
+    executor : {"serial", "thread", "process"}, default "process"
+        Where tiles are loaded and reduced.
+    max_workers : int, optional
+        Pool size; defaults to the executor's own default.
+    """
+
+    if executor not in EXECUTORS:
+        raise ValueError(f"executor must be one of {EXECUTORS}, got {executor!r}")
+
+    if executor == "serial":
+        for kwargs in specs:
+            yield _load_and_reduce(loader, kwargs, dims, reduce_dims)
+        return
+
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    pool: Executor = pool_cls(max_workers=max_workers)
+    with pool:
+        futures = [
+            pool.submit(_load_and_reduce, loader, dict(kwargs), tuple(dims), tuple(reduce_dims))
+            for kwargs in specs
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+__all__ = [
+    "CovarianceState",
+    "HistogramState",
+    "MomentState",
+    "merge_states",
+    "reduce_tile_specs",
+    "tile_moments",
+]
@@ -8,12 +8,24 @@ demand.
 
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, Mapping, Tuple
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import xarray as xr
+from dask.utils import parse_bytes
+
+from .cache import TileCache, tile_key
+
+# Directory inside a Zarr store holding one empty marker file per written tile.
+_WRITTEN_TILES_DIR = ".cubedynamics_written_tiles"
+# Float labels (e.g. pixel centers from a grid definition vs. a file's
+# transform) are matched within this tolerance.
+_LABEL_TOLERANCE = 1e-6
 
 
 @dataclass
@@ -26,7 +38,9 @@ class VirtualCube:
         Expected dimension order of the cube, e.g., ``("time", "y", "x")``.
     coords_metadata : dict
         Lightweight metadata used to reconstruct coordinates when needed;
-        individual tiles supply authoritative coordinate values.
+        individual tiles supply authoritative coordinate values. An optional
+        ``"coords"`` entry mapping every dim to the full cube labels lets
+        :meth:`to_zarr` lay out its store without probing tiles.
     loader : callable
         Function that returns a concrete ``xarray.DataArray`` for a tile.
     loader_kwargs : dict
@@ -34,6 +48,29 @@ class VirtualCube:
     time_tiler, spatial_tiler : callable
         Functions that accept ``loader_kwargs`` and yield dictionaries of tile
         keyword arguments along the time or spatial axes.
+    max_workers : int, default 1
+        Number of threads used to load tiles concurrently. ``1`` keeps the
+        original sequential behaviour with no background threads.
+    prefetch : int, optional
+        Maximum number of tiles requested ahead of the consumer. Defaults to
+        ``max_workers`` when prefetching is enabled.
+    memory_budget : int or str, optional
+        Upper bound on bytes held by loaded-but-unconsumed tiles, e.g.
+        ``"2GB"``. The size of the largest tile seen so far is used as the
+        per-tile estimate, and the first tile is loaded alone to measure it;
+        at least one tile is always in flight.
+    tile_cache : TileCache, optional
+        Opt-in on-disk cache consulted before every loader call so repeated
+        passes (e.g. ``v.mean`` followed by ``v.variance``) reuse tiles.
+        The loader must be identifiable (see
+        :func:`~cubedynamics.streaming.cache.loader_token`); lambdas and
+        closures need a ``cache_token`` attribute or are not cached.
+    coords_probe : callable, optional
+        Cheap function accepting the same keyword arguments as ``loader`` and
+        returning ``{dim: labels}`` for that tile without reading data. When
+        omitted, layout queries such as :meth:`to_zarr` load each tile once to
+        read its coordinates, so every tile is loaded twice unless
+        ``tile_cache`` is set.
 
     Notes
     -----
@@ -41,6 +78,8 @@ class VirtualCube:
     - ``iter_tiles`` combines time and spatial tilers deterministically so
       callers can stream through subsets without holding the whole cube.
     - Returned tiles should be compatible for ``xarray.combine_by_coords``.
+    - With ``max_workers > 1`` tiles are loaded on a bounded thread pool but
+      are always yielded in tiler order, so results stay deterministic.
 
     Examples
     --------
@@ -63,24 +102,64 @@ class VirtualCube:
     loader_kwargs: Dict[str, Any]
     time_tiler: Callable[[Dict[str, Any]], Iterable[Dict[str, Any]]]
     spatial_tiler: Callable[[Dict[str, Any]], Iterable[Dict[str, Any]]]
+    max_workers: int = 1
+    prefetch: Optional[int] = None
+    memory_budget: Optional[int | str] = None
+    tile_cache: Optional[TileCache] = None
+    coords_probe: Optional[Callable[..., Mapping[str, Any]]] = None
 
     def iter_time_tiles(self) -> Iterable[xr.DataArray]:
         """Iterate over time-tiled cubes (full spatial AOI per tile)."""
 
-        for t_kwargs in self.time_tiler(self.loader_kwargs):
-            kwargs = {**self.loader_kwargs, **t_kwargs}
-            yield self.loader(**kwargs)
+        return self._load_tiles(self.iter_time_specs())
 
     def iter_spatial_tiles(self) -> Iterable[xr.DataArray]:
         """Iterate over cubes tiled in space (full time range per tile)."""
 
+        return self._load_tiles(self.iter_spatial_specs())
+
+    def map_spatial_tiles(
+        self,
+        func: Callable[[xr.DataArray], xr.DataArray | xr.Dataset],
+    ) -> xr.DataArray | xr.Dataset:
+        """Apply ``func`` to every spatial tile and mosaic the results.
+
+        Each tile spans the full time range, so ``func`` can reduce over
+        time (trends, extremes) while only one tile is in memory. Results are
+        joined with :func:`xarray.combine_by_coords`.
+        """
+
+        results = [func(tile) for tile in self.iter_spatial_tiles()]
+        if not results:
+            raise ValueError("VirtualCube has no spatial tiles")
+        if len(results) == 1:
+            return results[0]
+        if isinstance(results[0], xr.DataArray):
+            name = results[0].name if results[0].name is not None else "data"
+            combined = xr.combine_by_coords([r.to_dataset(name=name) for r in results])
+            return combined[name]
+        return xr.combine_by_coords(results)
+
+    def iter_time_specs(self) -> Iterator[Dict[str, Any]]:
+        """Yield the full loader keyword arguments for every time tile."""
+
+        for t_kwargs in self.time_tiler(self.loader_kwargs):
+            yield {**self.loader_kwargs, **t_kwargs}
+
+    def iter_spatial_specs(self) -> Iterator[Dict[str, Any]]:
+        """Yield the full loader keyword arguments for every spatial tile."""
+
         for s_kwargs in self.spatial_tiler(self.loader_kwargs):
-            kwargs = {**self.loader_kwargs, **s_kwargs}
-            yield self.loader(**kwargs)
+            yield {**self.loader_kwargs, **s_kwargs}
 
     def iter_tiles(self) -> Iterable[xr.DataArray]:
         """Iterate over time × space tiles produced by both tilers."""
 
+        return self._load_tiles(self.iter_tile_specs())
+
+    def iter_tile_specs(self) -> Iterator[Dict[str, Any]]:
+        """Yield the full loader keyword arguments for every time × space tile."""
+
         time_specs = list(self.time_tiler(self.loader_kwargs))
         space_specs = list(self.spatial_tiler(self.loader_kwargs))
 
@@ -91,8 +170,240 @@ class VirtualCube:
 
         for t_kwargs in time_specs:
             for s_kwargs in space_specs:
-                kwargs = {**self.loader_kwargs, **t_kwargs, **s_kwargs}
-                yield self.loader(**kwargs)
+                yield {**self.loader_kwargs, **t_kwargs, **s_kwargs}
+
+    def tile_coords(self) -> Iterator[Tuple[Dict[str, Any], Dict[str, np.ndarray]]]:
+        """Yield ``(loader_kwargs, {dim: labels})`` for every tile.
+
+        Uses ``coords_probe`` when available; otherwise each tile is loaded
+        (through ``tile_cache`` if configured) and only its coordinates kept.
+        """
+
+        loader = self.tile_loader()
+        for kwargs in self.iter_tile_specs():
+            if self.coords_probe is not None:
+                labels = self.coords_probe(**kwargs)
+            else:
+                tile = loader(**kwargs)
+                labels = {dim: tile[dim].values for dim in self.dims if dim in tile.coords}
+            yield kwargs, {dim: np.asarray(values) for dim, values in labels.items()}
+
+    def to_zarr(
+        self,
+        store: str | Path,
+        *,
+        name: Optional[str] = None,
+        chunks: Optional[Mapping[str, int]] = None,
+        resume: bool = True,
+    ) -> str | Path:
+        """Stream tiles into a chunked Zarr store without materializing the cube.
+
+        Parameters
+        ----------
+        store : str or Path
+            Target Zarr store. It is created once from the tile layout and
+            every tile is then written into its own region as it arrives.
+        name : str, optional
+            Variable name in the store. Defaults to the first tile's name or
+            ``"data"``.
+        chunks : mapping, optional
+            Zarr chunk sizes per dimension. Defaults to the first tile's shape.
+        resume : bool, default True
+            Skip tiles recorded as written by a previous, interrupted call on
+            the same store. ``False`` recreates the store from scratch.
+
+        Returns
+        -------
+        str or Path
+            The ``store`` argument, for chaining into ``xr.open_zarr``.
+
+        Notes
+        -----
+        Only one tile is held in memory at a time. The store layout comes from
+        ``coords_metadata["coords"]`` or ``coords_probe``; without either,
+        every tile is loaded once up front just for its labels. After each
+        region write an empty marker file named after the tile is added to
+        ``.cubedynamics_written_tiles`` inside the store, so recording
+        progress costs the same for the last tile as for the first. A
+        resumed call takes the layout from the store and loads only the
+        tiles without a marker.
+        """
+
+        import fsspec
+        import zarr
+
+        fs, root = fsspec.core.url_to_fs(str(store))
+        markers = f"{root}/{_WRITTEN_TILES_DIR}"
+        written: set[str] = set()
+        full: Optional[Dict[str, np.ndarray]] = None
+        if resume:
+            try:
+                zarr.open_group(str(store), mode="r")
+            except (FileNotFoundError, KeyError, ValueError):
+                pass
+            else:
+                full = _stored_labels(store, self.dims)
+                # A store without a layout is recreated, so its markers are stale.
+                written = _written_tiles(fs, markers) if full is not None else set()
+        initialized = full is not None
+        if full is None:
+            full = self._full_labels("write")
+        else:
+            fs.makedirs(markers, exist_ok=True)
+
+        loader = self.tile_loader()
+        var_name = name
+        for kwargs in self.iter_tile_specs():
+            # Markers only need to tell this store's tiles apart.
+            key = tile_key(None, kwargs)
+            if key in written:
+                continue
+
+            tile = loader(**kwargs).transpose(*self.dims)
+            if var_name is None:
+                var_name = str(tile.name) if tile.name is not None else "data"
+            if not initialized:
+                _init_zarr_store(store, tile, full, self.dims, var_name, chunks)
+                fs.makedirs(markers, exist_ok=True)
+                initialized = True
+
+            region = _region_for(tile, full, self.dims)
+            payload = tile.drop_vars(list(tile.coords)).to_dataset(name=var_name)
+            payload.attrs = {}
+            payload.to_zarr(str(store), region=region, safe_chunks=False)
+            fs.pipe_file(f"{markers}/{key}", b"")
+
+        return store
+
+    def to_dask(
+        self,
+        *,
+        name: Optional[str] = None,
+        dtype: Any = None,
+    ) -> xr.DataArray:
+        """Return a lazy, dask-backed view of the cube with one chunk per tile.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name for the returned array. Defaults to ``coords_metadata["name"]``.
+        dtype : dtype, optional
+            Data type of the chunks. Defaults to ``coords_metadata["dtype"]`` or
+            ``float64``; tiles are cast on load.
+
+        Returns
+        -------
+        xarray.DataArray
+            Array with dims ``self.dims`` whose chunks are delayed ``loader``
+            calls, one per time × space tile spec.
+
+        Notes
+        -----
+        Chunk shapes and coordinates come from :meth:`tile_coords`: with a
+        ``coords_probe`` building the graph never calls ``loader``, without
+        one every tile is loaded once (through ``tile_cache`` when set) to
+        read its labels. Labels a tile shares with the preceding tile along a
+        dimension, such as the boundary step of inclusive time tiles, are
+        read from the earlier tile only. Tiles must then form a regular grid
+        (every tile covers exactly one block per dimension); blocks no tile
+        covers are filled with NaN. Nothing else is loaded until the result
+        is computed, so any xarray operation or verb can run on it with
+        dask's scheduler providing the parallelism.
+        """
+
+        import dask
+        import dask.array as dsa
+
+        layout = list(self.tile_coords())
+        if not layout:
+            raise ValueError("VirtualCube has no tiles to expose as a dask array")
+        full = _union_labels([labels for _, labels in layout], self.dims)
+        dtype = np.dtype(dtype or self.coords_metadata.get("dtype", "float64"))
+
+        regions = _trim_shared_labels(
+            [_label_region(labels, full, self.dims) for _, labels in layout], self.dims
+        )
+        bounds: Dict[str, List[int]] = {}
+        for dim in self.dims:
+            edges = {0, len(full[dim])}
+            for region in regions:
+                edges.update((region[dim].start, region[dim].stop))
+            bounds[dim] = sorted(edges)
+
+        blocks: Dict[Tuple[int, ...], Any] = {}
+        loader = self.tile_loader()
+        for (kwargs, _labels), region in zip(layout, regions):
+            index = []
+            for dim in self.dims:
+                pos = bounds[dim].index(region[dim].start)
+                if bounds[dim][pos + 1] != region[dim].stop:
+                    raise ValueError("VirtualCube tiles do not form a regular grid")
+                index.append(pos)
+            if tuple(index) in blocks:
+                raise ValueError("VirtualCube tiles overlap; cannot build a dask array")
+            labels = {dim: full[dim][region[dim]] for dim in self.dims}
+            shape = tuple(len(labels[dim]) for dim in self.dims)
+            delayed_tile = dask.delayed(_load_block, pure=False)(
+                loader, kwargs, self.dims, labels, dtype
+            )
+            blocks[tuple(index)] = dsa.from_delayed(delayed_tile, shape=shape, dtype=dtype)
+
+        def _nested(prefix: Tuple[int, ...]) -> Any:
+            depth = len(prefix)
+            if depth == len(self.dims):
+                if prefix in blocks:
+                    return blocks[prefix]
+                shape = tuple(
+                    bounds[dim][i + 1] - bounds[dim][i] for dim, i in zip(self.dims, prefix)
+                )
+                return dsa.full(shape, np.nan, dtype=dtype)
+            n_blocks = len(bounds[self.dims[depth]]) - 1
+            return [_nested(prefix + (i,)) for i in range(n_blocks)]
+
+        data = dsa.block(_nested(()))
+        return xr.DataArray(
+            data,
+            coords={dim: full[dim] for dim in self.dims},
+            dims=self.dims,
+            name=name or self.coords_metadata.get("name"),
+        )
+
+    def _full_labels(self, purpose: str) -> Dict[str, np.ndarray]:
+        """Return the labels of the whole cube without loading data if possible.
+
+        ``coords_metadata["coords"]`` wins when it lists every dim; otherwise
+        the per-tile labels from :meth:`tile_coords` are merged.
+        """
+
+        known = self.coords_metadata.get("coords") or {}
+        if all(dim in known for dim in self.dims):
+            return {dim: np.asarray(known[dim]) for dim in self.dims}
+        tile_labels = [labels for _, labels in self.tile_coords()]
+        if not tile_labels:
+            raise ValueError(f"VirtualCube has no tiles to {purpose}")
+        return _union_labels(tile_labels, self.dims)
+
+    def tile_loader(self) -> Callable[..., xr.DataArray]:
+        """Return the loader used for tiles, wrapped by ``tile_cache`` when set."""
+
+        if self.tile_cache is None:
+            return self.loader
+        return self.tile_cache.wrap(self.loader)
+
+    def _load_tiles(self, specs: Iterable[Dict[str, Any]]) -> Iterator[xr.DataArray]:
+        loader = self.tile_loader()
+        if self.max_workers <= 1:
+            for kwargs in specs:
+                yield loader(**kwargs)
+            return
+
+        yield from _prefetch_tiles(
+            loader,
+            specs,
+            max_workers=self.max_workers,
+            prefetch=self.prefetch or self.max_workers,
+            memory_budget=None if self.memory_budget is None else parse_bytes(self.memory_budget),
+        )
 
     def materialize(self) -> xr.DataArray:
         """Materialize the virtual cube as a single :class:`xarray.DataArray`."""
@@ -110,7 +421,201 @@ class VirtualCube:
         return combined
 
 
-def make_time_tiler(start: Any, end: Any, freq: str = "A") -> Callable[[Dict[str, Any]], Iterable[Dict[str, Any]]]:
+def _prefetch_tiles(
+    loader: Callable[..., xr.DataArray],
+    specs: Iterable[Dict[str, Any]],
+    *,
+    max_workers: int,
+    prefetch: int,
+    memory_budget: Optional[int],
+) -> Iterator[xr.DataArray]:
+    """Load ``specs`` on a thread pool and yield tiles in submission order.
+
+    At most ``prefetch`` loads are outstanding at once. When ``memory_budget``
+    is given the window shrinks further so that the number of outstanding
+    tiles times the largest tile observed so far stays within the budget;
+    until the first tile arrives its size is unknown, so it loads alone.
+    """
+
+    pending: Deque[Future] = deque()
+    spec_iter = iter(specs)
+    exhausted = False
+    tile_bytes = 0
+
+    def _window() -> int:
+        if memory_budget is None:
+            return prefetch
+        if tile_bytes == 0:
+            return 1
+        return max(1, min(prefetch, memory_budget // tile_bytes))
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while True:
+            while not exhausted and len(pending) < _window():
+                try:
+                    kwargs = next(spec_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending.append(executor.submit(loader, **kwargs))
+
+            if not pending:
+                return
+
+            tile = pending.popleft().result()
+            tile_bytes = max(tile_bytes, int(getattr(tile, "nbytes", 0)))
+            yield tile
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _union_labels(
+    tile_labels: List[Mapping[str, np.ndarray]],
+    dims: Tuple[str, ...],
+) -> Dict[str, np.ndarray]:
+    """Merge per-tile labels into full coordinates, keeping each dim's direction."""
+
+    full: Dict[str, np.ndarray] = {}
+    for dim in dims:
+        parts = [np.asarray(labels[dim]) for labels in tile_labels if dim in labels]
+        if not parts:
+            raise ValueError(f"No coordinate labels found for dimension {dim!r}")
+        merged = np.unique(np.concatenate(parts))
+        descending = any(part.size > 1 and part[0] > part[-1] for part in parts)
+        full[dim] = merged[::-1] if descending else merged
+    return full
+
+
+def _written_tiles(fs: Any, markers: str) -> set[str]:
+    """Return the tile keys with a marker file under ``markers``."""
+
+    try:
+        names = fs.ls(markers, detail=False)
+    except FileNotFoundError:
+        return set()
+    return {PurePosixPath(name).name for name in names}
+
+
+def _stored_labels(store: str | Path, dims: Tuple[str, ...]) -> Optional[Dict[str, np.ndarray]]:
+    """Return the coordinates of an initialized store, or ``None`` if it has none."""
+
+    try:
+        ds = xr.open_zarr(str(store))
+    except (FileNotFoundError, KeyError, ValueError):
+        return None
+    with ds:
+        if not all(dim in ds.coords for dim in dims):
+            return None
+        return {dim: ds[dim].values for dim in dims}
+
+
+def _region_for(
+    tile: xr.DataArray,
+    full: Mapping[str, np.ndarray],
+    dims: Tuple[str, ...],
+) -> Dict[str, slice]:
+    """Return the contiguous index region occupied by ``tile`` in ``full``."""
+
+    return _label_region({dim: tile[dim].values for dim in dims}, full, dims)
+
+
+def _label_region(
+    labels: Mapping[str, np.ndarray],
+    full: Mapping[str, np.ndarray],
+    dims: Tuple[str, ...],
+) -> Dict[str, slice]:
+    region: Dict[str, slice] = {}
+    for dim in dims:
+        index, wanted = pd.Index(full[dim]), np.asarray(labels[dim])
+        positions = index.get_indexer(wanted)
+        if (positions < 0).any() and np.issubdtype(index.dtype, np.floating):
+            positions = index.get_indexer(wanted, method="nearest", tolerance=_LABEL_TOLERANCE)
+        if positions.size == 0 or (positions < 0).any():
+            raise ValueError(f"Tile labels along {dim!r} are not part of the cube layout")
+        start, stop = int(positions.min()), int(positions.max()) + 1
+        if stop - start != positions.size or not np.all(np.diff(positions) == 1):
+            raise ValueError(f"Tile labels along {dim!r} do not form a contiguous region")
+        region[dim] = slice(start, stop)
+    return region
+
+
+def _trim_shared_labels(
+    regions: List[Dict[str, slice]],
+    dims: Tuple[str, ...],
+) -> List[Dict[str, slice]]:
+    """Start every tile's span after the labels already covered by earlier spans."""
+
+    trimmed: Dict[str, Dict[Tuple[int, int], slice]] = {}
+    for dim in dims:
+        spans = sorted({(region[dim].start, region[dim].stop) for region in regions})
+        covered = 0
+        trimmed[dim] = {}
+        for start, stop in spans:
+            if stop <= covered:
+                raise ValueError("VirtualCube tiles overlap; cannot build a dask array")
+            trimmed[dim][(start, stop)] = slice(max(start, covered), stop)
+            covered = max(covered, stop)
+    return [
+        {dim: trimmed[dim][(region[dim].start, region[dim].stop)] for dim in dims}
+        for region in regions
+    ]
+
+
+def _load_block(
+    loader: Callable[..., xr.DataArray],
+    kwargs: Mapping[str, Any],
+    dims: Tuple[str, ...],
+    labels: Mapping[str, np.ndarray],
+    dtype: np.dtype,
+) -> np.ndarray:
+    """Load one tile and align it to the block labels expected by the graph."""
+
+    tile = loader(**kwargs).transpose(*dims)
+    for dim in dims:
+        if np.issubdtype(tile[dim].dtype, np.floating):
+            tile = tile.reindex({dim: labels[dim]}, method="nearest", tolerance=_LABEL_TOLERANCE)
+        else:
+            tile = tile.reindex({dim: labels[dim]})
+    return np.asarray(tile.values, dtype=dtype)
+
+
+def _init_zarr_store(
+    store: str | Path,
+    tile: xr.DataArray,
+    full: Mapping[str, np.ndarray],
+    dims: Tuple[str, ...],
+    name: str,
+    chunks: Optional[Mapping[str, int]],
+) -> None:
+    """Create ``store`` with full coordinates and a lazily-filled data variable."""
+
+    import dask.array as dsa
+
+    chunk_sizes = tuple(
+        int((chunks or {}).get(dim, tile.sizes[dim])) for dim in dims
+    )
+    shape = tuple(len(full[dim]) for dim in dims)
+    dtype = tile.dtype if np.issubdtype(tile.dtype, np.floating) else np.float64
+    template = xr.DataArray(
+        dsa.full(shape, np.nan, dtype=dtype, chunks=chunk_sizes),
+        coords={dim: full[dim] for dim in dims},
+        dims=dims,
+        name=name,
+        attrs=dict(tile.attrs),
+    )
+    template.to_dataset().to_zarr(str(store), mode="w", compute=False)
+
+
+def make_time_tiler(
+    start: Any,
+    end: Any,
+    freq: str = "A",
+    *,
+    inclusive: bool = True,
+) -> Callable[[Dict[str, Any]], Iterable[Dict[str, Any]]]:
     """Create a deterministic time tiler.
 
     Parameters
@@ -119,6 +624,13 @@ def make_time_tiler(start: Any, end: Any, freq: str = "A") -> Callable[[Dict[str
         Boundary values convertible by ``pandas.to_datetime``.
     freq : str, default "A"
         Frequency string understood by ``pandas.date_range``.
+    inclusive : bool, default True
+        When True consecutive chunks share their boundary timestamp. When
+        False every chunk but the last ends one nanosecond before the next
+        one starts, so loaders that slice labels inclusively do not return
+        boundary steps twice. If ``end`` falls exactly on a boundary it
+        forms a final ``{"start": end, "end": end}`` chunk, keeping every
+        chunk within ``freq``.
 
     Returns
     -------
@@ -140,15 +652,23 @@ def make_time_tiler(start: Any, end: Any, freq: str = "A") -> Callable[[Dict[str
             yield {}
             return
 
-        edges = pd.date_range(t0, t1, freq=freq)
+        natural = pd.date_range(t0, t1, freq=freq)
+        edges = natural
         if len(edges) == 0 or edges[0] != t0:
             edges = pd.DatetimeIndex([t0]).append(edges)
         if edges[-1] < t1:
             edges = edges.append(pd.DatetimeIndex([t1]))
         if len(edges) == 1:
             edges = edges.append(pd.DatetimeIndex([t1]))
+        elif not inclusive and len(natural) and natural[-1] == t1:
+            # ``end`` sits on a boundary: give it its own chunk so the closed
+            # last chunk does not span one step more than ``freq``.
+            edges = edges.append(pd.DatetimeIndex([t1]))
 
-        for s, e in zip(edges[:-1], edges[1:]):
+        last = len(edges) - 2
+        for i, (s, e) in enumerate(zip(edges[:-1], edges[1:])):
+            if not inclusive and i < last:
+                e = e - pd.Timedelta(1, "ns")
             yield {"start": s, "end": e}
 
     return tiler
@@ -21,15 +21,12 @@ def test_streaming_helpers_are_callable():
         assert callable(func)
 
 
-def test_streaming_stubs_raise_not_implemented():
-    """Only the unimplemented helpers should raise NotImplementedError."""
-    stub_funcs = [
-        cubedynamics.stream_prism_to_cube,
-        cubedynamics.correlation_cube,
-    ]
-    for func in stub_funcs:
-        with pytest.raises(NotImplementedError):
-            if func is cubedynamics.correlation_cube:
-                func(None, [None])
-            else:
-                func(None)
+def test_stream_prism_requires_archives():
+    """PRISM streaming needs at least one zip archive to read."""
+    with pytest.raises(ValueError):
+        cubedynamics.stream_prism_to_cube(None)
+
+
+def test_correlation_cube_requires_target():
+    with pytest.raises(ValueError):
+        cubedynamics.correlation_cube(None)
@@ -11,8 +11,6 @@ STREAMING_FUNCTIONS = [
     cubedynamics.stream_prism_to_cube,
 ]
 
-STREAMING_STUBS = [cubedynamics.stream_prism_to_cube]
-
 
 @pytest.mark.streaming
 @pytest.mark.parametrize("func", STREAMING_FUNCTIONS)
@@ -27,17 +25,9 @@ def test_streaming_functions_expose_chunks_argument(func):
 
 
 @pytest.mark.streaming
-def test_streaming_stubs_raise_not_implemented():
-    """Until implemented, stub helpers should make their status clear."""
-    dummy_file_like = object()
-    for func in STREAMING_STUBS:
-        with pytest.raises(NotImplementedError):
-            func(dummy_file_like, chunks={"time": 1})
-
-
-@pytest.mark.download
-def test_stub_download_paths_are_opt_in():
-    """Stubs must still raise until real download behavior is implemented."""
-    for func in STREAMING_STUBS:
-        with pytest.raises(NotImplementedError):
-            func("/tmp/local-prism-stack.nc", chunks=None, force_download=True)
+def test_prism_streaming_rejects_unsupported_sources():
+    """PRISM streaming reads zip archives only and fails before any IO."""
+    with pytest.raises(ValueError):
+        cubedynamics.stream_prism_to_cube(object(), chunks={"time": 1})
+    with pytest.raises(ValueError):
+        cubedynamics.stream_prism_to_cube("/tmp/local-prism-stack.nc", chunks=None)
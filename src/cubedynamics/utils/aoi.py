@@ -0,0 +1,129 @@
+"""Area-of-interest helpers shared by the climate loaders."""
+
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+__all__ = [
+    "coerce_aoi",
+    "bbox_mapping_from_point",
+    "bbox_mapping_from_sequence",
+    "bbox_mapping_from_geojson",
+]
+
+_POINT_BUFFER_DEGREES = 0.05
+
+
+def coerce_aoi(
+    *,
+    lat: float | None,
+    lon: float | None,
+    bbox: Sequence[float] | None,
+    aoi_geojson: Mapping[str, object] | None,
+) -> Mapping[str, float]:
+    """Return the ``min_lon``/``min_lat``/``max_lon``/``max_lat`` bounds of an AOI.
+
+    Exactly one of ``lat``/``lon`` (buffered by 0.05 degrees), ``bbox``
+    (``[min_lon, min_lat, max_lon, max_lat]``) or ``aoi_geojson`` must be given.
+    """
+
+    specs = [
+        lat is not None or lon is not None,
+        bbox is not None,
+        aoi_geojson is not None,
+    ]
+    if sum(bool(spec) for spec in specs) != 1:
+        raise ValueError("Specify exactly one of (lat/lon), bbox, or aoi_geojson.")
+
+    if lat is not None or lon is not None:
+        if lat is None or lon is None:
+            raise ValueError("Both 'lat' and 'lon' must be provided together.")
+        return bbox_mapping_from_point(lat, lon)
+    if bbox is not None:
+        return bbox_mapping_from_sequence(bbox)
+    assert aoi_geojson is not None  # for mypy/static
+    return bbox_mapping_from_geojson(aoi_geojson)
+
+
+def bbox_mapping_from_point(lat: float, lon: float) -> Mapping[str, float]:
+    """Return the bounds of a square buffered around a point."""
+
+    buffer = _POINT_BUFFER_DEGREES
+    return {
+        "min_lat": float(lat) - buffer,
+        "max_lat": float(lat) + buffer,
+        "min_lon": float(lon) - buffer,
+        "max_lon": float(lon) + buffer,
+    }
+
+
+def bbox_mapping_from_sequence(values: Sequence[float]) -> Mapping[str, float]:
+    """Return the bounds of a ``[min_lon, min_lat, max_lon, max_lat]`` sequence."""
+
+    if len(values) != 4:
+        raise ValueError("'bbox' must contain four values: [min_lon, min_lat, max_lon, max_lat].")
+    min_lon, min_lat, max_lon, max_lat = map(float, values)
+    if min_lon >= max_lon or min_lat >= max_lat:
+        raise ValueError("'bbox' must have min values less than max values.")
+    return {
+        "min_lon": min_lon,
+        "min_lat": min_lat,
+        "max_lon": max_lon,
+        "max_lat": max_lat,
+    }
+
+
+def bbox_mapping_from_geojson(aoi_geojson: Mapping[str, object]) -> Mapping[str, float]:
+    """Return the bounds of every coordinate in a GeoJSON geometry, Feature or collection."""
+
+    if not isinstance(aoi_geojson, Mapping):
+        raise ValueError("GeoJSON AOI must be a mapping with a 'type' field.")
+    geometries = _extract_geojson_geometries(aoi_geojson)
+    coords = []
+    for geometry in geometries:
+        coords.extend(_flatten_geojson_coords(geometry.get("coordinates")))
+    if not coords:
+        raise ValueError("GeoJSON AOI does not contain any coordinates.")
+    lons = [float(coord[0]) for coord in coords]
+    lats = [float(coord[1]) for coord in coords]
+    return {
+        "min_lon": min(lons),
+        "max_lon": max(lons),
+        "min_lat": min(lats),
+        "max_lat": max(lats),
+    }
+
+
+def _extract_geojson_geometries(obj: Mapping[str, object]) -> Sequence[Mapping[str, object]]:
+    geo_type = obj.get("type")
+    if geo_type == "FeatureCollection":
+        features = obj.get("features", [])
+        if not isinstance(features, Sequence) or isinstance(features, (str, bytes)):
+            raise ValueError("GeoJSON FeatureCollection must include a 'features' array.")
+        geometries = [feat.get("geometry") for feat in features if isinstance(feat, Mapping)]
+        return [geom for geom in geometries if isinstance(geom, Mapping)]
+    if geo_type == "Feature":
+        geometry = obj.get("geometry")
+        if not isinstance(geometry, Mapping):
+            raise ValueError("GeoJSON Feature missing a valid geometry.")
+        return [geometry]
+    if geo_type in {"Polygon", "MultiPolygon", "Point", "LineString", "MultiLineString", "MultiPoint"}:
+        return [obj]
+    raise ValueError("Unsupported GeoJSON type for AOI: {0}".format(geo_type))
+
+
+def _flatten_geojson_coords(coords: object) -> list[tuple[float, float]]:
+    if coords is None:
+        return []
+    if isinstance(coords, (float, int)):
+        raise ValueError("Invalid GeoJSON coordinate structure.")
+    if isinstance(coords, Sequence) and not isinstance(coords, (str, bytes)):
+        if coords and isinstance(coords[0], (float, int)):
+            if len(coords) < 2:
+                raise ValueError("GeoJSON coordinates must include lon/lat pairs.")
+            return [(float(coords[0]), float(coords[1]))]
+        flat: list[tuple[float, float]] = []
+        for sub in coords:
+            flat.extend(_flatten_geojson_coords(sub))
+        return flat
+    return []
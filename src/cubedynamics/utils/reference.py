@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from typing import Mapping, Sequence
+
+import numpy as np
 import xarray as xr
 
 
@@ -27,3 +30,57 @@ def center_pixel_series(
 
     y_idx, x_idx = center_pixel_indices(cube, y_dim=y_dim, x_dim=x_dim)
     return cube.isel({y_dim: y_idx, x_dim: x_idx})
+
+
+def _reference_mask(cube: xr.DataArray, geometry, y_dim: str, x_dim: str) -> xr.DataArray:
+    """Boolean (y, x) mask of pixel centres inside a polygon geometry."""
+
+    from shapely import contains_xy
+    from shapely.geometry import shape
+
+    if isinstance(geometry, Mapping):
+        if geometry.get("type") == "Feature":
+            geometry = geometry.get("geometry")
+        geometry = shape(geometry)
+    yy, xx = np.meshgrid(cube[y_dim].values, cube[x_dim].values, indexing="ij")
+    inside = contains_xy(geometry, xx, yy)
+    if not inside.any():
+        raise ValueError("Reference polygon does not contain any pixel centres")
+    return xr.DataArray(inside, dims=(y_dim, x_dim), coords={y_dim: cube[y_dim], x_dim: cube[x_dim]})
+
+
+def reference_series(
+    cube: xr.DataArray,
+    references: Sequence | Mapping,
+    y_dim: str = "y",
+    x_dim: str = "x",
+    time_dim: str = "time",
+) -> xr.DataArray:
+    """Extract K reference time series from a cube as a ``(time, reference)`` array.
+
+    Each reference is either a ``(y, x)`` coordinate pair, resolved to the
+    nearest pixel, or a polygon (GeoJSON mapping, Feature or shapely
+    geometry in the cube's x/y coordinates), averaged over the pixels whose
+    centres fall inside it. Pass a mapping to name the references; otherwise
+    they are labelled ``ref0``, ``ref1``, ...
+    """
+
+    if isinstance(references, Mapping):
+        labels = [str(key) for key in references]
+        items = list(references.values())
+    else:
+        items = list(references)
+        labels = [f"ref{k}" for k in range(len(items))]
+    if not items:
+        raise ValueError("At least one reference is required")
+
+    series = []
+    for item in items:
+        if isinstance(item, Sequence) and not isinstance(item, (str, Mapping)) and len(item) == 2:
+            y_val, x_val = item
+            ts = cube.sel({y_dim: y_val, x_dim: x_val}, method="nearest")
+        else:
+            mask = _reference_mask(cube, item, y_dim, x_dim)
+            ts = cube.where(mask).mean(dim=(y_dim, x_dim), skipna=True)
+        series.append(ts.reset_coords(drop=True).transpose(time_dim))
+    return xr.concat(series, dim="reference").assign_coords(reference=labels).transpose(time_dim, "reference")
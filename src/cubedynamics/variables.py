@@ -2,17 +2,22 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 from datetime import datetime, date
-from typing import Any, Mapping, Optional, Sequence, Literal
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Literal
+import math
 import warnings
 
+import numpy as np
 import pandas as pd
 import xarray as xr
+from dask.utils import parse_bytes
 
 import cubedynamics as cd
 from cubedynamics import pipe, verbs as v
-from cubedynamics.data.gridmet import load_gridmet_cube
-from cubedynamics.data.prism import load_prism_cube
+from cubedynamics.data.gridmet import gridmet_cube_coords, load_gridmet_cube
+from cubedynamics.data.prism import load_prism_cube, prism_cube_coords
 from cubedynamics.streaming import (
     VirtualCube,
     make_spatial_tiler,
@@ -22,6 +27,7 @@ from cubedynamics.sentinel import (
     load_sentinel2_ndvi_cube,
     load_sentinel2_ndvi_zscore_cube,
 )
+from cubedynamics.utils.aoi import coerce_aoi
 
 
 TEMP_SOURCES: dict[str, dict[str, str]] = {
@@ -37,7 +43,26 @@ TEMP_SOURCES: dict[str, dict[str, str]] = {
     },
 }
 
-STREAMING_SIZE_THRESHOLD = 2.5e6
+SOURCE_GRIDS: dict[str, dict[str, Any]] = {
+    # gridMET: 1/24 degree (~4 km) grid stored as float32; ``freq`` is the
+    # loader's default ``time_res``.
+    "gridmet": {"resolution": 1.0 / 24.0, "dtype": "float32", "freq": "MS"},
+    # PRISM 4 km: 2.5 arc-minute grid stored as float32, monthly by default.
+    "prism": {"resolution": 2.5 / 60.0, "dtype": "float32", "freq": "ME"},
+}
+
+DEFAULT_MEMORY_BUDGET = "2GB"
+
+
+def _aoi_bounds(
+    lat: Optional[float],
+    lon: Optional[float],
+    bbox: Optional[Sequence[float]],
+    aoi_geojson: Optional[Mapping[str, Any]],
+) -> Optional[Mapping[str, float]]:
+    if lat is None and lon is None and bbox is None and aoi_geojson is None:
+        return None
+    return coerce_aoi(lat=lat, lon=lon, bbox=bbox, aoi_geojson=aoi_geojson)
 
 
 def estimate_cube_size(
@@ -48,37 +73,116 @@ def estimate_cube_size(
     start: Any,
     end: Any,
     source: str,
-) -> float:
-    """Return a rough scalar size estimate for a requested cube.
+    *,
+    dtype: Any = None,
+    n_variables: int = 1,
+    freq: Optional[str] = None,
+) -> int:
+    """Return the in-memory size in bytes of a requested cube.
 
-    The heuristic multiplies the spatial footprint by the time span in days.
-    It intentionally errs on the side of being simple and fast; the goal is to
-    decide whether a request should stream rather than to predict byte counts
-    exactly.
+    The footprint is converted to grid cells using the native spacing of
+    ``source`` (see ``SOURCE_GRIDS``); point requests cover the small buffer
+    the loaders place around the point and GeoJSON AOIs their bounding box.
+
+    Parameters
+    ----------
+    lat, lon, bbox, aoi_geojson :
+        AOI specification, exactly as passed to the loaders.
+    start, end : Any
+        Inclusive time bounds; every ``freq`` step between them is one slice.
+    source : str
+        Key into ``SOURCE_GRIDS``.
+    dtype : numpy dtype, optional
+        Element type of the loaded values. Defaults to the source dtype.
+    n_variables : int, default 1
+        Number of variables loaded side by side.
+    freq : str, optional
+        Time step of the request (the loader's ``freq``/``time_res``).
+        Defaults to the loader's default for ``source``.
     """
 
-    start_ts = pd.to_datetime(start) if start is not None else None
-    end_ts = pd.to_datetime(end) if end is not None else None
-    if start_ts is not None and end_ts is not None:
-        days = max((end_ts - start_ts).days, 1)
-    else:
-        days = 1
+    grid = _source_grid(source)
+    itemsize = np.dtype(dtype if dtype is not None else grid["dtype"]).itemsize
+    ny, nx = _grid_shape(_aoi_bounds(lat, lon, bbox, aoi_geojson), grid["resolution"])
+    return int(ny * nx * _n_steps(start, end, freq or grid["freq"]) * itemsize * n_variables)
+
+
+def _source_grid(source: str) -> Mapping[str, Any]:
+    if source not in SOURCE_GRIDS:
+        raise ValueError(f"Unsupported source '{source}'. Expected one of {sorted(SOURCE_GRIDS)}")
+    return SOURCE_GRIDS[source]
+
+
+def _grid_shape(bounds: Optional[Mapping[str, float]], resolution: float) -> tuple[int, int]:
+    if bounds is None:
+        return 1, 1
+    ny = math.ceil(round((bounds["max_lat"] - bounds["min_lat"]) / resolution, 6))
+    nx = math.ceil(round((bounds["max_lon"] - bounds["min_lon"]) / resolution, 6))
+    return max(ny, 1), max(nx, 1)
+
+
+def _n_steps(start: Any, end: Any, freq: str) -> int:
+    if start is None or end is None:
+        return 1
+    return max(len(pd.date_range(pd.to_datetime(start), pd.to_datetime(end), freq=freq)), 1)
+
+
+def plan_tiles(
+    *,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    bbox: Optional[Sequence[float]] = None,
+    aoi_geojson: Optional[Mapping[str, Any]] = None,
+    start: Any = None,
+    end: Any = None,
+    source: str = "gridmet",
+    memory_budget: int | str = DEFAULT_MEMORY_BUDGET,
+    dtype: Any = None,
+    n_variables: int = 1,
+    freq: Optional[str] = None,
+) -> dict[str, Any]:
+    """Choose ``time_chunk`` and ``spatial_tile`` so each tile fits a budget.
+
+    Whole-footprint tiles are preferred and split along time; only when a
+    single time step of the full footprint exceeds ``memory_budget`` (and the
+    AOI is a ``bbox``) is the footprint split into square spatial tiles of one
+    step. ``freq`` is the request's time step as in
+    :func:`estimate_cube_size`.
+
+    Returns
+    -------
+    dict
+        ``{"time_chunk": str, "spatial_tile": float | None,
+        "tile_bytes": int}`` where ``time_chunk`` is a multiple of ``freq``
+        such as ``"365D"`` or ``"12ME"`` and ``spatial_tile`` a tile edge in
+        degrees.
+    """
+
+    budget = parse_bytes(memory_budget)
+    grid = _source_grid(source)
+    itemsize = np.dtype(dtype if dtype is not None else grid["dtype"]).itemsize * n_variables
+    ny, nx = _grid_shape(_aoi_bounds(lat, lon, bbox, aoi_geojson), grid["resolution"])
+    freq = freq or grid["freq"]
+    n_steps = _n_steps(start, end, freq)
+    step_bytes = ny * nx * itemsize
 
-    area = 1.0
-    if bbox is not None:
-        xmin, ymin, xmax, ymax = bbox
-        area = max((xmax - xmin) * (ymax - ymin), 1.0)
-    elif aoi_geojson is not None:
-        # Without geometry computation fall back to a conservative factor.
-        area = 2.0
-    elif lat is not None and lon is not None:
-        area = 1.0
+    if step_bytes <= budget:
+        steps = min(budget // step_bytes, n_steps)
+        return {"time_chunk": f"{steps}{freq}", "spatial_tile": None, "tile_bytes": int(steps * step_bytes)}
 
-    # A tiny boost for higher resolution sources.
-    if source == "prism":
-        area *= 1.25
+    if bbox is None:
+        warnings.warn(
+            "A single time step exceeds memory_budget and spatial tiling requires 'bbox'; "
+            "streaming one step at a time.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return {"time_chunk": f"1{freq}", "spatial_tile": None, "tile_bytes": int(step_bytes)}
 
-    return float(area * days)
+    # Spatial tiles also share edges; the extra cell keeps the true tile in budget.
+    cells = max(math.isqrt(budget // itemsize) - 1, 1)
+    edge = cells * grid["resolution"]
+    return {"time_chunk": f"1{freq}", "spatial_tile": edge, "tile_bytes": int((cells + 1) ** 2 * itemsize)}
 
 
 def _resolve_temp_variable(source: str, kind: str) -> str:
@@ -135,6 +239,28 @@ def _load_temperature(
     return da
 
 
+def _temperature_coords(
+    *,
+    kind: str,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    bbox: Optional[Sequence[float]] = None,
+    aoi_geojson: Optional[Mapping[str, Any]] = None,
+    start: Any = None,
+    end: Any = None,
+    source: Literal["gridmet", "prism"] = "gridmet",
+    freq: Optional[str] = None,
+    time_res: Optional[str] = None,
+    **_loader_options: Any,
+) -> dict[str, np.ndarray]:
+    """Coordinate probe matching ``_load_temperature`` without reading data."""
+
+    request = dict(lat=lat, lon=lon, bbox=bbox, aoi_geojson=aoi_geojson, start=start, end=end, freq=freq)
+    if source == "gridmet":
+        return gridmet_cube_coords(variable=_resolve_temp_variable(source, kind), time_res=time_res, **request)
+    return prism_cube_coords(time_res=time_res or "ME", **request)
+
+
 def temperature(
     *,
     lat: Optional[float] = None,
@@ -145,9 +271,10 @@ def temperature(
     end: Any = None,
     source: Literal["gridmet", "prism"] = "gridmet",
     streaming_strategy: str | None = None,
-    time_chunk: str = "AS",
+    time_chunk: str | None = None,
     spatial_tile: float | None = None,
-    streaming_threshold: float | None = None,
+    streaming_threshold: int | str | None = None,
+    memory_budget: int | str = DEFAULT_MEMORY_BUDGET,
     **kwargs: Any,
 ) -> xr.DataArray | VirtualCube:
     """
@@ -156,14 +283,34 @@ def temperature(
     This is a semantic wrapper around ``load_gridmet_cube`` or ``load_prism_cube``.
     It forwards AOI, time, and additional keyword arguments directly to the
     underlying loader.
+
+    Parameters
+    ----------
+    streaming_strategy : {"auto", "materialize", "virtual"}, optional
+        ``"auto"`` (the default) materializes the cube when its estimated size
+        (see :func:`estimate_cube_size`) fits in ``memory_budget`` and returns a
+        :class:`~cubedynamics.streaming.VirtualCube` otherwise.
+    time_chunk, spatial_tile : optional
+        Pandas frequency of the time tiles and tile edge in degrees. When left
+        unset they are chosen by :func:`plan_tiles` so each tile fits
+        ``memory_budget``.
+    streaming_threshold : int or str, optional
+        Size in bytes above which ``"auto"`` streams; defaults to
+        ``memory_budget``.
+    memory_budget : int or str, default "2GB"
+        Memory available for one tile, e.g. ``"500MB"``. Planned tiles fill
+        it, so the VirtualCube loads them one at a time.
     """
 
     strategy = streaming_strategy or "auto"
-    size_estimate = estimate_cube_size(lat, lon, bbox, aoi_geojson, start, end, source)
-    threshold = streaming_threshold if streaming_threshold is not None else STREAMING_SIZE_THRESHOLD
+    # Size and tiles follow the step the loader will actually return.
+    freq = kwargs.get("freq") or kwargs.get("time_res")
+    size_estimate = estimate_cube_size(lat, lon, bbox, aoi_geojson, start, end, source, freq=freq)
+    threshold = parse_bytes(streaming_threshold if streaming_threshold is not None else memory_budget)
 
-    def base_loader(**loader_kwargs: Any) -> xr.DataArray:
-        return _load_temperature(kind="mean", **loader_kwargs)
+    # A partial (rather than a closure) keeps the loader picklable for
+    # process-pool reductions over the resulting VirtualCube.
+    base_loader = partial(_load_temperature, kind="mean")
 
     loader_kwargs: dict[str, Any] = {
         "lat": lat,
@@ -179,7 +326,22 @@ def temperature(
     if strategy == "materialize" or (strategy == "auto" and size_estimate <= threshold):
         return base_loader(**loader_kwargs)
 
-    time_tiler = make_time_tiler(start, end, freq=time_chunk)
+    if time_chunk is None or (spatial_tile is None and bbox is not None):
+        plan = plan_tiles(
+            lat=lat,
+            lon=lon,
+            bbox=bbox,
+            aoi_geojson=aoi_geojson,
+            start=start,
+            end=end,
+            source=source,
+            memory_budget=memory_budget,
+            freq=freq,
+        )
+        time_chunk = time_chunk or plan["time_chunk"]
+        spatial_tile = spatial_tile if spatial_tile is not None else plan["spatial_tile"]
+
+    time_tiler = make_time_tiler(start, end, freq=time_chunk, inclusive=False)
     if spatial_tile is None or bbox is None:
         spatial_tiler = lambda kw: ({} for _ in [None])  # type: ignore[misc]
     else:
@@ -202,6 +364,8 @@ def temperature(
         loader_kwargs=loader_kwargs,
         time_tiler=time_tiler,
         spatial_tiler=spatial_tiler,
+        memory_budget=memory_budget,
+        coords_probe=partial(_temperature_coords, kind="mean"),
     )
 
 
@@ -271,11 +435,14 @@ def temperature_anomaly(
     baseline_start: Any = None,
     baseline_end: Any = None,
     **kwargs: Any,
-) -> xr.DataArray:
+) -> xr.DataArray | VirtualCube:
     """
     Compute a temperature anomaly cube along the time dimension.
 
-    Uses the semantic temperature loaders and ``verbs.anomaly``.
+    Uses the semantic temperature loaders and ``verbs.anomaly``. When
+    :func:`temperature` streams (returns a :class:`VirtualCube`) the anomaly
+    is also a VirtualCube computed tile by tile; a ``baseline_start`` /
+    ``baseline_end`` window is then streamed from the tiles it overlaps.
     """
 
     if kind == "mean":
@@ -314,16 +481,49 @@ def temperature_anomaly(
     else:
         raise ValueError("Unsupported temperature anomaly kind: {0}".format(kind))
 
-    if baseline is None and baseline_start is None and baseline_end is None:
-        return (pipe(temp_cube) | v.anomaly(dim="time")).unwrap()
-
-    baseline_data: xr.DataArray = baseline if baseline is not None else temp_cube
+    baseline_data: xr.DataArray | VirtualCube | None = baseline
     if baseline_start is not None or baseline_end is not None:
-        baseline_data = baseline_data.sel(time=slice(baseline_start, baseline_end))
-
-    baseline_mean = baseline_data.mean(dim="time", skipna=True, keep_attrs=True)
-    baseline_mean = baseline_mean.broadcast_like(temp_cube)
-    return temp_cube - baseline_mean
+        baseline_data = baseline_data if baseline_data is not None else temp_cube
+        if isinstance(baseline_data, VirtualCube):
+            baseline_data = _time_window(baseline_data, baseline_start, baseline_end)
+        else:
+            baseline_data = baseline_data.sel(time=slice(baseline_start, baseline_end))
+
+    return (pipe(temp_cube) | v.anomaly(dim="time", baseline=baseline_data)).unwrap()
+
+
+def _clip_time_tiles(
+    tiler: Callable[[Dict[str, Any]], Iterable[Dict[str, Any]]],
+    start: Optional[pd.Timestamp],
+    end: Optional[pd.Timestamp],
+    kwargs: Dict[str, Any],
+) -> Iterator[Dict[str, Any]]:
+    for tile in tiler(kwargs):
+        t0 = pd.to_datetime(tile.get("start", kwargs.get("start")))
+        t1 = pd.to_datetime(tile.get("end", kwargs.get("end")))
+        if start is not None:
+            t0 = max(t0, start)
+        if end is not None:
+            t1 = min(t1, end)
+        if t0 <= t1:
+            yield {**tile, "start": t0, "end": t1}
+
+
+def _time_window(cube: VirtualCube, start: Any, end: Any) -> VirtualCube:
+    """Restrict a ``start``/``end`` tiled VirtualCube to the tiles within a window."""
+
+    start = pd.to_datetime(start) if start is not None else None
+    end = pd.to_datetime(end) if end is not None else None
+    metadata = {key: value for key, value in cube.coords_metadata.items() if key != "coords"}
+    if start is not None:
+        metadata["start"] = start
+    if end is not None:
+        metadata["end"] = end
+    return replace(
+        cube,
+        coords_metadata=metadata,
+        time_tiler=partial(_clip_time_tiles, cube.time_tiler, start, end),
+    )
 
 
 def _year_chunks(start: str, end: str, years_per_chunk: int = 1):
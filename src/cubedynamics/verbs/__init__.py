@@ -15,7 +15,12 @@ This module is part of the CubeDynamics "grammar-of-cubes":
 - Plotting follows a grammar-of-graphics model (aes, geoms, stats, scales, themes).
 
 Canonical API:
-- Statistical verbs: :func:`mean`, :func:`variance`, :func:`anomaly`, :func:`zscore`
+- Statistical verbs: :func:`mean`, :func:`variance`, :func:`anomaly`, :func:`zscore`,
+  :func:`quantile`, :func:`histogram`, :func:`climatology`,
+  :func:`climatological_anomaly`, :func:`correlation_cube`,
+  :func:`reference_correlation`, :func:`correlation_matrix`,
+  :func:`lagged_correlation`, :func:`trend`, :func:`event_runs`,
+  :func:`return_levels`
 - Plotting verbs: :func:`plot`, :func:`plot_mean`, :func:`show_cube_lexcube`
 - Fire/vase verbs: :func:`extract`, :func:`vase`, :func:`fire_plot`, :func:`fire_panel`
 """
@@ -47,14 +52,27 @@ from ..ops.transforms import month_filter
 from ..piping import Verb
 from ..streaming import VirtualCube
 from ..vase import VaseDefinition
+from .climatology import climatological_anomaly, climatology
+from .correlation import correlation_matrix, lagged_correlation, reference_correlation
 from .custom import apply
+from .events import event_runs
+from .extremes import return_levels
 from .flatten import flatten_cube, flatten_space
 from .models import fit_model
 from .plot import plot
 from .plot_mean import plot_mean
+from .trend import trend
 from .tubes import tubes
 from .vase import vase as _vase_base, vase_demo, vase_extract, vase_mask
-from .stats import anomaly, mean, rolling_tail_dep_vs_center, variance, zscore
+from .stats import (
+    anomaly,
+    histogram,
+    mean,
+    quantile,
+    rolling_tail_dep_vs_center,
+    variance,
+    zscore,
+)
 
 
 def _unwrap_dataarray(
@@ -707,13 +725,23 @@ from .fire import fire_plot, fire_derivative  # noqa: E402
 __all__ = [
     "anomaly",
     "apply",
+    "climatological_anomaly",
+    "climatology",
+    "histogram",
     "mean",
+    "quantile",
     "month_filter",
     "flatten_space",
     "flatten_cube",
     "rolling_tail_dep_vs_center",
     "variance",
     "correlation_cube",
+    "correlation_matrix",
+    "lagged_correlation",
+    "reference_correlation",
+    "trend",
+    "event_runs",
+    "return_levels",
     "to_netcdf",
     "zscore",
     "ndvi_from_s2",
@@ -0,0 +1,307 @@
+"""Climatology verbs: per day-of-year (or month) baselines and anomalies."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any, Iterable
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+from dask.base import tokenize
+
+from ..config import STD_EPS
+from ..streaming import VirtualCube
+from ..streaming.cache import loader_token
+from ..streaming.reducers import MomentState
+
+_GROUP_SIZES = {"dayofyear": 366, "month": 12}
+
+
+def _group_index(times: Any, groupby: str) -> np.ndarray:
+    """Return 0-based group positions (day-of-year or month) for ``times``."""
+
+    index = pd.DatetimeIndex(np.asarray(times))
+    return np.asarray(getattr(index, groupby), dtype=np.int64) - 1
+
+
+def _time_blocks(obj: xr.DataArray, dim: str) -> Iterable[xr.DataArray]:
+    """Yield ``obj`` one time chunk at a time (a single block for NumPy data)."""
+
+    chunks = obj.chunksizes.get(dim) if obj.chunks is not None else None
+    if not chunks:
+        yield obj
+        return
+    start = 0
+    for size in chunks:
+        yield obj.isel({dim: slice(start, start + size)})
+        start += size
+
+
+def _climatology_dataset(
+    obj: xr.DataArray | VirtualCube,
+    *,
+    groupby: str,
+    window: int,
+    dim: str,
+    baseline: tuple[Any, Any] | None,
+) -> xr.Dataset:
+    """Accumulate per-group moment states in one streaming pass over ``obj``."""
+
+    if groupby not in _GROUP_SIZES:
+        raise ValueError(f"groupby must be one of {sorted(_GROUP_SIZES)}, got {groupby!r}")
+    if window < 1 or window % 2 == 0:
+        raise ValueError("window must be a positive odd integer")
+    n_groups = _GROUP_SIZES[groupby]
+
+    if isinstance(obj, VirtualCube):
+        if dim != "time":
+            raise NotImplementedError("Streaming climatology is implemented for dim='time' only")
+        tiles: Iterable[xr.DataArray] = obj.iter_time_tiles()
+    elif isinstance(obj, xr.DataArray):
+        if dim not in obj.dims:
+            raise ValueError(f"Dimension {dim!r} not found in object dims: {tuple(obj.dims)}")
+        tiles = _time_blocks(obj, dim)
+    else:
+        raise TypeError(f"climatology expects a DataArray or VirtualCube, got {type(obj)!r}")
+
+    state = None
+    kept_dims: tuple[str, ...] = ()
+    kept_coords: dict[str, Any] = {}
+    for tile in tiles:
+        ordered = tile.transpose(dim, ...)
+        if baseline is not None:
+            ordered = ordered.sel({dim: slice(*baseline)})
+        if ordered.sizes[dim] == 0:
+            continue
+        kept_dims = tuple(str(d) for d in ordered.dims[1:])
+        kept_coords = {d: ordered[d].values for d in kept_dims if d in ordered.coords}
+        groups = _group_index(ordered[dim].values, groupby)
+        partial = MomentState.from_groups(np.asarray(ordered.data), groups, n_groups)
+        state = partial if state is None else state.merge(partial)
+
+    if state is None:
+        raise ValueError("No time steps available to build a climatology")
+
+    smoothed = state
+    for shift in range(1, window // 2 + 1):
+        smoothed = smoothed.merge(state.roll(shift)).merge(state.roll(-shift))
+
+    dims = (groupby,) + kept_dims
+    coords = {groupby: np.arange(1, n_groups + 1), **kept_coords}
+    clim = xr.Dataset(
+        {
+            "mean": (dims, smoothed.finalize_mean()),
+            "std": (dims, np.sqrt(smoothed.variance())),
+            "count": (dims, smoothed.count),
+        },
+        coords=coords,
+    )
+    clim.attrs.update(
+        {
+            "groupby": groupby,
+            "window": window,
+            "baseline_period": "full" if baseline is None else f"{baseline[0]}/{baseline[1]}",
+        }
+    )
+    return clim
+
+
+def _apply_climatology(
+    tile: xr.DataArray,
+    clim: xr.Dataset,
+    *,
+    dim: str,
+    standardize: bool,
+    std_eps: float,
+) -> xr.DataArray:
+    """Subtract (and optionally scale by) the climatology matching each time step."""
+
+    groupby = clim.attrs.get("groupby", "dayofyear")
+    positions = xr.DataArray(
+        _group_index(tile[dim].values, groupby),
+        dims=(dim,),
+        coords={dim: tile[dim]},
+    )
+    picked = clim.isel({groupby: positions}).drop_vars(groupby)
+    out = tile - picked["mean"]
+    if standardize:
+        std = picked["std"]
+        out = out / std.where(std > std_eps)
+    out = out.transpose(*tile.dims)
+    out.attrs = {
+        **tile.attrs,
+        "long_name": f"{tile.name or 'variable'} climatological anomaly",
+        "climatology_groupby": groupby,
+        "climatology_window": clim.attrs.get("window", 1),
+    }
+    return out.rename(tile.name)
+
+
+class _ClimatologyAnomalyLoader:
+    """Tile loader that applies a fixed climatology; picklable for process pools."""
+
+    def __init__(
+        self,
+        loader: Any,
+        clim: xr.Dataset,
+        *,
+        dim: str,
+        standardize: bool,
+        std_eps: float,
+    ) -> None:
+        self.loader = loader
+        self.clim = clim
+        self.dim = dim
+        self.standardize = standardize
+        self.std_eps = std_eps
+
+    @property
+    def cache_token(self) -> str | None:
+        """Token of the parent loader plus the climatology, so tiles stay distinct."""
+
+        parent = loader_token(self.loader)
+        if parent is None:
+            return None
+        return tokenize(parent, self.clim, self.dim, self.standardize, self.std_eps)
+
+    def __call__(self, **kwargs: Any) -> xr.DataArray:
+        return _apply_climatology(
+            self.loader(**kwargs),
+            self.clim,
+            dim=self.dim,
+            standardize=self.standardize,
+            std_eps=self.std_eps,
+        )
+
+
+def climatology(
+    groupby: str = "dayofyear",
+    window: int = 1,
+    *,
+    dim: str = "time",
+    baseline: tuple[Any, Any] | None = None,
+):
+    """Summary
+    Build a per day-of-year (or month) mean/std climatology in one pass.
+
+    Grammar contract
+    Reducer verb (cube → climatology Dataset with ``dim`` replaced by
+    ``groupby``). Direct-call and pipe-ready.
+
+    Parameters
+    groupby : {"dayofyear", "month"}, default "dayofyear"
+        Calendar grouping of the time steps.
+    window : int, default 1
+        Odd, circular smoothing window in groups; ``31`` pools ±15 days
+        around each day-of-year.
+    dim : str, default "time"
+        Time dimension of the cube.
+    baseline : tuple, optional
+        ``(start, end)`` labels restricting the baseline period, e.g.
+        ``("1991-01-01", "2020-12-31")``.
+
+    Returns
+    xr.Dataset
+        Variables ``mean``, ``std`` (population) and ``count`` with dims
+        ``(groupby, y, x)``.
+
+    Notes
+    Each time tile of a VirtualCube (or each time chunk of a dask cube) is
+    folded into 366 (or 12) mergeable moment accumulators per pixel, so the
+    data is read once regardless of the number of years. Smoothing merges the
+    accumulators of neighbouring groups, which weights every underlying day
+    equally. Day 366 only receives data from leap years.
+
+    Examples
+    --------
+    >>> from cubedynamics import pipe, verbs as v
+    >>> cube = ...  # xarray.DataArray or VirtualCube with dims (time, y, x)
+    >>> clim = (pipe(cube) | v.climatology("dayofyear", window=31)).unwrap()
+
+    See Also
+    --------
+    cubedynamics.verbs.climatology.climatological_anomaly
+    """
+
+    def _op(obj: xr.DataArray | VirtualCube) -> xr.Dataset:
+        return _climatology_dataset(
+            obj, groupby=groupby, window=window, dim=dim, baseline=baseline
+        )
+
+    return _op
+
+
+def climatological_anomaly(
+    groupby: str = "dayofyear",
+    window: int = 1,
+    *,
+    dim: str = "time",
+    baseline: tuple[Any, Any] | None = None,
+    standardize: bool = False,
+    climatology: xr.Dataset | None = None,
+    std_eps: float = STD_EPS,
+):
+    """Summary
+    Subtract a day-of-year (or monthly) climatology from every time step.
+
+    Grammar contract
+    Transform verb (cube → cube of the same shape). Direct-call and
+    pipe-ready.
+
+    Parameters
+    groupby, window, dim, baseline :
+        Passed to :func:`climatology` when ``climatology`` is not supplied.
+    standardize : bool, default False
+        Divide by the climatological standard deviation (a seasonal z-score).
+    climatology : xr.Dataset, optional
+        Precomputed result of :func:`climatology`. Reuse it across target
+        periods so the baseline is never read again.
+    std_eps : float, default ``STD_EPS``
+        Standard deviations at or below this value yield NaN when
+        ``standardize`` is True.
+
+    Returns
+    xr.DataArray | VirtualCube
+        Same type and shape as the input. VirtualCube inputs return a new
+        VirtualCube whose tiles are adjusted as they are loaded; dask inputs
+        stay lazy.
+
+    Notes
+    Building the climatology costs one streaming pass; applying it is a
+    per-tile lookup by day-of-year with no further reads of the baseline.
+
+    Examples
+    --------
+    >>> from cubedynamics import pipe, verbs as v
+    >>> cube = ...  # xarray.DataArray or VirtualCube with dims (time, y, x)
+    >>> anom = (pipe(cube) | v.climatological_anomaly(window=31)).unwrap()
+
+    See Also
+    --------
+    cubedynamics.verbs.climatology.climatology, cubedynamics.verbs.stats.anomaly
+    """
+
+    def _op(obj: xr.DataArray | VirtualCube) -> xr.DataArray | VirtualCube:
+        clim = climatology
+        if clim is None:
+            clim = _climatology_dataset(
+                obj, groupby=groupby, window=window, dim=dim, baseline=baseline
+            )
+
+        if isinstance(obj, VirtualCube):
+            loader = _ClimatologyAnomalyLoader(
+                obj.tile_loader(),
+                clim,
+                dim=dim,
+                standardize=standardize,
+                std_eps=std_eps,
+            )
+            return replace(obj, loader=loader, tile_cache=None)
+
+        return _apply_climatology(obj, clim, dim=dim, standardize=standardize, std_eps=std_eps)
+
+    return _op
+
+
+__all__ = ["climatological_anomaly", "climatology"]
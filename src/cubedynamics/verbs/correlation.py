@@ -0,0 +1,377 @@
+"""Correlation verbs: many references, full matrices and lags."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Mapping, Sequence
+
+import dask.array as dsa
+import numpy as np
+import pandas as pd
+import xarray as xr
+from dask.utils import parse_bytes
+
+from ..stats.correlation import (
+    iter_corr_matrix_blocks,
+    lagged_corr_cube,
+    rolling_corr_vs_references,
+)
+from .flatten import flatten_space
+
+
+def reference_correlation(
+    references: Sequence | Mapping,
+    window_days: int | None = None,
+    *,
+    min_t: int = 5,
+    dim: str = "time",
+    y_dim: str = "y",
+    x_dim: str = "x",
+):
+    """Summary
+    Correlate every pixel with K reference locations in one pass.
+
+    Grammar contract
+    Reducer verb (cube → cube with a ``reference`` dimension). Direct-call
+    and pipe-ready.
+
+    Parameters
+    references : sequence or mapping
+        ``(y, x)`` coordinate pairs (nearest pixel) and/or polygons (GeoJSON
+        mapping, Feature or shapely geometry; pixels inside are averaged). A
+        mapping labels the references by its keys.
+    window_days : int, optional
+        Rolling window length ``[t - window_days, t]``. ``None`` correlates
+        the full record.
+    min_t : int, default 5
+        Minimum number of time steps in a window.
+    dim, y_dim, x_dim : str
+        Time and spatial dimension names.
+
+    Returns
+    xr.DataArray
+        ``(reference, y, x)`` or, with a window,
+        ``(time_window_end, reference, y, x)``.
+
+    Notes
+    Each window is one blocked matrix product of centred pixels against
+    centred references (pairwise-complete when data have gaps), so adding
+    references is nearly free compared with re-running
+    :func:`~cubedynamics.stats.correlation.rolling_corr_vs_center` per
+    location.
+
+    Examples
+    --------
+    >>> from cubedynamics import pipe, verbs as v
+    >>> cube = ...  # z-scored xarray.DataArray with dims (time, y, x)
+    >>> refs = {"north": (40.2, -105.3), "south": (39.8, -105.1)}
+    >>> corr = (pipe(cube) | v.reference_correlation(refs, window_days=90)).unwrap()
+
+    See Also
+    --------
+    cubedynamics.utils.reference.reference_series
+    """
+
+    def _op(obj: xr.DataArray) -> xr.DataArray:
+        if not isinstance(obj, xr.DataArray):
+            raise TypeError(f"reference_correlation expects a DataArray, got {type(obj)!r}")
+        return rolling_corr_vs_references(
+            obj,
+            references,
+            window_days=window_days,
+            min_t=min_t,
+            time_dim=dim,
+            y_dim=y_dim,
+            x_dim=x_dim,
+        )
+
+    return _op
+
+
+def _pixel_table(
+    obj: xr.DataArray,
+    *,
+    dim: str,
+    y_dim: str,
+    x_dim: str,
+    pixel_dim: str,
+) -> tuple[xr.DataArray, pd.DataFrame]:
+    """Return ``obj`` as ``(time, pixel)`` plus a table of pixel coordinates."""
+
+    if pixel_dim not in obj.dims:
+        obj = flatten_space(time_dim=dim, y_dim=y_dim, x_dim=x_dim, new_dim=pixel_dim)(obj)
+    if set(obj.dims) != {dim, pixel_dim}:
+        raise ValueError(
+            f"correlation_matrix expects dims ({dim!r}, {y_dim!r}, {x_dim!r}) or ({dim!r}, {pixel_dim!r}); "
+            f"got {tuple(obj.dims)}"
+        )
+    index = obj.indexes.get(pixel_dim)
+    if isinstance(index, pd.MultiIndex):
+        table = index.to_frame(index=False)
+    else:
+        table = pd.DataFrame({pixel_dim: np.asarray(obj[pixel_dim].values)})
+    return obj.transpose(dim, pixel_dim), table
+
+
+def _pair_coords(table: pd.DataFrame, suffix: str, dim: str) -> dict:
+    return {f"{column}_{suffix}": (dim, table[column].to_numpy()) for column in table.columns}
+
+
+def _edge_list(blocks, threshold: float, n_pixels: int, table: pd.DataFrame) -> xr.Dataset:
+    rows, cols, values = [], [], []
+    for start, block in blocks:
+        i, j = np.nonzero(np.abs(np.nan_to_num(block)) >= threshold)
+        i, j = i + start, j + start
+        upper = j > i
+        rows.append(i[upper])
+        cols.append(j[upper])
+        values.append(block[i[upper] - start, j[upper] - start].astype(np.float32))
+    row = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    col = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+    corr = np.concatenate(values) if values else np.empty(0, dtype=np.float32)
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(row, minlength=n_pixels))])
+    edges = xr.Dataset(
+        {
+            "row": ("edge", row),
+            "col": ("edge", col),
+            "correlation": ("edge", corr),
+            "indptr": ("row_ptr", indptr),
+        },
+        coords={
+            **{f"{c}_row": ("edge", table[c].to_numpy()[row]) for c in table.columns},
+            **{f"{c}_col": ("edge", table[c].to_numpy()[col]) for c in table.columns},
+        },
+    )
+    edges.attrs.update({"threshold": threshold, "n_pixels": n_pixels, "triangle": "upper"})
+    return edges
+
+
+def correlation_matrix(
+    store: str | Path | None = None,
+    *,
+    threshold: float | None = None,
+    dim: str = "time",
+    y_dim: str = "y",
+    x_dim: str = "x",
+    pixel_dim: str = "pixel",
+    memory_budget: int | str = "256MB",
+):
+    """Summary
+    Correlate every pixel with every other pixel, block by block.
+
+    Grammar contract
+    Reducer verb (cube → P×P correlation matrix or sparse edge list).
+    Direct-call and pipe-ready. Accepts ``(time, y, x)`` cubes or the
+    ``(time, pixel)`` output of :func:`flatten_space`.
+
+    Parameters
+    store : str or Path, optional
+        Destination of the dense matrix: a path ending in ``.zarr`` writes a
+        Zarr array, anything else a memory-mapped ``.npy`` file. Required
+        unless ``threshold`` is given.
+    threshold : float, optional
+        Keep only pairs with ``|r| >= threshold`` and return a sparse edge
+        list instead of the dense matrix.
+    dim, y_dim, x_dim, pixel_dim : str
+        Time, spatial and flattened pixel dimension names.
+    memory_budget : int or str, default "256MB"
+        Working memory for the centred ``(time, pixel)`` series plus one row
+        block of the matrix; rows per block shrink as ``T × P`` grows.
+
+    Returns
+    xr.DataArray or xr.Dataset
+        Dense: a ``(pixel_i, pixel_j)`` float32 DataArray backed by the
+        memory map or Zarr store (nothing is loaded until accessed), with the
+        pixel coordinates as ``y_i``/``x_i`` and ``y_j``/``x_j``. Sparse: a
+        Dataset of upper-triangle edges (``row``, ``col``, ``correlation``
+        along ``edge``, sorted by row) plus the CSR ``indptr``.
+
+    Notes
+    The time series are held in memory as a ``(time, pixel)`` array; the
+    ``P × P`` matrix never is. Rows are computed in blocks with one matrix
+    product per block (pairwise-complete when data have gaps) and written
+    out before the next block starts; with ``threshold`` only the upper
+    triangle is computed. A 200 × 200 grid has 1.6e9 entries (6.4 GB as
+    float32).
+
+    Examples
+    --------
+    >>> from cubedynamics import pipe, verbs as v
+    >>> cube = ...  # z-scored xarray.DataArray with dims (time, y, x)
+    >>> edges = (pipe(cube) | v.correlation_matrix(threshold=0.8)).unwrap()
+    >>> dense = (pipe(cube) | v.correlation_matrix("corr.zarr")).unwrap()
+
+    See Also
+    --------
+    cubedynamics.verbs.flatten.flatten_space, cubedynamics.stats.correlation.corr_matrix
+    """
+
+    if store is None and threshold is None:
+        raise ValueError("Dense correlation matrices are written out of core; pass 'store' or 'threshold'")
+
+    def _op(obj: xr.DataArray) -> xr.DataArray | xr.Dataset:
+        if not isinstance(obj, xr.DataArray):
+            raise TypeError(f"correlation_matrix expects a DataArray, got {type(obj)!r}")
+        flat, table = _pixel_table(obj, dim=dim, y_dim=y_dim, x_dim=x_dim, pixel_dim=pixel_dim)
+        values = np.asarray(flat.values, dtype=np.float64)
+        n_steps, n_pixels = values.shape
+        # The series are centred once (about four float64 (T × P) arrays when
+        # gapped); each block row then needs about eight float64 P-long
+        # temporaries plus its own T-long column slices.
+        shared = 4 * n_steps * n_pixels * 8
+        per_row = (8 * n_pixels + 4 * n_steps) * 8
+        budget = parse_bytes(memory_budget) - shared
+        block_rows = int(max(1, min(n_pixels, budget // per_row)))
+        blocks = iter_corr_matrix_blocks(values, block_rows, upper=threshold is not None)
+
+        if threshold is not None:
+            return _edge_list(blocks, float(threshold), n_pixels, table)
+
+        path = Path(store)
+        if path.suffix == ".zarr":
+            import zarr
+
+            target = zarr.open_array(
+                store=str(path),
+                mode="w",
+                shape=(n_pixels, n_pixels),
+                chunks=(block_rows, n_pixels),
+                dtype="float32",
+            )
+        else:
+            target = np.lib.format.open_memmap(
+                path, mode="w+", dtype=np.float32, shape=(n_pixels, n_pixels)
+            )
+        for start, block in blocks:
+            target[start : start + block.shape[0]] = block
+        if path.suffix == ".zarr":
+            data = dsa.from_zarr(str(path))
+        else:
+            target.flush()
+            data = np.load(path, mmap_mode="r")
+
+        out = xr.DataArray(
+            data,
+            dims=("pixel_i", "pixel_j"),
+            coords={**_pair_coords(table, "i", "pixel_i"), **_pair_coords(table, "j", "pixel_j")},
+            name="correlation",
+        )
+        out.attrs.update({"long_name": "Pearson correlation matrix", "store": str(path)})
+        return out
+
+    return _op
+
+
+def _best_lag_numpy(corr: np.ndarray, lags: np.ndarray, best: str) -> tuple[np.ndarray, np.ndarray]:
+    score = np.abs(corr) if best == "abs" else corr
+    valid = np.isfinite(corr).any(axis=-1)
+    position = np.argmax(np.where(np.isfinite(score), score, -np.inf), axis=-1)
+    best_corr = np.take_along_axis(corr, position[..., None], axis=-1)[..., 0]
+    best_lag = lags[position].astype(np.float64)
+    return np.where(valid, best_lag, np.nan), np.where(valid, best_corr, np.nan)
+
+
+def _best_lag(corr: xr.DataArray, best: str) -> tuple[xr.DataArray, xr.DataArray]:
+    return xr.apply_ufunc(
+        _best_lag_numpy,
+        corr.drop_vars("lag"),
+        input_core_dims=[["lag"]],
+        output_core_dims=[[], []],
+        dask="parallelized",
+        output_dtypes=[np.float64, corr.dtype],
+        kwargs={"lags": corr["lag"].values, "best": best},
+    )
+
+
+def lagged_correlation(
+    other: xr.DataArray,
+    max_lag: int = 90,
+    *,
+    min_lag: int = 0,
+    min_t: int = 5,
+    dim: str = "time",
+    best: str = "max",
+    memory_budget: int | str = "256MB",
+):
+    """Summary
+    Correlate the cube with a lagged driver for every lag in one pass.
+
+    Grammar contract
+    Reducer verb (cube → Dataset with a ``(lag, y, x)`` correlation cube and
+    best-lag maps). Direct-call and pipe-ready.
+
+    Parameters
+    other : xr.DataArray
+        Driver cube on the same grid, or a single time series. Positive lags
+        mean ``other`` leads the cube, e.g. precipitation leading NDVI.
+    max_lag, min_lag : int, default 90 and 0
+        Inclusive lag range in time steps; ``min_lag`` may be negative.
+    min_t : int, default 5
+        Minimum number of overlapping valid pairs for a lag.
+    dim : str, default "time"
+        Time dimension; both inputs are aligned on it and assumed regular.
+    best : {"max", "abs"}, default "max"
+        Pick the best lag by the largest correlation or the largest
+        absolute correlation.
+    memory_budget : int or str, default "256MB"
+        Working memory for the FFT buffers; pixels (per chunk for dask
+        inputs) are transformed in blocks that fit.
+
+    Returns
+    xr.Dataset
+        ``correlation`` with dims ``(lag, y, x)``, plus ``best_lag`` and
+        ``best_correlation`` with dims ``(y, x)`` (NaN where no lag has
+        enough data).
+
+    Notes
+    All lags come from FFT cross-correlations of the centred series and
+    their validity masks, so the cost is O(T log T) per pixel instead of
+    one correlation pass per lag. Each lag is an exact pairwise-complete
+    Pearson r over the overlapping steps. Dask inputs stay lazy and are
+    processed per spatial chunk.
+
+    Examples
+    --------
+    >>> from cubedynamics import pipe, verbs as v
+    >>> ndvi = ...  # xarray.DataArray with dims (time, y, x)
+    >>> precip = ...  # same grid, daily
+    >>> lagged = (pipe(ndvi) | v.lagged_correlation(precip, max_lag=90)).unwrap()
+    >>> lagged["best_lag"]
+
+    See Also
+    --------
+    cubedynamics.stats.correlation.lagged_corr_cube
+    """
+
+    if best not in ("max", "abs"):
+        raise ValueError("best must be 'max' or 'abs'")
+
+    def _op(obj: xr.DataArray) -> xr.Dataset:
+        if not isinstance(obj, xr.DataArray):
+            raise TypeError(f"lagged_correlation expects a DataArray, got {type(obj)!r}")
+        corr = lagged_corr_cube(
+            obj,
+            other,
+            max_lag=max_lag,
+            min_lag=min_lag,
+            min_t=min_t,
+            time_dim=dim,
+            memory_budget=memory_budget,
+        )
+        best_lag, best_corr = _best_lag(corr, best)
+        out = xr.Dataset(
+            {
+                "correlation": corr,
+                "best_lag": best_lag,
+                "best_correlation": best_corr,
+            }
+        )
+        out["best_lag"].attrs["long_name"] = "Lag of the strongest correlation (time steps)"
+        out["best_correlation"].attrs["long_name"] = "Correlation at best_lag"
+        out.attrs.update({"max_lag": max_lag, "min_lag": min_lag, "best": best})
+        return out
+
+    return _op
+
+
+__all__ = ["correlation_matrix", "lagged_correlation", "reference_correlation"]
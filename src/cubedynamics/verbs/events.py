@@ -0,0 +1,93 @@
+"""Event verbs: runs of consecutive threshold exceedances (heatwaves, droughts)."""
+
+from __future__ import annotations
+
+from typing import Literal
+
+import xarray as xr
+
+from ..stats.events import event_runs_dataset
+from ..stats.spatial import mask_by_threshold
+from ..streaming import VirtualCube
+
+
+def event_runs(
+    threshold: float | xr.DataArray | None = None,
+    direction: Literal[">", ">=", "<", "<="] = ">",
+    min_length: int = 3,
+    dim: str = "time",
+    *,
+    output: Literal["summary", "runs"] = "summary",
+):
+    """Summary
+    Detect events as runs of at least ``min_length`` consecutive steps.
+
+    Grammar contract
+    Reducer verb (cube → Dataset of ``(y, x)`` event maps) for
+    ``output="summary"``; transform verb (cube → same-shape Dataset) for
+    ``output="runs"``. Direct-call and pipe-ready.
+
+    Parameters
+    threshold : float or xr.DataArray, optional
+        Event threshold. A DataArray broadcasts against the cube, e.g. a
+        per-pixel 90th percentile from :func:`quantile`. When omitted the
+        input must already be a boolean mask.
+    direction : {">", ">=", "<", "<="}, default ">"
+        Comparison defining an event step (``"<"`` for droughts or cold
+        spells).
+    min_length : int, default 3
+        Shortest run that counts as an event.
+    dim : str, default "time"
+        Dimension along which runs are detected.
+    output : {"summary", "runs"}, default "summary"
+        ``"summary"`` returns ``event_count``, ``longest_run``, ``event_days``
+        and, with a threshold, ``intensity`` (mean exceedance beyond the
+        threshold over event steps). ``"runs"`` returns per-step
+        ``run_start`` and ``run_length``.
+
+    Returns
+    xr.Dataset
+        Event statistics as described for ``output``.
+
+    Notes
+    Runs are found with cumulative sums along ``dim`` instead of per-pixel
+    loops. Dask cubes keep their time chunks: each chunk only receives the
+    lengths of the runs entering and leaving it, so events crossing chunk
+    boundaries are counted once with their full length. VirtualCubes are
+    processed one spatial tile (full time range) at a time.
+
+    Examples
+    --------
+    >>> from cubedynamics import pipe, verbs as v
+    >>> cube = ...  # daily tmmx with dims (time, y, x)
+    >>> p90 = (pipe(cube) | v.quantile(0.9)).unwrap()
+    >>> heatwaves = (pipe(cube) | v.event_runs(p90, min_length=3)).unwrap()
+
+    See Also
+    --------
+    cubedynamics.stats.spatial.mask_by_threshold,
+    cubedynamics.stats.events.event_runs_dataset
+    """
+
+    def _detect(da: xr.DataArray) -> xr.Dataset:
+        if threshold is None:
+            if da.dtype != bool:
+                raise TypeError("event_runs needs a threshold unless the cube is a boolean mask")
+            return event_runs_dataset(da, min_length=min_length, dim=dim, output=output)
+        mask = mask_by_threshold(da, threshold, direction)
+        exceedance = da - threshold if direction in (">", ">=") else threshold - da
+        return event_runs_dataset(
+            mask, min_length=min_length, exceedance=exceedance, dim=dim, output=output
+        )
+
+    def _op(obj: xr.DataArray | VirtualCube) -> xr.Dataset:
+        if isinstance(obj, VirtualCube):
+            return obj.map_spatial_tiles(_detect)
+        if not isinstance(obj, xr.DataArray):
+            raise TypeError(f"event_runs expects a DataArray or VirtualCube, got {type(obj)!r}")
+        return _detect(obj)
+
+    return _op
+
+
+__all__ = ["event_runs"]
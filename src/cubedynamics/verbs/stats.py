@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 from typing import Any, Hashable, Iterable
 
 import numpy as np
 import xarray as xr
+from dask.base import tokenize
 
 from ..config import STD_EPS
 from ..streaming import VirtualCube
+from ..streaming.cache import loader_token
+from ..streaming.reducers import HistogramState, MomentState, reduce_tile_specs, tile_moments
 
 
 def _ensure_dim(obj: xr.Dataset | xr.DataArray, dim: Hashable | Iterable[Hashable]) -> None:
@@ -49,7 +53,14 @@ def _broadcast_like(
     return stat.broadcast_like(obj)
 
 
-def mean(dim: str = "time", *, keep_dim: bool = True, skipna: bool | None = True):
+def mean(
+    dim: str = "time",
+    *,
+    keep_dim: bool = True,
+    skipna: bool | None = True,
+    executor: str | None = None,
+    max_workers: int | None = None,
+):
     """Summary
     Compute the mean along a dimension while keeping cubes pipe-ready.
 
@@ -64,6 +75,12 @@ def mean(dim: str = "time", *, keep_dim: bool = True, skipna: bool | None = True
         layout when applicable.
     skipna : bool | None, default True
         Whether to ignore NaN values during reduction.
+    executor : {"thread", "process", "serial"}, optional
+        VirtualCube inputs only. Load and reduce tiles on a worker pool; each
+        worker returns a compact partial state that the caller merges. The
+        default streams tiles in the calling process.
+    max_workers : int, optional
+        Worker pool size when ``executor`` is set.
 
     Returns
     xr.Dataset | xr.DataArray | VirtualCube
@@ -72,7 +89,8 @@ def mean(dim: str = "time", *, keep_dim: bool = True, skipna: bool | None = True
     Notes
     Streaming VirtualCube inputs are processed tile-by-tile without forcing a
     full load. Dask-backed arrays remain lazy. When ``keep_dim`` is False the
-    reduced dimension is dropped.
+    reduced dimension is dropped. ``executor="process"`` requires a picklable
+    VirtualCube loader.
 
     Examples
     --------
@@ -89,12 +107,14 @@ def mean(dim: str = "time", *, keep_dim: bool = True, skipna: bool | None = True
     cubedynamics.verbs.stats.variance, cubedynamics.verbs.stats.anomaly
     """
 
+    pool = {"executor": executor, "max_workers": max_workers}
+
     def _op(obj: xr.Dataset | xr.DataArray | VirtualCube) -> xr.Dataset | xr.DataArray:
         if isinstance(obj, VirtualCube):
             if isinstance(dim, (tuple, list)) and set(dim) == {"y", "x"}:
-                return _mean_virtual_space(obj)
+                return _mean_virtual_space(obj, **pool)
             if dim == "time":
-                return _mean_virtual_time(obj, keep_dim=keep_dim)
+                return _mean_virtual_time(obj, keep_dim=keep_dim, **pool)
             raise NotImplementedError(f"Streaming mean for dim={dim} not implemented")
 
         _ensure_dim(obj, dim)
@@ -104,8 +124,22 @@ def mean(dim: str = "time", *, keep_dim: bool = True, skipna: bool | None = True
     return _op
 
 
-def variance(dim: str = "time", *, keep_dim: bool = True, skipna: bool | None = True):
-    """Return a variance reducer along ``dim`` with optional dimension retention."""
+def variance(
+    dim: str = "time",
+    *,
+    keep_dim: bool = True,
+    skipna: bool | None = True,
+    executor: str | None = None,
+    max_workers: int | None = None,
+):
+    """Return a variance reducer along ``dim`` with optional dimension retention.
+
+    ``executor`` and ``max_workers`` apply to VirtualCube inputs and behave as
+    in :func:`mean`: tiles are reduced to partial states on a worker pool and
+    merged by the caller.
+    """
+
+    pool = {"executor": executor, "max_workers": max_workers}
 
     def _variance_xarray(obj: xr.Dataset | xr.DataArray) -> xr.Dataset | xr.DataArray:
         _ensure_dim(obj, dim)
@@ -114,9 +148,9 @@ def variance(dim: str = "time", *, keep_dim: bool = True, skipna: bool | None =
 
     def _variance_virtual_cube(vc: VirtualCube):  # type: ignore[return-value]
         if isinstance(dim, (tuple, list)) and set(dim) == {"y", "x"}:
-            return _variance_virtual_space(vc)
+            return _variance_virtual_space(vc, **pool)
         if dim == "time":
-            return _variance_virtual_time(vc, keep_dim=keep_dim)
+            return _variance_virtual_time(vc, keep_dim=keep_dim, **pool)
         raise NotImplementedError(f"Streaming variance for dim={dim} not implemented")
 
     def _op(obj: xr.Dataset | xr.DataArray | VirtualCube):  # type: ignore[type-arg]
@@ -127,166 +161,481 @@ def variance(dim: str = "time", *, keep_dim: bool = True, skipna: bool | None =
     return _op
 
 
-def _variance_virtual_time(vc: VirtualCube, *, keep_dim: bool) -> xr.DataArray:
-    mean = None
-    m2 = None
-    n = None
-    y_coords = None
-    x_coords = None
+def _virtual_partials(
+    vc: VirtualCube,
+    reduce_dims: tuple[str, ...],
+    *,
+    executor: str | None,
+    max_workers: int | None,
+) -> Iterable[tuple[MomentState, dict[str, np.ndarray]]]:
+    """Yield per-tile partial states for a time or spatial streaming reduction."""
+
+    along_time = reduce_dims == ("time",)
+    if executor is None:
+        tiles = vc.iter_time_tiles() if along_time else vc.iter_spatial_tiles()
+        for tile in tiles:
+            yield tile_moments(tile, vc.dims, reduce_dims)
+        return
 
-    for cube in vc.iter_time_tiles():
-        ordered = cube.transpose(*[d for d in vc.dims if d in cube.dims])
-        data = np.asarray(ordered.data)
-        if "y" in ordered.coords:
-            y_coords = ordered.coords.get("y")
-        if "x" in ordered.coords:
-            x_coords = ordered.coords.get("x")
-
-        for idx in range(data.shape[0]):
-            x = np.asarray(data[idx, ...])
-            mask = np.isfinite(x)
-
-            if mean is None:
-                mean = np.zeros_like(x, dtype=float)
-                m2 = np.zeros_like(x, dtype=float)
-                n = np.zeros_like(x, dtype=np.int64)
-
-            n_new = n + mask.astype(np.int64)
-            delta = x - mean
-            mean = mean + np.where(mask, delta / np.maximum(n_new, 1), 0.0)
-            delta2 = x - mean
-            m2 = m2 + np.where(mask, delta * delta2, 0.0)
-            n = n_new
-
-    if mean is None or m2 is None or n is None:
-        raise ValueError("VirtualCube produced no tiles during variance computation")
-
-    var = m2 / np.maximum(n, 1)
-    var_da = xr.DataArray(var, coords={}, dims=("y", "x"), name="variance")
-    if y_coords is not None:
-        var_da = var_da.assign_coords(y=y_coords)
-    if x_coords is not None:
-        var_da = var_da.assign_coords(x=x_coords)
+    specs = vc.iter_time_specs() if along_time else vc.iter_spatial_specs()
+    yield from reduce_tile_specs(
+        vc.tile_loader(),
+        specs,
+        vc.dims,
+        reduce_dims,
+        executor=executor,
+        max_workers=max_workers,
+    )
 
-    return _expand_dim(var_da, "time", keep_dim)
 
+def _moments_virtual_time(
+    vc: VirtualCube,
+    *,
+    executor: str | None = None,
+    max_workers: int | None = None,
+) -> tuple[MomentState, Any, Any]:
+    """Reduce every time tile to a :class:`MomentState` over ``time`` and merge."""
 
-def _mean_virtual_time(vc: VirtualCube, *, keep_dim: bool) -> xr.DataArray:
-    total = None
-    count = None
+    state = None
     y_coords = None
     x_coords = None
 
-    for cube in vc.iter_time_tiles():
-        ordered = cube.transpose(*[d for d in vc.dims if d in cube.dims])
-        data = np.asarray(ordered.data)
-        if "y" in ordered.coords:
-            y_coords = ordered.coords.get("y")
-        if "x" in ordered.coords:
-            x_coords = ordered.coords.get("x")
+    for partial, kept in _virtual_partials(
+        vc, ("time",), executor=executor, max_workers=max_workers
+    ):
+        y_coords = kept.get("y", y_coords)
+        x_coords = kept.get("x", x_coords)
+        state = partial if state is None else state.merge(partial)
+
+    if state is None:
+        raise ValueError("VirtualCube produced no tiles during streaming reduction")
+    return state, y_coords, x_coords
 
-        for idx in range(data.shape[0]):
-            x = np.asarray(data[idx, ...])
-            mask = np.isfinite(x)
 
-            if total is None:
-                total = np.zeros_like(x, dtype=float)
-                count = np.zeros_like(x, dtype=np.int64)
+def _moments_virtual_space(
+    vc: VirtualCube,
+    *,
+    executor: str | None = None,
+    max_workers: int | None = None,
+) -> tuple[MomentState, np.ndarray]:
+    """Reduce every spatial tile to per-time states over ``(y, x)`` and merge."""
+
+    state = None
+    times = None
+
+    for partial, kept in _virtual_partials(
+        vc, ("y", "x"), executor=executor, max_workers=max_workers
+    ):
+        tile_times = kept["time"]
+        if state is None:
+            state, times = partial, tile_times
+            continue
+        if not np.array_equal(times, tile_times):
+            union = np.union1d(times, tile_times)
+            state = _reindex_state(state, times, union)
+            partial = _reindex_state(partial, tile_times, union)
+            times = union
+        state = state.merge(partial)
+
+    if state is None or times is None:
+        raise ValueError("VirtualCube produced no tiles during streaming reduction")
+
+    order = np.argsort(times, kind="stable")
+    return (
+        MomentState(count=state.count[order], mean=state.mean[order], m2=state.m2[order]),
+        times[order],
+    )
 
-            total = total + np.where(mask, x, 0.0)
-            count = count + mask.astype(np.int64)
 
-    if total is None or count is None:
-        raise ValueError("VirtualCube produced no tiles during mean computation")
+def _reindex_state(state: MomentState, labels: np.ndarray, target: np.ndarray) -> MomentState:
+    """Place ``state`` (indexed by ``labels``) onto ``target`` with empty fill."""
 
-    mean_vals = total / np.maximum(count, 1)
-    mean_da = xr.DataArray(mean_vals, coords={}, dims=("y", "x"), name="mean")
+    out = MomentState.empty(target.shape)
+    positions = np.searchsorted(target, labels)
+    out.count[positions] = state.count
+    out.mean[positions] = state.mean
+    out.m2[positions] = state.m2
+    return out
+
+
+def _grid_result(values: np.ndarray, name: str, y_coords: Any, x_coords: Any) -> xr.DataArray:
+    result = xr.DataArray(values, coords={}, dims=("y", "x"), name=name)
     if y_coords is not None:
-        mean_da = mean_da.assign_coords(y=y_coords)
+        result = result.assign_coords(y=y_coords)
     if x_coords is not None:
-        mean_da = mean_da.assign_coords(x=x_coords)
+        result = result.assign_coords(x=x_coords)
+    return result
 
-    return _expand_dim(mean_da, "time", keep_dim)
 
+def _variance_virtual_time(vc: VirtualCube, *, keep_dim: bool, **pool: Any) -> xr.DataArray:
+    state, y_coords, x_coords = _moments_virtual_time(vc, **pool)
+    var_da = _grid_result(state.variance(), "variance", y_coords, x_coords)
+    return _expand_dim(var_da, "time", keep_dim)
 
-def _variance_virtual_space(vc: VirtualCube) -> xr.DataArray:
-    stats: dict[Any, tuple[float, float, int]] = {}
 
-    for cube in vc.iter_spatial_tiles():
-        ordered = cube.transpose(*[d for d in vc.dims if d in cube.dims])
-        times = ordered["time"].values
-        data = np.asarray(ordered.data)
-
-        for idx, tval in enumerate(times):
-            flat = np.asarray(data[idx, ...]).ravel()
-            mask = np.isfinite(flat)
-            vals = flat[mask]
-            if vals.size == 0:
-                continue
-
-            mean, m2, n = stats.get(tval, (0.0, 0.0, 0))
-            for v in vals:
-                n_new = n + 1
-                delta = v - mean
-                mean = mean + delta / n_new
-                delta2 = v - mean
-                m2 = m2 + delta * delta2
-                n = n_new
-
-            stats[tval] = (mean, m2, n)
-
-    times_sorted = sorted(stats.keys())
-    values = []
-    for tval in times_sorted:
-        mean, m2, n = stats[tval]
-        values.append(m2 / max(n, 1))
+def _mean_virtual_time(vc: VirtualCube, *, keep_dim: bool, **pool: Any) -> xr.DataArray:
+    state, y_coords, x_coords = _moments_virtual_time(vc, **pool)
+    mean_da = _grid_result(state.finalize_mean(), "mean", y_coords, x_coords)
+    return _expand_dim(mean_da, "time", keep_dim)
+
 
+def _variance_virtual_space(vc: VirtualCube, **pool: Any) -> xr.DataArray:
+    state, times = _moments_virtual_space(vc, **pool)
     return xr.DataArray(
-        np.array(values),
-        coords={"time": times_sorted},
+        state.variance(),
+        coords={"time": times},
         dims=("time",),
         name="variance",
     )
 
 
-def _mean_virtual_space(vc: VirtualCube) -> xr.DataArray:
-    totals: dict[Any, float] = {}
-    counts: dict[Any, int] = {}
+def _mean_virtual_space(vc: VirtualCube, **pool: Any) -> xr.DataArray:
+    state, times = _moments_virtual_space(vc, **pool)
+    return xr.DataArray(
+        state.finalize_mean(),
+        coords={"time": times},
+        dims=("time",),
+        name="mean",
+    )
 
-    for cube in vc.iter_spatial_tiles():
+
+def _resolve_edges(
+    bins: int | Iterable[float],
+    value_range: tuple[float, float] | None,
+    tiles: Any,
+) -> np.ndarray:
+    """Return histogram edges, scanning ``tiles()`` for min/max if needed."""
+
+    if not isinstance(bins, (int, np.integer)):
+        edges = np.asarray(list(bins), dtype=float)
+        if edges.ndim != 1 or edges.size < 2 or np.any(np.diff(edges) <= 0):
+            raise ValueError("bins must be an int or a strictly increasing sequence of edges")
+        return edges
+    if bins < 1:
+        raise ValueError("bins must be a positive integer")
+
+    if value_range is None:
+        lo, hi = np.inf, -np.inf
+        for tile in tiles():
+            values = np.asarray(tile.data, dtype=float)
+            finite = values[np.isfinite(values)]
+            if finite.size:
+                lo, hi = min(lo, float(finite.min())), max(hi, float(finite.max()))
+        if not np.isfinite(lo):
+            raise ValueError("VirtualCube contains no finite values to histogram")
+        value_range = (lo, hi if hi > lo else lo + 1.0)
+    return np.linspace(value_range[0], value_range[1], int(bins) + 1)
+
+
+def _histogram_counts(values: np.ndarray, edges: np.ndarray, n_core: int) -> np.ndarray:
+    """Histogram the trailing ``n_core`` axes moved there by ``apply_ufunc``."""
+
+    axes = tuple(range(values.ndim - n_core, values.ndim))
+    return HistogramState.from_array(values, edges, axis=axes).counts
+
+
+def _histogram_virtual(
+    vc: VirtualCube,
+    dim: Hashable | Iterable[Hashable] | None,
+    bins: int | Iterable[float],
+    value_range: tuple[float, float] | None,
+) -> tuple[HistogramState, Any, Any]:
+    """Stream a VirtualCube into a per-pixel (``dim="time"``) or global sketch."""
+
+    if dim == "time":
+        tiles = vc.iter_time_tiles
+    elif dim is None or (isinstance(dim, (tuple, list, set)) and set(dim) == set(vc.dims)):
+        tiles = vc.iter_tiles
+    else:
+        raise NotImplementedError(f"Streaming histogram for dim={dim} not implemented")
+
+    edges = _resolve_edges(bins, value_range, tiles)
+    state = None
+    y_coords = None
+    x_coords = None
+    for cube in tiles():
         ordered = cube.transpose(*[d for d in vc.dims if d in cube.dims])
-        times = ordered["time"].values
-        data = np.asarray(ordered.data)
+        if dim == "time":
+            y_coords = ordered.coords.get("y", y_coords)
+            x_coords = ordered.coords.get("x", x_coords)
+            partial = HistogramState.from_array(np.asarray(ordered.data), edges, axis=0)
+        else:
+            partial = HistogramState.from_array(np.asarray(ordered.data), edges)
+        state = partial if state is None else state.merge(partial)
 
-        for idx, tval in enumerate(times):
-            flat = np.asarray(data[idx, ...]).ravel()
-            mask = np.isfinite(flat)
-            vals = flat[mask]
-            totals[tval] = totals.get(tval, 0.0) + float(vals.sum())
-            counts[tval] = counts.get(tval, 0) + int(mask.sum())
+    if state is None:
+        raise ValueError("VirtualCube produced no tiles during histogram computation")
+    return state, (y_coords if dim == "time" else None), (x_coords if dim == "time" else None)
 
-    times_sorted = sorted(totals.keys())
-    means = [totals[t] / max(counts.get(t, 1), 1) for t in times_sorted]
 
-    return xr.DataArray(
-        np.array(means),
-        coords={"time": times_sorted},
-        dims=("time",),
-        name="mean",
-    )
+def quantile(
+    q: float | Iterable[float],
+    dim: str | Iterable[str] | None = "time",
+    *,
+    keep_dim: bool = False,
+    bins: int | Iterable[float] = 1024,
+    value_range: tuple[float, float] | None = None,
+):
+    """Summary
+    Compute quantiles along a dimension, streaming VirtualCube inputs.
 
+    Grammar contract
+    Reducer verb (cube → cube with reduced dim). Direct-call and pipe-ready.
+
+    Parameters
+    q : float or sequence of float
+        Quantile(s) in ``[0, 1]``, e.g. ``0.9`` for heatwave thresholds.
+    dim : str, sequence of str or None, default "time"
+        Dimension(s) to reduce. VirtualCubes support ``"time"`` (per-pixel
+        quantiles) and ``None``/all dims (one global quantile).
+    keep_dim : bool, default False
+        Preserve a single reduced dimension with length 1.
+    bins : int or sequence of float, default 1024
+        VirtualCube inputs only: number of equal-width bins or explicit bin
+        edges of the fixed-edge histogram sketch.
+    value_range : tuple of float, optional
+        VirtualCube inputs only: ``(min, max)`` of the histogram edges. When
+        omitted, every tile is loaded twice: one full streaming pass finds the
+        data range before the pass that fills the histogram.
 
-def anomaly(dim: str = "time", *, keep_dim: bool = True):
+    Returns
+    xr.DataArray
+        Quantile cube with a ``quantile`` coordinate (a dimension when ``q``
+        is a sequence).
+
+    Notes
+    xarray and dask inputs use exact :meth:`xarray.DataArray.quantile`.
+    VirtualCube inputs are streamed into a mergeable fixed-edge histogram that
+    holds ``bins + 2`` int64 counts per pixel regardless of the series length:
+    about 8 KB per pixel with the default 1024 bins, i.e. roughly 6.6 GB for
+    a CONUS gridMET grid. Lower ``bins`` (or reduce a spatial subset) when the
+    whole grid must fit in memory. For quantiles inside ``value_range`` the
+    absolute error is at most one bin width, i.e. ``(max - min) / bins`` for
+    equal-width bins.
+
+    Examples
+    --------
+    >>> from cubedynamics import pipe, verbs as v
+    >>> cube = ...  # xarray.DataArray or VirtualCube with dims (time, y, x)
+    >>> p90 = (pipe(cube) | v.quantile(0.9, dim="time")).unwrap()
+
+    See Also
+    --------
+    cubedynamics.verbs.stats.histogram, cubedynamics.streaming.HistogramState
+    """
+
+    def _op(obj: xr.Dataset | xr.DataArray | VirtualCube) -> xr.Dataset | xr.DataArray:
+        if isinstance(obj, VirtualCube):
+            state, y_coords, x_coords = _histogram_virtual(obj, dim, bins, value_range)
+            values = state.quantile(q)
+            spatial = dim == "time"
+            core_dims: tuple[str, ...] = ("y", "x") if spatial else ()
+            dims = (("quantile",) if np.ndim(q) else ()) + core_dims
+            result = xr.DataArray(values, dims=dims, coords={"quantile": q}, name="quantile")
+            if spatial:
+                result = result.assign_coords(
+                    {k: v for k, v in (("y", y_coords), ("x", x_coords)) if v is not None}
+                )
+            result.attrs["quantile_max_abs_error"] = float(np.max(np.diff(state.edges)))
+            return _expand_dim(result, dim, keep_dim) if isinstance(dim, str) else result
+
+        if dim is not None:
+            _ensure_dim(obj, dim)
+        reduced = obj.quantile(q, dim=dim, skipna=True, keep_attrs=True)
+        return _expand_dim(reduced, dim, keep_dim) if isinstance(dim, str) else reduced
+
+    return _op
+
+
+def histogram(
+    bins: int | Iterable[float] = 64,
+    dim: str | Iterable[str] | None = "time",
+    *,
+    value_range: tuple[float, float] | None = None,
+):
+    """Summary
+    Count values in fixed bins along a dimension, streaming VirtualCube inputs.
+
+    Grammar contract
+    Reducer verb (cube → cube with ``dim`` replaced by ``bin``). Direct-call
+    and pipe-ready.
+
+    Parameters
+    bins : int or sequence of float, default 64
+        Number of equal-width bins or explicit, increasing bin edges.
+    dim : str, sequence of str or None, default "time"
+        Dimension(s) to collapse into the histogram. ``"time"`` gives one
+        histogram per pixel, ``None`` a single global histogram.
+    value_range : tuple of float, optional
+        ``(min, max)`` for equal-width bins. Defaults to the data range, which
+        costs an extra full pass over the data (every VirtualCube tile is
+        loaded twice).
+
+    Returns
+    xr.DataArray
+        Integer counts with a trailing ``bin`` dimension (bin centres) and
+        ``bin_left``/``bin_right`` coordinates. Values outside the edges are
+        not counted.
+
+    Notes
+    Per-pixel memory is bounded by the number of bins: ``bins + 2`` int64
+    counts, i.e. about 0.5 KB per pixel with the default 64 bins. Histograms
+    built on
+    the same edges can be summed to merge results from separate runs.
+
+    Examples
+    --------
+    >>> from cubedynamics import pipe, verbs as v
+    >>> cube = ...  # xarray.DataArray or VirtualCube with dims (time, y, x)
+    >>> counts = (pipe(cube) | v.histogram(bins=50, value_range=(250, 320))).unwrap()
+
+    See Also
+    --------
+    cubedynamics.verbs.stats.quantile
+    """
+
+    def _wrap(
+        counts: Any,
+        edges: np.ndarray,
+        lead_dims: tuple[str, ...],
+        coords: dict,
+    ) -> xr.DataArray:
+        return xr.DataArray(
+            counts,
+            dims=lead_dims + ("bin",),
+            coords={
+                **coords,
+                "bin": 0.5 * (edges[:-1] + edges[1:]),
+                "bin_left": ("bin", edges[:-1]),
+                "bin_right": ("bin", edges[1:]),
+            },
+            name="histogram",
+        )
+
+    def _op(obj: xr.DataArray | VirtualCube) -> xr.DataArray:
+        if isinstance(obj, VirtualCube):
+            state, y_coords, x_coords = _histogram_virtual(obj, dim, bins, value_range)
+            coords = {k: v for k, v in (("y", y_coords), ("x", x_coords)) if v is not None}
+            lead = ("y", "x") if dim == "time" else ()
+            return _wrap(state.counts, state.edges, lead, coords)
+
+        reduce_dims = list(obj.dims) if dim is None else ([dim] if isinstance(dim, str) else list(dim))
+        _ensure_dim(obj, reduce_dims)
+        bounds = value_range
+        if bounds is None and isinstance(bins, (int, np.integer)):
+            bounds = (float(obj.min(skipna=True)), float(obj.max(skipna=True)))
+        edges = _resolve_edges(bins, bounds, lambda: [])
+        counts = xr.apply_ufunc(
+            _histogram_counts,
+            obj,
+            input_core_dims=[reduce_dims],
+            output_core_dims=[["bin"]],
+            kwargs={"edges": edges, "n_core": len(reduce_dims)},
+            dask="parallelized",
+            output_dtypes=[np.int64],
+            dask_gufunc_kwargs={"output_sizes": {"bin": edges.size - 1}},
+        )
+        lead = tuple(str(d) for d in counts.dims if d != "bin")
+        coords = {d: counts[d] for d in lead if d in counts.coords}
+        return _wrap(counts.transpose(*lead, "bin").data, edges, lead, coords)
+
+    return _op
+
+
+class _StandardizedLoader:
+    """Tile loader computing ``(tile - mean) / scale`` against a fixed baseline.
+
+    Defined at module level so derived VirtualCubes stay picklable.
+    """
+
+    def __init__(
+        self,
+        loader: Any,
+        mean: xr.DataArray,
+        scale: xr.DataArray | None,
+        suffix: str,
+    ) -> None:
+        self.loader = loader
+        self.mean = mean
+        self.scale = scale
+        self.suffix = suffix
+
+    @property
+    def cache_token(self) -> str | None:
+        """Token of the parent loader plus the baseline, so tiles stay distinct."""
+
+        parent = loader_token(self.loader)
+        return None if parent is None else tokenize(parent, self.mean, self.scale, self.suffix)
+
+    def __call__(self, **kwargs: Any) -> xr.DataArray:
+        tile = self.loader(**kwargs)
+        out = tile - self.mean
+        if self.scale is not None:
+            out = out / self.scale
+        out = out.transpose(*tile.dims)
+        out.attrs = dict(tile.attrs)
+        if self.suffix:
+            out = out.rename(f"{tile.name or 'var'}{self.suffix}")
+        return out
+
+
+def _standardized_virtual(
+    vc: VirtualCube,
+    mean: xr.DataArray,
+    scale: xr.DataArray | None,
+    *,
+    suffix: str,
+) -> VirtualCube:
+    """Return a VirtualCube whose tiles are standardized against a baseline."""
+
+    loader = _StandardizedLoader(vc.tile_loader(), mean, scale, suffix)
+    metadata = dict(vc.coords_metadata)
+    if suffix and metadata.get("name"):
+        metadata["name"] = f"{metadata['name']}{suffix}"
+    # Raw tiles are still cached through ``vc.tile_loader()``; derived tiles
+    # are cheap to recompute and must not share cache keys with the parent.
+    return replace(vc, loader=loader, coords_metadata=metadata, tile_cache=None)
+
+
+def anomaly(
+    dim: str = "time",
+    *,
+    keep_dim: bool = True,
+    baseline: xr.Dataset | xr.DataArray | VirtualCube | None = None,
+    executor: str | None = None,
+    max_workers: int | None = None,
+):
     """Return a pipe verb that subtracts the mean over ``dim``.
 
     ``keep_dim`` is accepted for API symmetry; anomalies always preserve the
-    input shape so Lexcube visualization remains valid.
+    input shape so Lexcube visualization remains valid. ``baseline``, a cube
+    on the same grid such as a reference period, supplies the mean instead of
+    the input itself. VirtualCube inputs and baselines (``dim="time"`` only)
+    stream a per-pixel mean in one pass; a VirtualCube input returns a new
+    VirtualCube that subtracts it tile by tile. ``executor``/``max_workers``
+    parallelize that pass as in :func:`mean`.
     """
 
-    def _op(obj: xr.Dataset | xr.DataArray) -> xr.Dataset | xr.DataArray:
+    def _mean_of(source: xr.Dataset | xr.DataArray | VirtualCube) -> xr.Dataset | xr.DataArray:
+        if isinstance(source, VirtualCube):
+            if dim != "time":
+                raise NotImplementedError("Streaming anomaly is implemented for dim='time' only")
+            state, y_coords, x_coords = _moments_virtual_time(
+                source, executor=executor, max_workers=max_workers
+            )
+            return _grid_result(state.finalize_mean(), "mean", y_coords, x_coords)
+        _ensure_dim(source, dim)
+        return source.mean(dim=dim, skipna=True, keep_attrs=True)
+
+    def _op(obj: xr.Dataset | xr.DataArray | VirtualCube) -> xr.Dataset | xr.DataArray | VirtualCube:
+        reference = obj if baseline is None else baseline
+        if isinstance(obj, VirtualCube):
+            if dim != "time":
+                raise NotImplementedError("Streaming anomaly is implemented for dim='time' only")
+            return _standardized_virtual(obj, _mean_of(reference), None, suffix="")
+
         _ensure_dim(obj, dim)
-        mean_op = obj.mean(dim=dim, skipna=True, keep_attrs=True)
-        mean_op = _broadcast_like(obj, mean_op)
+        mean_op = _broadcast_like(obj, _mean_of(reference))
         return obj - mean_op
 
     return _op
@@ -298,36 +647,33 @@ def zscore(
     keep_dim: bool = True,
     std_eps: float = STD_EPS,
     skipna: bool | None = True,
+    executor: str | None = None,
+    max_workers: int | None = None,
 ):
     """Return a standardized anomaly verb (z-score) along ``dim``.
 
     ``keep_dim`` is included for API symmetry; z-scores preserve the incoming
     cube shape regardless of the flag. ``std_eps`` prevents division-by-zero for
     flat series.
+
+    VirtualCube inputs take two passes: the first streams tiles into a
+    per-pixel baseline with the mergeable moment reducer (parallelized by
+    ``executor``/``max_workers`` as in :func:`mean`); the result is a new
+    VirtualCube whose loader standardizes each tile on demand, so nothing is
+    materialized.
     """
 
-    def _op(obj: xr.Dataset | xr.DataArray | VirtualCube) -> xr.Dataset | xr.DataArray:
+    def _op(obj: xr.Dataset | xr.DataArray | VirtualCube) -> xr.Dataset | xr.DataArray | VirtualCube:
         if isinstance(obj, VirtualCube):
             if dim != "time":
                 raise NotImplementedError("Streaming z-score is implemented for dim='time' only")
-            mean_da = _mean_virtual_time(obj, keep_dim=False)
-            var_da = _variance_virtual_time(obj, keep_dim=False)
-            std_da = xr.apply_ufunc(np.sqrt, var_da)
+            state, y_coords, x_coords = _moments_virtual_time(
+                obj, executor=executor, max_workers=max_workers
+            )
+            mean_da = _grid_result(state.finalize_mean(), "mean", y_coords, x_coords)
+            std_da = _grid_result(np.sqrt(state.variance()), "std", y_coords, x_coords)
             std_safe = std_da.where(std_da > std_eps, np.nan)
-
-            tiles = []
-            for tile in obj.iter_tiles():
-                mean_broadcast = mean_da.broadcast_like(tile)
-                std_broadcast = std_safe.broadcast_like(tile)
-                z = (tile - mean_broadcast) / std_broadcast
-                name = tile.name or "var"
-                tiles.append(z.rename(f"{name}_zscore"))
-
-            combined = xr.combine_by_coords(tiles)
-            if isinstance(combined, xr.Dataset) and len(combined.data_vars) == 1:
-                only_var = next(iter(combined.data_vars))
-                return combined[only_var]
-            return combined
+            return _standardized_virtual(obj, mean_da, std_safe, suffix="_zscore")
 
         _ensure_dim(obj, dim)
         mean_op = obj.mean(dim=dim, skipna=skipna, keep_attrs=True)
@@ -396,4 +742,12 @@ def rolling_tail_dep_vs_center(
     return _op
 
 
-__all__ = ["anomaly", "mean", "rolling_tail_dep_vs_center", "variance", "zscore"]
+__all__ = [
+    "anomaly",
+    "histogram",
+    "mean",
+    "quantile",
+    "rolling_tail_dep_vs_center",
+    "variance",
+    "zscore",
+]
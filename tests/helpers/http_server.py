@@ -0,0 +1,106 @@
+"""Local HTTP server with Range support for network-free download tests."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serve files under ``root`` with ``Range``/``ETag`` support, counting traffic."""
+
+    root: Path
+    support_ranges = True
+    send_etag = True
+    fail_first = 0
+    delay = 0.0
+    served = 0
+    requests = 0
+    active = 0
+    max_active = 0
+    _lock = threading.Lock()
+
+    def do_GET(self):  # noqa: N802 - http.server API
+        cls = type(self)
+        with cls._lock:
+            cls.requests += 1
+            cls.active += 1
+            cls.max_active = max(cls.max_active, cls.active)
+            failing = cls.fail_first > 0
+            if failing:
+                cls.fail_first -= 1
+        try:
+            time.sleep(cls.delay)
+            if failing:
+                self.send_error(503)
+                return
+            self._serve()
+        finally:
+            with cls._lock:
+                cls.active -= 1
+
+    def do_HEAD(self):  # noqa: N802 - http.server API
+        path = self.root / self.path.lstrip("/")
+        if not path.is_file():
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(path.stat().st_size))
+        if self.support_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+    def _serve(self):
+        path = self.root / self.path.lstrip("/")
+        if not path.is_file():
+            self.send_error(404)
+            return
+        data = path.read_bytes()
+        etag = f'"{hashlib.sha256(data).hexdigest()[:16]}"'
+        if self.send_etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        match = re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if match and self.support_ranges:
+            start, stop = int(match.group(1)), min(int(match.group(2)), len(data) - 1)
+            body = data[start : stop + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{stop}/{len(data)}")
+        else:
+            body = data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        if self.send_etag:
+            self.send_header("ETag", etag)
+        if self.support_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        self.wfile.write(body)
+        with type(self)._lock:
+            type(self).served += len(body)
+
+    def log_message(self, *args):  # pragma: no cover - silence test output
+        pass
+
+
+class LocalServer:
+    """Context manager running :class:`RangeHandler` on a free local port."""
+
+    def __init__(self, root: Path) -> None:
+        self.handler = type("Handler", (RangeHandler,), {"root": Path(root), "_lock": threading.Lock()})
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self.handler)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self) -> "LocalServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,61 @@
+"""Small tiled cubes for exercising :class:`VirtualCube` writers and views."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from cubedynamics.streaming import VirtualCube
+
+
+def make_cube() -> xr.DataArray:
+    """Return a 6 × 4 × 3 ``(time, y, x)`` cube with a descending ``y`` axis."""
+
+    times = pd.date_range("2000-01-01", periods=6, freq="D")
+    data = np.arange(6 * 4 * 3, dtype=float).reshape(6, 4, 3)
+    return xr.DataArray(
+        data,
+        coords={"time": times, "y": np.array([3.0, 2.0, 1.0, 0.0]), "x": np.arange(3.0)},
+        dims=("time", "y", "x"),
+        name="tmmx",
+    )
+
+
+def tiled_virtual_cube(
+    cube: xr.DataArray,
+    calls: list,
+    *,
+    fail_on=None,
+    probe: bool = True,
+    coords_metadata=None,
+) -> VirtualCube:
+    """Wrap ``cube`` as 2 × 2 time/y tiles, appending ``(t0, y0)`` to ``calls`` per load.
+
+    ``fail_on`` names a tile whose load raises, ``probe=False`` drops the
+    ``coords_probe`` so layouts must come from metadata or loaded tiles.
+    """
+
+    def loader(t0=None, y0=None, **_kwargs):
+        if fail_on is not None and (t0, y0) == fail_on:
+            raise RuntimeError("simulated network failure")
+        calls.append((t0, y0))
+        return cube.isel(time=slice(t0, t0 + 3), y=slice(y0, y0 + 2))
+
+    return VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata=coords_metadata or {"name": cube.name},
+        loader=loader,
+        loader_kwargs={},
+        time_tiler=lambda _kw: [{"t0": 0}, {"t0": 3}],
+        spatial_tiler=lambda _kw: [{"y0": 0}, {"y0": 2}],
+        coords_probe=(
+            lambda t0=None, y0=None, **_kw: {
+                "time": cube.time.values[t0 : t0 + 3],
+                "y": cube.y.values[y0 : y0 + 2],
+                "x": cube.x.values,
+            }
+        )
+        if probe
+        else None,
+    )
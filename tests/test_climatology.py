@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from cubedynamics import pipe, verbs as v
+from cubedynamics.streaming import VirtualCube
+
+
+def _make_cube():
+    times = pd.date_range("2000-01-01", "2003-12-31", freq="D")
+    rng = np.random.default_rng(3)
+    seasonal = 10.0 * np.sin(2 * np.pi * times.dayofyear.values / 365.25)
+    data = seasonal[:, None, None] + rng.normal(size=(times.size, 2, 2))
+    return xr.DataArray(
+        data,
+        coords={"time": times, "y": [0.0, 1.0], "x": [0.0, 1.0]},
+        dims=("time", "y", "x"),
+        name="tmmx",
+    )
+
+
+def _virtual(cube, calls):
+    def loader(year=None, **_kwargs):
+        calls.append(year)
+        return cube.sel(time=str(year))
+
+    return VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata={},
+        loader=loader,
+        loader_kwargs={},
+        time_tiler=lambda _kw: ({"year": y} for y in range(2000, 2004)),
+        spatial_tiler=lambda _kw: [{}],
+    )
+
+
+def test_unsmoothed_climatology_matches_groupby():
+    cube = _make_cube()
+    clim = (pipe(cube) | v.climatology("dayofyear")).unwrap()
+    expected = cube.groupby("time.dayofyear").mean()
+    np.testing.assert_allclose(clim["mean"].values, expected.values)
+    np.testing.assert_allclose(
+        clim["std"].values, cube.groupby("time.dayofyear").std().values
+    )
+
+
+def test_streaming_smoothed_climatology_and_anomaly_match_dense():
+    cube = _make_cube()
+    calls = []
+    vc = _virtual(cube, calls)
+
+    clim_virtual = (pipe(vc) | v.climatology("dayofyear", window=31)).unwrap()
+    clim_dense = (pipe(cube.chunk({"time": 365})) | v.climatology("dayofyear", window=31)).unwrap()
+    xr.testing.assert_allclose(clim_virtual, clim_dense)
+    assert calls == [2000, 2001, 2002, 2003]
+
+    # Day 100 pools days 85..115 across all years.
+    window = cube.where((cube.time.dt.dayofyear >= 85) & (cube.time.dt.dayofyear <= 115), drop=True)
+    np.testing.assert_allclose(clim_virtual["mean"].sel(dayofyear=100), window.mean("time"))
+
+    anom = (pipe(vc) | v.climatological_anomaly(climatology=clim_virtual)).unwrap()
+    assert isinstance(anom, VirtualCube)
+    dense_anom = (pipe(cube) | v.climatological_anomaly(climatology=clim_dense)).unwrap()
+    xr.testing.assert_allclose(anom.materialize(), dense_anom)
+
+
+def test_climatology_rejects_even_window():
+    with pytest.raises(ValueError):
+        (pipe(_make_cube()) | v.climatology(window=30)).unwrap()
@@ -38,3 +38,44 @@ def test_rolling_corr_vs_center_on_identical_pixels(tiny_cube: xr.DataArray) ->
     assert np.all(np.isfinite(corr_cube.values))
     assert float(np.nanmin(corr_cube.values)) > 0.9
     assert "time_window_end" in corr_cube.dims
+
+
+def test_rolling_corr_vs_references_matches_per_reference_runs(tiny_cube: xr.DataArray) -> None:
+    from cubedynamics.stats.correlation import rolling_corr_vs_references
+    from cubedynamics.stats.rolling import rolling_pairwise_stat_cube
+
+    rng = np.random.default_rng(5)
+    time = np.arange("2000-01-01", "2000-02-10", dtype="datetime64[D]")
+    data = rng.normal(size=(time.size, 3, 4))
+    data[3:6, 2, 1] = np.nan
+    cube = xr.DataArray(
+        data,
+        coords={"time": time, "y": [10.0, 11.0, 12.0], "x": [0.0, 1.0, 2.0, 3.0]},
+        dims=("time", "y", "x"),
+        name="z",
+    )
+    polygon = {
+        "type": "Polygon",
+        "coordinates": [[[-0.5, 9.5], [1.5, 9.5], [1.5, 10.5], [-0.5, 10.5], [-0.5, 9.5]]],
+    }
+    refs = {"pixel": (11.1, 2.9), "box": polygon}
+
+    out = rolling_corr_vs_references(cube, refs, window_days=8, min_t=4)
+    assert out.dims == ("time_window_end", "reference", "y", "x")
+    assert list(out["reference"].values) == ["pixel", "box"]
+
+    expected_series = {
+        "pixel": cube.sel(y=11.0, x=3.0, drop=True),
+        "box": cube.sel(y=10.0).isel(x=[0, 1]).mean("x"),
+    }
+    for name, series in expected_series.items():
+        expected = rolling_pairwise_stat_cube(cube, series, pearson_corr_stat, window_days=8, min_t=4)
+        np.testing.assert_allclose(out.sel(reference=name).values, expected.values, atol=1e-5, equal_nan=True)
+
+    full = rolling_corr_vs_references(cube.chunk({"y": 1}), refs, window_days=None)
+    assert full.dims == ("reference", "y", "x")
+    np.testing.assert_allclose(
+        full.sel(reference="pixel").values,
+        xr.corr(cube, expected_series["pixel"], dim="time").values,
+        atol=1e-6,
+    )
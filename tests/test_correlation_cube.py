@@ -0,0 +1,116 @@
+"""Tests for the streaming correlation cube."""
+
+from __future__ import annotations
+
+import dask.array as dsa
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from cubedynamics import pipe, verbs as v
+from cubedynamics.correlation_cubes import _average_ranks, correlation_cube
+from cubedynamics.streaming import VirtualCube, make_time_tiler
+
+
+def _cubes():
+    rng = np.random.default_rng(11)
+    time = pd.date_range("2001-01-01", periods=120, freq="D")
+    coords = {"time": time, "y": np.arange(3), "x": np.arange(4)}
+    ndvi = xr.DataArray(rng.normal(size=(120, 3, 4)), dims=("time", "y", "x"), coords=coords, name="ndvi")
+    tmmx = (300.0 + 2 * ndvi + rng.normal(size=ndvi.shape)).rename("tmmx")
+    pr = (-ndvi + rng.normal(scale=2.0, size=ndvi.shape)).rename("pr")
+    ndvi[5:9, 0, 0] = np.nan
+    return ndvi, tmmx, pr
+
+
+def test_pearson_matches_xr_corr_across_streamed_chunks():
+    ndvi, tmmx, pr = _cubes()
+    targets = xr.Dataset({"tmmx": tmmx, "pr": pr}).chunk({"time": 25})
+
+    out = correlation_cube(ndvi, [targets], compute=True)
+
+    assert out.dims == ("variable", "y", "x")
+    for name in ("tmmx", "pr"):
+        expected = xr.corr(ndvi, targets[name].compute(), dim="time")
+        np.testing.assert_allclose(out.sel(variable=name).values, expected.values, atol=1e-10)
+
+
+def test_lazy_result_matches_eager_and_accepts_generators():
+    ndvi, tmmx, pr = _cubes()
+    eager = correlation_cube(ndvi, [tmmx, pr], compute=True)
+    lazy = correlation_cube(ndvi, (t.chunk({"time": 30}) for t in (tmmx, pr)))
+
+    assert lazy.chunks is not None
+    np.testing.assert_allclose(lazy.compute().values, eager.values)
+
+
+def test_spearman_matches_ranked_pearson_and_rejects_split_targets():
+    ndvi, tmmx, _ = _cubes()
+    out = correlation_cube(ndvi, [tmmx], statistic="spearman", compute=True)
+
+    mask = ndvi.notnull() & tmmx.notnull()
+    ranks_x = xr.DataArray(_average_ranks(ndvi.where(mask).values), dims=ndvi.dims, coords=ndvi.coords)
+    ranks_y = xr.DataArray(_average_ranks(tmmx.where(mask).values), dims=ndvi.dims, coords=ndvi.coords)
+    expected = xr.corr(ranks_x, ranks_y, dim="time")
+    np.testing.assert_allclose(out.values, expected.values, atol=1e-10)
+    assert out["variable"].item() == "tmmx"
+
+    with pytest.raises(ValueError):
+        halves = [tmmx.isel(time=slice(0, 60)), tmmx.isel(time=slice(60, None))]
+        correlation_cube(ndvi, halves, statistic="spearman", compute=True)
+
+
+def test_average_ranks_ties_and_nans():
+    ranks = _average_ranks(np.array([3.0, 1.0, np.nan, 3.0, 2.0]))
+    np.testing.assert_array_equal(ranks, [3.5, 1.0, np.nan, 3.5, 2.0])
+
+
+def test_virtual_cube_targets_stream_by_tile_and_verb_wrapper():
+    ndvi, tmmx, _ = _cubes()
+
+    def loader(start=None, end=None, **_):
+        return tmmx.sel(time=slice(start, end))
+
+    vc = VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata={},
+        loader=loader,
+        loader_kwargs={},
+        time_tiler=make_time_tiler(tmmx.time.values[0], tmmx.time.values[-1], freq="30D", inclusive=False),
+        spatial_tiler=lambda _kw: ({} for _ in [None]),
+    )
+    streamed = correlation_cube(ndvi, [vc], compute=True)
+    expected = xr.corr(ndvi, tmmx, dim="time")
+    np.testing.assert_allclose(streamed.values, expected.values, atol=1e-10)
+
+    piped = (pipe(ndvi) | v.correlation_cube(tmmx)).unwrap()
+    np.testing.assert_allclose(piped.values, expected.values, atol=1e-10)
+
+
+class _CountingArray:
+    """Array-like that counts how often dask reads a block from it."""
+
+    def __init__(self, values):
+        self.values = values
+        self.shape, self.dtype, self.ndim = values.shape, values.dtype, values.ndim
+        self.reads = 0
+
+    def __getitem__(self, key):
+        self.reads += 1
+        return self.values[key]
+
+
+@pytest.mark.parametrize("compute", [True, False])
+def test_reference_chunks_are_read_once_for_many_targets(compute):
+    ndvi, tmmx, _ = _cubes()
+    source = _CountingArray(ndvi.values)
+    ref = ndvi.copy(data=dsa.from_array(source, chunks=(60, 3, 4)))
+    source.reads = 0  # from_array probes the source once for its meta
+    targets = [(tmmx + i).rename(f"t{i}") for i in range(12)]
+
+    out = correlation_cube(ref, targets, compute=compute).compute()
+
+    assert source.reads == 2
+    expected = xr.corr(ndvi, tmmx, dim="time")
+    np.testing.assert_allclose(out.sel(variable="t5").values, expected.values, atol=1e-10)
@@ -0,0 +1,162 @@
+"""Tests for the unified content-addressed download cache."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+
+import pytest
+
+import cubedynamics as cd
+from cubedynamics.cache import ChecksumMismatch, DownloadCache
+from tests.helpers.http_server import LocalServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    with LocalServer(remote) as srv:
+        srv.root = remote
+        yield srv
+
+
+def test_fetch_stores_by_content_and_revalidates_with_etag(server, tmp_path):
+    payload = b"gridmet" * 1000
+    (server.root / "tmmx_2001.nc").write_bytes(payload)
+    cache = DownloadCache(tmp_path / "cache")
+    url = f"{server.url}/tmmx_2001.nc"
+
+    path = cache.fetch(url)
+    assert path.read_bytes() == payload
+    assert path.name == hashlib.sha256(payload).hexdigest() + ".nc"
+    served = server.handler.served
+
+    assert cache.fetch(url) == path  # 304 Not Modified: no body transferred
+    assert server.handler.served == served
+    assert server.handler.requests == 2
+    assert cache.fetch(url, revalidate=False) == path
+    assert server.handler.requests == 2
+
+    (server.root / "tmmx_2001.nc").write_bytes(b"updated")
+    assert cache.fetch(url).read_bytes() == b"updated"
+    assert not list((tmp_path / "cache" / "tmp").iterdir())
+
+
+def test_entries_without_validators_are_served_from_cache(server, tmp_path):
+    server.handler.send_etag = False
+    (server.root / "a.zip").write_bytes(b"archive")
+    cache = DownloadCache(tmp_path / "cache")
+    path = cache.fetch(f"{server.url}/a.zip")
+    assert cache.fetch(f"{server.url}/a.zip") == path
+    assert server.handler.requests == 1
+
+
+def test_put_adds_local_files_under_the_size_cap(tmp_path):
+    cache = DownloadCache(tmp_path / "cache", max_bytes=150)
+    for name in ("a", "b"):
+        member = tmp_path / f"{name}.gpkg"
+        member.write_bytes(name.encode() * 100)
+        blob = cache.put(f"https://example.com/x.zip#{name}.gpkg", member)
+        assert not member.exists() and blob.suffix == ".gpkg"
+    assert cache.lookup("https://example.com/x.zip#b.gpkg") == blob
+    assert cache.lookup("https://example.com/x.zip#a.gpkg") is None
+    assert cache.info()["bytes"] == 100
+
+
+def test_identical_content_is_stored_once(server, tmp_path):
+    (server.root / "a.nc").write_bytes(b"same")
+    (server.root / "b.nc").write_bytes(b"same")
+    cache = DownloadCache(tmp_path / "cache")
+    assert cache.fetch(f"{server.url}/a.nc") == cache.fetch(f"{server.url}/b.nc")
+    assert cache.info()["entries"] == 2
+    assert cache.info()["files"] == 1
+
+
+def test_checksum_mismatch_is_not_cached(server, tmp_path):
+    (server.root / "a.nc").write_bytes(b"content")
+    cache = DownloadCache(tmp_path / "cache")
+    with pytest.raises(ChecksumMismatch):
+        cache.fetch(f"{server.url}/a.nc", sha256="0" * 64)
+    assert cache.info()["files"] == 0
+    good = hashlib.sha256(b"content").hexdigest()
+    assert cache.fetch(f"{server.url}/a.nc", sha256=good).read_bytes() == b"content"
+
+
+def test_size_cap_evicts_least_recently_used(server, tmp_path):
+    cache = DownloadCache(tmp_path / "cache", max_bytes=2500)
+    paths = {}
+    for i, name in enumerate("abc"):
+        (server.root / f"{name}.nc").write_bytes(name.encode() * 1000)
+        paths[name] = cache.fetch(f"{server.url}/{name}.nc")
+        os.utime(paths[name], (1000 + i, 1000 + i))
+    assert not paths["a"].exists()
+    assert paths["b"].exists() and paths["c"].exists()
+    assert cache.lookup(f"{server.url}/a.nc") is None
+
+    assert cache.prune(max_bytes=1000) == 1000
+    assert cache.info()["files"] == 1
+    assert cache.prune(older_than=0) > 0
+    assert cache.info()["bytes"] == 0
+
+
+def test_fetch_many_keeps_the_whole_batch_and_pins_protect_paths(server, tmp_path):
+    cache = DownloadCache(tmp_path / "cache", max_bytes=1500)
+    urls = []
+    for name in "abc":
+        (server.root / f"{name}.nc").write_bytes(name.encode() * 1000)
+        urls.append(f"{server.url}/{name}.nc")
+
+    paths = cache.fetch_many(urls, max_workers=1)
+    assert all(path.exists() for path in paths)
+
+    with cache.pin(paths[:1]):
+        cache.prune(max_bytes=0)
+        assert paths[0].exists() and not paths[1].exists()
+    (tmp_path / "cache" / "pins" / "999999999-stale.json").write_text(json.dumps([str(paths[0])]))
+    cache.prune(max_bytes=0)
+    assert not paths[0].exists()
+    assert not list((tmp_path / "cache" / "pins").iterdir())
+
+
+def test_verify_drops_corrupted_files(server, tmp_path):
+    (server.root / "a.nc").write_bytes(b"abc" * 100)
+    cache = DownloadCache(tmp_path / "cache")
+    url = f"{server.url}/a.nc"
+    path = cache.fetch(url)
+    path.write_bytes(b"xyz" * 100)  # same size, different content
+    assert cache.verify() == [url]
+    assert cache.lookup(url) is None
+
+
+def test_concurrent_fetches_of_one_url_download_once(server, tmp_path):
+    (server.root / "a.nc").write_bytes(b"x" * 100_000)
+    server.handler.delay = 0.2
+    cache = DownloadCache(tmp_path / "cache")
+    results = []
+
+    def _worker():
+        results.append(cache.fetch(f"{server.url}/a.nc", revalidate=False))
+
+    threads = [threading.Thread(target=_worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(results)) == 1
+    assert server.handler.requests == 1
+
+
+def test_module_level_api_uses_default_cache(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(cd.cache, "_DEFAULT", None)
+    cd.cache.configure(tmp_path / "shared", max_bytes="1MB")
+    (server.root / "a.nc").write_bytes(b"data")
+    cd.cache.fetch(f"{server.url}/a.nc")
+    info = cd.cache.info()
+    assert info["cache_dir"] == str(tmp_path / "shared")
+    assert info["files"] == 1 and info["max_bytes"] == 1_000_000
+    assert cd.cache.prune(0) == 4
+    cd.cache.clear()
+    assert cd.cache.info()["entries"] == 0
@@ -0,0 +1,81 @@
+"""Tests for run-length event detection."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from cubedynamics import pipe, verbs as v
+from cubedynamics.stats.events import event_runs_dataset, run_lengths
+
+
+def _loop_runs(series: np.ndarray) -> list[tuple[int, int]]:
+    runs, start = [], None
+    for t, flag in enumerate(list(series) + [False]):
+        if flag and start is None:
+            start = t
+        elif not flag and start is not None:
+            runs.append((start, t - start))
+            start = None
+    return runs
+
+
+def _mask_cube() -> xr.DataArray:
+    rng = np.random.default_rng(3)
+    data = rng.random((60, 3, 4)) > 0.35
+    time = pd.date_range("2020-06-01", periods=60, freq="D")
+    return xr.DataArray(data, dims=("time", "y", "x"), coords={"time": time})
+
+
+def test_run_lengths_positions_and_lengths():
+    position, length = run_lengths(np.array([1, 1, 0, 1, 1, 1, 0, 1], dtype=bool))
+    np.testing.assert_array_equal(position, [1, 2, 0, 1, 2, 3, 0, 1])
+    np.testing.assert_array_equal(length, [2, 2, 0, 3, 3, 3, 0, 1])
+
+
+def test_event_summary_matches_loop_reference():
+    mask = _mask_cube()
+    out = event_runs_dataset(mask, min_length=3)
+    for iy in range(3):
+        for ix in range(4):
+            runs = [r for r in _loop_runs(mask.values[:, iy, ix]) if r[1] >= 3]
+            assert out["event_count"].values[iy, ix] == len(runs)
+            assert out["longest_run"].values[iy, ix] == max((n for _, n in runs), default=0)
+            assert out["event_days"].values[iy, ix] == sum(n for _, n in runs)
+
+
+@pytest.mark.parametrize("time_chunk", [1, 4, 7])
+def test_runs_are_stitched_across_dask_chunks(time_chunk):
+    mask = _mask_cube()
+    expected = event_runs_dataset(mask, min_length=3, output="runs")
+    lazy = event_runs_dataset(mask.chunk({"time": time_chunk, "y": 2}), min_length=3, output="runs")
+    assert lazy["run_length"].chunks[0] == (time_chunk,) * (60 // time_chunk) + (
+        (60 % time_chunk,) if 60 % time_chunk else ()
+    )
+    xr.testing.assert_equal(lazy.compute(), expected)
+
+    summary = event_runs_dataset(mask.chunk({"time": time_chunk}), min_length=3)
+    xr.testing.assert_equal(summary.compute(), event_runs_dataset(mask, min_length=3))
+
+
+def test_event_runs_verb_threshold_and_intensity():
+    values = np.array([30, 36, 37, 38, 30, 36, 36, 31, 35.5, 36, 40, 41], dtype=float)
+    cube = xr.DataArray(values[:, None, None], dims=("time", "y", "x"))
+    out = (pipe(cube) | v.event_runs(35.0, min_length=3)).unwrap()
+
+    assert out["event_count"].item() == 2
+    assert out["longest_run"].item() == 4
+    assert out["event_days"].item() == 7
+    expected = np.mean([1, 2, 3, 0.5, 1, 5, 6])
+    np.testing.assert_allclose(out["intensity"].item(), expected)
+
+    runs = (pipe(cube) | v.event_runs(35.0, min_length=3, output="runs")).unwrap()
+    assert runs["run_start"].values[:, 0, 0].nonzero()[0].tolist() == [1, 8]
+
+
+def test_event_runs_requires_mask_without_threshold():
+    cube = xr.DataArray(np.ones((5, 1, 1)), dims=("time", "y", "x"))
+    with pytest.raises(TypeError):
+        v.event_runs()(cube)
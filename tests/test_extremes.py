@@ -0,0 +1,111 @@
+"""Tests for vectorized GEV fitting and the return_levels verb."""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from cubedynamics import pipe, verbs as v
+from cubedynamics.stats.extremes import _gamma, gev_fit_lmoments, gev_return_levels
+from cubedynamics.streaming import VirtualCube
+
+
+def _gev_sample(size, loc=30.0, scale=2.0, shape=-0.1, seed=0):
+    u = np.random.default_rng(seed).random(size)
+    return loc + scale / shape * (1.0 - (-np.log(u)) ** shape)
+
+
+def test_gamma_matches_math_gamma():
+    x = np.array([0.2, 0.7, 1.0, 1.9, 4.5])
+    np.testing.assert_allclose(_gamma(x), [math.gamma(val) for val in x], rtol=1e-12)
+
+
+def test_lmoment_fit_recovers_parameters_for_all_series():
+    sample = _gev_sample((3, 4000))
+    sample[1, :100] = np.nan
+    loc, scale, shape = gev_fit_lmoments(sample)
+    np.testing.assert_allclose(loc, 30.0, atol=0.15)
+    np.testing.assert_allclose(scale, 2.0, atol=0.1)
+    np.testing.assert_allclose(shape, -0.1, atol=0.03)
+
+    level = gev_return_levels(30.0, 2.0, -0.1, [100])
+    expected = 30.0 + 2.0 / -0.1 * (1.0 - (-np.log(0.99)) ** -0.1)
+    np.testing.assert_allclose(level, [expected])
+    gumbel = gev_return_levels(30.0, 2.0, 0.0, [100])
+    np.testing.assert_allclose(gumbel, [30.0 - 2.0 * np.log(-np.log(0.99))])
+
+
+def _annual_cube():
+    time = pd.date_range("1951-01-01", "2010-12-31", freq="D")
+    maxima = _gev_sample((60, 2, 3), seed=1)
+    data = np.full((time.size, 2, 3), 20.0)
+    for i, year in enumerate(range(1951, 2011)):
+        data[np.searchsorted(time, pd.Timestamp(f"{year}-07-01"))] = maxima[i]
+    cube = xr.DataArray(
+        data,
+        dims=("time", "y", "x"),
+        coords={"time": time, "y": [40.0, 39.0], "x": [-106.0, -105.0, -104.0]},
+        name="tmmx",
+    )
+    return cube, maxima
+
+
+def test_return_levels_verb_uses_annual_maxima_and_dask():
+    cube, maxima = _annual_cube()
+    out = (pipe(cube) | v.return_levels([10, 50, 100])).unwrap()
+    assert out["return_level"].dims == ("return_period", "y", "x")
+    assert out.attrs["n_blocks"] == 60
+
+    expected = gev_return_levels(*gev_fit_lmoments(np.moveaxis(maxima, 0, -1)), [10, 50, 100])
+    np.testing.assert_allclose(out["return_level"].values, np.moveaxis(expected, -1, 0))
+    assert np.all(np.diff(out["return_level"].values, axis=0) > 0)
+
+    lazy = (pipe(cube.chunk({"x": 1})) | v.return_levels([10, 50, 100])).unwrap()
+    xr.testing.assert_allclose(lazy.compute(), out)
+
+
+def test_bootstrap_interval_brackets_estimate():
+    cube, _ = _annual_cube()
+    out = v.return_levels([10, 100], n_bootstrap=200, ci=0.9)(cube)
+    assert np.all(out["return_level_lower"] < out["return_level"])
+    assert np.all(out["return_level"] < out["return_level_upper"])
+
+
+def test_bootstrap_interval_does_not_depend_on_chunks_or_tiles():
+    cube, _ = _annual_cube()
+    boot = v.return_levels([10, 100], n_bootstrap=50)
+    whole = boot(cube)
+
+    lazy = boot(cube.chunk({"x": 1})).compute()
+    xr.testing.assert_allclose(lazy, whole)
+    # Pixels with identical series share the same resamples wherever they sit.
+    twin = cube.copy(data=np.broadcast_to(cube.isel(y=[0], x=[0]).values, cube.shape).copy())
+    bounds = boot(twin)["return_level_upper"].values
+    np.testing.assert_allclose(bounds, bounds[:, :1, :1] * np.ones_like(bounds))
+
+
+def test_return_levels_on_virtual_cube_matches_in_memory():
+    cube, _ = _annual_cube()
+
+    vc = VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata={},
+        loader=lambda x=None, **_: cube if x is None else cube.sel(x=[x]),
+        loader_kwargs={},
+        time_tiler=lambda _kw: iter([{}]),
+        spatial_tiler=lambda _kw: ({"x": x} for x in cube.x.values),
+    )
+    streamed = (pipe(vc) | v.return_levels()).unwrap()
+    xr.testing.assert_allclose(streamed, v.return_levels()(cube))
+
+    boot = v.return_levels(n_bootstrap=50)
+    xr.testing.assert_allclose((pipe(vc) | boot).unwrap(), boot(cube))
+
+
+def test_return_levels_rejects_invalid_periods():
+    with pytest.raises(ValueError):
+        gev_return_levels(0.0, 1.0, 0.1, [1.0])
@@ -0,0 +1,63 @@
+"""Tests for pooled, concurrent downloads."""
+
+from __future__ import annotations
+
+import pytest
+import requests
+
+from cubedynamics.streaming import gridmet as gridmet_mod
+from cubedynamics.cache import DownloadCache
+from cubedynamics.streaming.fetch import make_session
+from tests.helpers.http_server import LocalServer
+
+
+@pytest.fixture
+def server(tmp_path):
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    with LocalServer(remote) as srv:
+        srv.root = remote
+        yield srv
+
+
+def test_session_retries_transient_errors(server, tmp_path):
+    (server.root / "a.nc").write_bytes(b"data")
+    server.handler.fail_first = 2
+    session = make_session(retries=3, backoff_factor=0.0)
+    path = DownloadCache(tmp_path / "cache").fetch(f"{server.url}/a.nc", session=session)
+    assert path.read_bytes() == b"data"
+    assert server.handler.requests == 3
+
+
+def test_failed_download_leaves_no_partial_file(server, tmp_path):
+    cache = DownloadCache(tmp_path / "cache")
+    with pytest.raises(requests.HTTPError):
+        cache.fetch(f"{server.url}/missing.nc", session=make_session(retries=0))
+    assert list((tmp_path / "cache" / "tmp").iterdir()) == []
+    assert cache.info()["files"] == 0
+
+
+def test_fetch_many_runs_concurrently_and_keeps_order(server, tmp_path):
+    server.handler.delay = 0.2
+    urls = []
+    for i in range(6):
+        (server.root / f"f{i}.nc").write_bytes(str(i).encode())
+        urls.append(f"{server.url}/f{i}.nc")
+
+    paths = DownloadCache(tmp_path / "cache").fetch_many(urls, max_workers=3)
+    assert [p.read_bytes() for p in paths] == [str(i).encode() for i in range(6)]
+    assert server.handler.max_active > 1
+
+
+def test_download_gridmet_files_covers_variables_and_years(server, tmp_path, monkeypatch):
+    for name in ("tmmx", "pr"):
+        for year in (2001, 2002):
+            (server.root / f"{name}_{year}.nc").write_bytes(f"{name}{year}".encode())
+    monkeypatch.setattr(gridmet_mod, "GRIDMET_BASE_URL", server.url)
+
+    files = gridmet_mod.download_gridmet_files(
+        ["tmmx", "pr"], [2001, 2002], tmp_path / "cache", show_progress=False
+    )
+    assert sorted(files) == [("pr", 2001), ("pr", 2002), ("tmmx", 2001), ("tmmx", 2002)]
+    assert files[("pr", 2002)].read_bytes() == b"pr2002"
+    assert files[("pr", 2002)].suffix == ".nc"
@@ -65,6 +65,31 @@ def test_load_fired_downloads_and_reads(monkeypatch, tmp_path):
     assert loaded.equals(gdf.to_crs("EPSG:4326"))
 
 
+def test_load_fired_defaults_to_the_download_cache(monkeypatch, tmp_path):
+    from cubedynamics import cache as download_cache
+
+    cache = download_cache.DownloadCache(tmp_path / "downloads")
+    monkeypatch.setattr(download_cache, "_DEFAULT", cache)
+    monkeypatch.setattr(fire_time_hull.Path, "home", lambda: tmp_path / "home")
+    downloads = []
+
+    def fake_download(**kwargs):
+        downloads.append(kwargs)
+        kwargs["out_path"].write_text("stub")
+
+    monkeypatch.setattr(fire_time_hull, "_download_and_extract_fired_to_cache", fake_download)
+    monkeypatch.setattr(gpd, "read_file", lambda path: gpd.GeoDataFrame(geometry=[Point(0, 0)], crs="EPSG:4326"))
+
+    with pytest.raises(FileNotFoundError, match="download=True"):
+        fire_time_hull.load_fired_conus_ak(which="daily")
+    fire_time_hull.load_fired_conus_ak(which="daily", download=True)
+    fire_time_hull.load_fired_conus_ak(which="daily")
+    assert len(downloads) == 1
+    info = cache.info()
+    assert info["entries"] == 1 and info["bytes"] == len("stub")
+    assert not (tmp_path / "downloads" / "fired").exists()
+
+
 def test_download_tolerates_landing_page_403(monkeypatch, tmp_path):
     which = "daily"
     prefer = "gpkg"
@@ -92,6 +117,9 @@ def test_download_tolerates_landing_page_403(monkeypatch, tmp_path):
             if self.status_code >= 400:
                 raise requests.HTTPError(f"HTTP {self.status_code}")
 
+        def close(self):
+            pass
+
     class FakeSession:
         def __init__(self):
             self.calls = calls
@@ -107,6 +135,9 @@ def test_download_tolerates_landing_page_403(monkeypatch, tmp_path):
             )
 
     monkeypatch.setattr(fire_time_hull.requests, "Session", FakeSession)
+    monkeypatch.setattr(
+        fire_time_hull.download_cache, "_DEFAULT", fire_time_hull.download_cache.DownloadCache(tmp_path / "downloads")
+    )
 
     out_path = tmp_path / "cache" / primary_name
     with pytest.warns(UserWarning, match="FIRED landing page returned HTTP 403"):
@@ -127,3 +158,17 @@ def test_download_tolerates_landing_page_403(monkeypatch, tmp_path):
         assert "User-Agent" in call["headers"]
     assert out_path.exists()
     assert out_path.read_text() == "payload"
+
+
+def test_gridmet_files_of_the_old_flat_layout_are_imported(tmp_path):
+    cache_dir = tmp_path / "gridmet"
+    cache_dir.mkdir()
+    (cache_dir / "tmmx_2001.nc").write_bytes(b"legacy gridmet")
+    urls = fire_time_hull._gridmet_urls_for_var_years("tmmx", [2001])
+
+    cache = fire_time_hull._gridmet_cache(urls, cache_dir)
+
+    path = cache.lookup(urls[0])
+    assert path is not None and path.read_bytes() == b"legacy gridmet"
+    assert not (cache_dir / "tmmx_2001.nc").exists()
+    assert cache.fetch_many(urls) == [path]  # served without any request
@@ -0,0 +1,119 @@
+"""Ingesting yearly gridMET files into time-series friendly Zarr archives."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+pytest.importorskip("zarr")
+
+from cubedynamics.data import gridmet as gridmet_loader
+from cubedynamics.streaming import archive
+from cubedynamics.streaming import gridmet as gridmet_mod
+from tests.helpers.http_server import LocalServer
+
+LAT = np.linspace(41.0, 39.0, 48)
+LON = np.linspace(-106.0, -104.0, 48)
+
+
+def _year(year: int, name: str = "air_temperature") -> xr.Dataset:
+    time = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+    data = np.random.default_rng(year).random((time.size, LAT.size, LON.size)).astype("float32")
+    return xr.Dataset({name: (("day", "lat", "lon"), data)}, coords={"day": time, "lat": LAT, "lon": LON})
+
+
+@pytest.fixture
+def gridmet_server(tmp_path, monkeypatch):
+    pytest.importorskip("h5netcdf")
+    remote = tmp_path / "remote"
+    remote.mkdir()
+    for year in (2001, 2002, 2003):
+        _year(year).to_netcdf(remote / f"tmmx_{year}.nc", engine="h5netcdf")
+    with LocalServer(remote) as server:
+        monkeypatch.setattr(gridmet_mod, "GRIDMET_BASE_URL", server.url)
+        monkeypatch.setattr(gridmet_mod, "_STREAM_ENGINE", "h5netcdf")
+        yield server
+
+
+def test_ingest_rechunks_and_appends_years(gridmet_server, tmp_path):
+    root = tmp_path / "archive"
+    kwargs = dict(cache_dir=tmp_path / "cache", chunks={"lat": 16, "lon": 16}, show_progress=False)
+    stores = archive.ingest_gridmet_archive("tmmx", [2001, 2002], root, **kwargs)
+    store = stores["tmmx"]
+    assert store == archive.gridmet_archive_path("tmmx", root)
+    assert archive.archive_years(store) == [2001, 2002]
+
+    requests = gridmet_server.handler.requests
+    archive.ingest_gridmet_archive("tmmx", [2001, 2002, 2003], root, **kwargs)
+    assert archive.archive_years(store) == [2001, 2002, 2003]
+    assert gridmet_server.handler.requests == requests + 1  # only 2003 fetched
+
+    ds = xr.open_zarr(store, consolidated=False)
+    assert ds["tmmx"].encoding["preferred_chunks"] == {"time": 366, "lat": 16, "lon": 16}
+    expected = xr.concat([_year(y)["air_temperature"] for y in (2001, 2002, 2003)], dim="day")
+    np.testing.assert_array_equal(ds["tmmx"].values, expected.values)
+    assert pd.Index(ds["time"].values).equals(pd.Index(expected["day"].values))
+
+
+def test_append_rejects_earlier_periods_and_other_grids(tmp_path):
+    store = tmp_path / "tmmx.zarr"
+    slab = _year(2002)["air_temperature"].rename(day="time").rename("tmmx")
+    archive.append_to_archive(store, slab)
+    with pytest.raises(ValueError, match="already ends"):
+        archive.append_to_archive(store, _year(2001)["air_temperature"].rename(day="time").rename("tmmx"))
+    shifted = _year(2003)["air_temperature"].rename(day="time").rename("tmmx")
+    shifted = shifted.assign_coords(lat=shifted["lat"] + 0.5)
+    with pytest.raises(ValueError, match="grid"):
+        archive.append_to_archive(store, shifted)
+
+
+def test_open_archive_requires_full_year_coverage(tmp_path):
+    root = tmp_path / "archive"
+    slab = _year(2001)["air_temperature"].rename(day="time").rename("tmmx")
+    archive.append_to_archive(archive.gridmet_archive_path("tmmx", root), slab)
+    assert archive.open_gridmet_archive("tmmx", "2001-03-01", "2002-01-31", root) is None
+    assert archive.open_gridmet_archive("pr", "2001-03-01", "2001-03-31", root) is None
+    da = archive.open_gridmet_archive("tmmx", "2001-03-01", "2001-03-31", root)
+    assert da.sizes["time"] == 31
+
+
+def test_partial_trailing_year_is_not_coverage_and_gets_topped_up(gridmet_server, tmp_path):
+    root = tmp_path / "archive"
+    remote = tmp_path / "remote" / "tmmx_2003.nc"
+    full = _year(2003)
+    full.isel(day=slice(0, 100)).to_netcdf(remote, engine="h5netcdf")
+    kwargs = dict(cache_dir=tmp_path / "cache", show_progress=False)
+    store = archive.ingest_gridmet_archive("tmmx", [2002, 2003], root, **kwargs)["tmmx"]
+    assert archive.open_gridmet_archive("tmmx", "2003-03-01", "2003-04-10", root) is not None
+    assert archive.open_gridmet_archive("tmmx", "2003-03-01", "2003-06-30", root) is None
+
+    remote.unlink()
+    full.to_netcdf(remote, engine="h5netcdf")
+    archive.ingest_gridmet_archive("tmmx", [2002, 2003], root, **kwargs)
+    da = archive.open_gridmet_archive("tmmx", "2003-03-01", "2003-06-30", root)
+    assert da is not None and da.sizes["time"] == 122
+    ds = xr.open_zarr(store, consolidated=False)
+    assert pd.Index(ds["time"].values).is_unique and ds.sizes["time"] == 365 * 2
+    np.testing.assert_array_equal(ds["tmmx"].sel(time="2003").values, full["air_temperature"].values)
+
+
+def test_load_gridmet_cube_reads_archive_when_available(tmp_path, monkeypatch):
+    root = tmp_path / "archive"
+    slab = _year(2001)["air_temperature"].rename(day="time").rename("tmmx")
+    archive.append_to_archive(archive.gridmet_archive_path("tmmx", root), slab)
+    monkeypatch.setattr(archive, "DEFAULT_ARCHIVE_DIR", root)
+
+    def _no_streaming(*args, **kwargs):  # pragma: no cover - must not run
+        raise AssertionError("archive should be used")
+
+    monkeypatch.setattr(gridmet_loader, "_open_gridmet_streaming", _no_streaming)
+    ds = gridmet_loader.load_gridmet_cube(
+        lat=40.0, lon=-105.0, start="2001-02-01", end="2001-02-10", variable="tmmx", freq="D"
+    )
+    assert ds.attrs["source"] == "gridmet_archive"
+    assert ds.attrs["is_synthetic"] is False
+    expected = slab.sel(time=slice("2001-02-01", "2001-02-10")).sel(lat=40.0, lon=-105.0, method="nearest")
+    point = ds["tmmx"].sel(y=40.0, x=-105.0, method="nearest")
+    np.testing.assert_array_equal(point.values, expected.values)
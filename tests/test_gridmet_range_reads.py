@@ -0,0 +1,113 @@
+"""Byte-range reads of remote gridMET files against a local HTTP server."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from cubedynamics import cache as download_cache
+from cubedynamics.streaming import gridmet as gridmet_mod
+from cubedynamics.streaming.http_range import HTTPRangeFile, RangeRequestsUnsupported
+from tests.helpers.http_server import LocalServer
+
+
+@pytest.fixture
+def http_root(tmp_path):
+    with LocalServer(tmp_path) as server:
+        yield tmp_path, server.url, server.handler
+
+
+def test_range_file_reads_exact_bytes_with_block_cache(http_root):
+    root, base, handler = http_root
+    payload = np.random.default_rng(0).integers(0, 256, 100_000, dtype=np.uint8).tobytes()
+    (root / "blob.bin").write_bytes(payload)
+
+    remote = HTTPRangeFile(f"{base}/blob.bin", block_size=4096)
+    assert remote.size == len(payload)
+    remote.seek(50_000)
+    assert remote.read(10_000) == payload[50_000:60_000]
+    assert remote.bytes_fetched < 20_000
+
+    remote.seek(-100, 2)
+    assert remote.read() == payload[-100:]
+    requests_made = remote.requests_made
+    remote.seek(51_000)
+    assert remote.read(1000) == payload[51_000:52_000]
+    assert remote.requests_made == requests_made
+
+
+def test_range_file_reads_across_more_blocks_than_it_keeps(http_root):
+    root, base, handler = http_root
+    payload = bytes(range(256)) * 4
+    (root / "blob.bin").write_bytes(payload)
+
+    remote = HTTPRangeFile(f"{base}/blob.bin", block_size=16, max_blocks=2)
+    assert remote.read(32) == payload[:32]
+    remote.seek(0)
+    assert remote.read(48) == payload[:48]
+    remote.seek(100)
+    assert remote.read(200) == payload[100:300]
+    assert len(remote._blocks) == 2
+
+
+def test_range_file_rejects_servers_without_range_support(http_root):
+    root, base, handler = http_root
+    (root / "blob.bin").write_bytes(b"x" * 1000)
+    handler.support_ranges = False
+    with pytest.raises(RangeRequestsUnsupported):
+        HTTPRangeFile(f"{base}/blob.bin")
+
+
+def _write_year(root: Path) -> xr.Dataset:
+    time = pd.date_range("2001-01-01", periods=60, freq="D")
+    lat = np.linspace(49.0, 25.0, 240)
+    lon = np.linspace(-124.0, -67.0, 240)
+    data = np.random.default_rng(1).random((time.size, lat.size, lon.size)).astype("float32")
+    ds = xr.Dataset(
+        {"air_temperature": (("day", "lat", "lon"), data)},
+        coords={"day": time, "lat": lat, "lon": lon},
+    )
+    encoding = {"air_temperature": {"chunksizes": (30, 24, 24)}}
+    ds.to_netcdf(root / "tmmx_2001.nc", engine="h5netcdf", encoding=encoding)
+    return ds
+
+
+def test_stream_gridmet_reads_only_aoi_chunks(http_root, monkeypatch):
+    pytest.importorskip("h5py")
+    root, base, handler = http_root
+    full = _write_year(root)
+    monkeypatch.setattr(gridmet_mod, "GRIDMET_BASE_URL", base)
+    monkeypatch.setattr(gridmet_mod, "_STREAM_ENGINE", "h5netcdf")
+    monkeypatch.setattr(gridmet_mod, "_RANGE_READS", True)
+
+    aoi = {"type": "Polygon", "coordinates": [[[-105.3, 40.0], [-105.0, 40.0], [-105.0, 40.3], [-105.3, 40.0]]]}
+    cube = gridmet_mod.stream_gridmet_to_cube(
+        aoi, "tmmx", "2001-01-05", "2001-01-20", chunks={"time": 30}, show_progress=False
+    ).compute()
+
+    expected = full["air_temperature"].rename(day="time").sel(
+        time=slice("2001-01-05", "2001-01-20"), lat=slice(40.3, 40.0), lon=slice(-105.3, -105.0)
+    )
+    np.testing.assert_array_equal(cube.values, expected.values)
+    file_size = (root / "tmmx_2001.nc").stat().st_size
+    assert handler.served < file_size / 5
+
+
+def test_stream_gridmet_falls_back_to_full_download(http_root, monkeypatch):
+    pytest.importorskip("h5py")
+    root, base, handler = http_root
+    _write_year(root)
+    handler.support_ranges = False
+    monkeypatch.setattr(gridmet_mod, "GRIDMET_BASE_URL", base)
+    monkeypatch.setattr(download_cache, "_DEFAULT", download_cache.DownloadCache(root / "cache"))
+    monkeypatch.setattr(gridmet_mod, "_STREAM_ENGINE", "h5netcdf")
+    monkeypatch.setattr(gridmet_mod, "_RANGE_READS", True)
+
+    ds = gridmet_mod._open_gridmet_year("tmmx", 2001)
+    assert ds["tmmx"].sizes == {"time": 60, "lat": 240, "lon": 240}
+    assert handler.served >= (root / "tmmx_2001.nc").stat().st_size
+    assert download_cache.info()["files"] == 1
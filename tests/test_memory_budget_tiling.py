@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from cubedynamics import variables
+from cubedynamics.streaming import VirtualCube
+
+
+def test_estimate_cube_size_counts_grid_cells_days_and_dtype():
+    bbox = (-106.0, 39.0, -105.0, 40.0)
+    size = variables.estimate_cube_size(None, None, bbox, None, "2020-01-01", "2020-01-10", "gridmet", freq="D")
+    # 1 degree at 1/24 degree spacing -> 24 x 24 cells, 10 days, float32.
+    assert size == 24 * 24 * 10 * 4
+
+    doubled = variables.estimate_cube_size(
+        None, None, bbox, None, "2020-01-01", "2020-01-10", "gridmet", dtype="float64", n_variables=2, freq="D"
+    )
+    assert doubled == size * 4
+
+
+def test_estimate_cube_size_uses_geojson_bounds():
+    geojson = {
+        "type": "Polygon",
+        "coordinates": [[[-106.0, 39.0], [-105.0, 39.0], [-105.0, 39.5], [-106.0, 39.0]]],
+    }
+    size = variables.estimate_cube_size(None, None, None, geojson, "2020-01-01", "2020-01-01", "prism")
+    assert size == 12 * 24 * 4
+
+
+def test_plan_tiles_splits_time_within_budget():
+    bbox = (-106.0, 39.0, -105.0, 40.0)
+    step_bytes = 24 * 24 * 4
+    plan = variables.plan_tiles(
+        bbox=bbox, start="2000-01-01", end="2020-12-31", memory_budget=step_bytes * 100, freq="D"
+    )
+    assert plan["spatial_tile"] is None
+    assert plan["time_chunk"] == "100D"
+    assert plan["tile_bytes"] <= step_bytes * 100
+
+
+def test_plan_tiles_splits_space_when_one_day_is_too_large():
+    bbox = (-125.0, 25.0, -67.0, 50.0)
+    plan = variables.plan_tiles(bbox=bbox, start="2020-01-01", end="2020-12-31", memory_budget="1MB", freq="D")
+    assert plan["time_chunk"] == "1D"
+    assert plan["spatial_tile"] is not None
+    assert plan["tile_bytes"] <= 1_000_000
+
+
+def test_temperature_auto_streams_with_planned_tiles(monkeypatch):
+    time = pd.date_range("2020-01-01", periods=10, freq="D")
+    cube = xr.DataArray(
+        np.arange(10 * 4, dtype="float32").reshape(10, 2, 2),
+        dims=("time", "y", "x"),
+        coords={"time": time, "y": [39.5, 39.0], "x": [-106.0, -105.5]},
+        name="tmmx",
+    )
+
+    def fake_loader(**kwargs):
+        return cube.sel(time=slice(kwargs["start"], kwargs["end"]))
+
+    monkeypatch.setattr(variables, "_load_temperature", fake_loader)
+    bbox = (-106.0, 39.0, -105.0, 40.0)
+    step_bytes = 24 * 24 * 4
+
+    small = variables.temperature(bbox=bbox, start=time[0], end=time[-1], memory_budget="1GB", freq="D")
+    assert isinstance(small, xr.DataArray)
+
+    large = variables.temperature(bbox=bbox, start=time[0], end=time[-1], memory_budget=step_bytes * 4, freq="D")
+    assert isinstance(large, VirtualCube)
+    specs = list(large.iter_tile_specs())
+    assert len(specs) > 1
+    for spec in specs:
+        days = (pd.Timestamp(spec["end"]) - pd.Timestamp(spec["start"])).days + 1
+        assert days * step_bytes <= step_bytes * 4
+    xr.testing.assert_equal(large.materialize(), cube)
+
+
+def test_prism_estimates_and_tiles_follow_its_monthly_default():
+    bbox = (-106.0, 39.0, -105.0, 40.0)
+    step_bytes = 24 * 24 * 4
+    size = variables.estimate_cube_size(None, None, bbox, None, "2000-01-01", "2009-12-31", "prism")
+    assert size == 120 * step_bytes
+    daily = variables.estimate_cube_size(
+        None, None, bbox, None, "2000-01-01", "2009-12-31", "prism", freq="D"
+    )
+    assert daily > 30 * size
+
+    plan = variables.plan_tiles(
+        bbox=bbox, start="2000-01-01", end="2009-12-31", source="prism", memory_budget=step_bytes * 12
+    )
+    assert plan["time_chunk"] == "12ME"
+
+
+def test_temperature_plans_tiles_from_time_res(monkeypatch):
+    monkeypatch.setattr(variables, "estimate_cube_size", lambda *args, **kwargs: 1e12)
+    bbox = (-106.0, 39.0, -105.0, 40.0)
+    step_bytes = 24 * 24 * 4
+    temp = variables.temperature(
+        bbox=bbox,
+        start="2000-01-01",
+        end="2001-12-31",
+        source="prism",
+        time_res="MS",
+        memory_budget=step_bytes * 6,
+    )
+    specs = list(temp.iter_time_specs())
+    assert len(specs) == 4
+    for spec in specs:
+        assert len(pd.date_range(spec["start"], spec["end"], freq="MS")) <= 6
+
+
+def test_plan_tiles_rejects_unknown_source():
+    with pytest.raises(ValueError):
+        variables.plan_tiles(bbox=(0, 0, 1, 1), start="2020-01-01", end="2020-01-02", source="daymet")
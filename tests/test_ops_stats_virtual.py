@@ -74,6 +74,7 @@ def _virtual_from_dense(cube: xr.DataArray) -> VirtualCube:
         lambda arr: pipe(arr) | v.mean(dim=("y", "x")),
         lambda arr: pipe(arr) | v.variance(dim=("y", "x")),
         lambda arr: pipe(arr) | v.zscore(dim="time"),
+        lambda arr: pipe(arr) | v.anomaly(dim="time"),
     ],
 )
 def test_virtual_cube_matches_dense(operation, ground_truth_cube):
@@ -82,6 +83,27 @@ def test_virtual_cube_matches_dense(operation, ground_truth_cube):
 
     dense = operation(cube).unwrap()
     streamed = operation(vc).unwrap()
+    if isinstance(streamed, VirtualCube):
+        streamed = streamed.materialize()
     xr.testing.assert_allclose(dense, streamed)
     assert isinstance(streamed, xr.DataArray)
     assert set(streamed.dims).issubset(set(cube.dims))
+
+
+def test_streaming_zscore_returns_lazy_virtual_cube(ground_truth_cube):
+    calls = []
+    vc = _virtual_from_dense(ground_truth_cube)
+    base_loader = vc.loader
+
+    def counting_loader(**kwargs):
+        calls.append(kwargs)
+        return base_loader(**kwargs)
+
+    vc.loader = counting_loader
+    z = (pipe(vc) | v.zscore(dim="time")).unwrap()
+    assert isinstance(z, VirtualCube)
+    baseline_calls = len(calls)
+
+    tiles = list(z.iter_tiles())
+    assert len(calls) == baseline_calls + len(tiles)
+    assert all(tile.name == "var_zscore" for tile in tiles)
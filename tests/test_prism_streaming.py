@@ -0,0 +1,214 @@
+"""Windowed PRISM reads from locally generated zip archives."""
+
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+rasterio = pytest.importorskip("rasterio")
+from rasterio.transform import from_origin
+
+from cubedynamics import prism_streaming
+from cubedynamics.data import prism as prism_loader
+from tests.conftest import assert_is_lazy_xarray
+from tests.helpers.http_server import LocalServer
+
+RES = 1 / 24
+TRANSFORM = from_origin(-110.0, 45.0, RES, RES)
+SHAPE = (120, 240)
+
+
+def _grid(seed: int, shape: tuple[int, int] = SHAPE) -> np.ndarray:
+    data = np.random.default_rng(seed).random(shape).astype("float32")
+    data[0, :] = -9999.0
+    return data
+
+
+def _write_archive(folder: Path, stem: str, data: np.ndarray, fmt: str = "bil") -> Path:
+    """Write a PRISM-style zip holding one raster plus metadata files."""
+
+    staging = folder / f"{stem}_staging"
+    staging.mkdir(parents=True)
+    if fmt == "bil":
+        raster = staging / f"{stem}_bil.bil"
+        profile = dict(driver="EHdr")
+    else:
+        raster = staging / f"{stem}.tif"
+        profile = dict(driver="GTiff", tiled=True, blockxsize=32, blockysize=32)
+    with rasterio.open(
+        raster, "w", height=data.shape[0], width=data.shape[1], count=1, dtype="float32",
+        crs="EPSG:4269", transform=TRANSFORM, nodata=-9999.0, **profile,
+    ) as dst:
+        dst.write(data, 1)
+    archive = folder / f"{raster.stem}.zip"
+    compression = zipfile.ZIP_DEFLATED if fmt == "bil" else zipfile.ZIP_STORED
+    with zipfile.ZipFile(archive, "w", compression=compression) as zf:
+        for path in sorted(staging.iterdir()):
+            zf.write(path, path.name)
+        zf.writestr(f"{stem}.info.txt", "PRISM fixture")
+    return archive
+
+
+def _daily_archives(folder: Path, variable: str = "ppt", days: int = 3, fmt: str = "bil", shape=SHAPE):
+    archives, grids = [], []
+    for i, day in enumerate(pd.date_range("2020-07-01", periods=days)):
+        grid = _grid(i, shape)
+        stem = f"PRISM_{variable}_stable_4kmD2_{day:%Y%m%d}"
+        if fmt == "tif":
+            stem = f"prism_{variable}_us_25m_{day:%Y%m%d}"
+        archives.append(_write_archive(folder, stem, grid, fmt))
+        grids.append(grid)
+    return archives, np.stack(grids)
+
+
+BBOX = [-105.3, 40.0, -105.0, 40.2]
+
+
+def _expected_window(grids: np.ndarray) -> tuple[np.ndarray, slice, slice]:
+    edges = lambda lo, hi: slice(int(np.floor(round(lo / RES, 6))), int(np.ceil(round(hi / RES, 6))))
+    rows = edges(45.0 - BBOX[3], 45.0 - BBOX[1])
+    cols = edges(BBOX[0] + 110.0, BBOX[2] + 110.0)
+    return grids[:, rows, cols], rows, cols
+
+
+def test_stream_reads_aoi_window_from_local_archives(tmp_path):
+    archives, grids = _daily_archives(tmp_path)
+    ds = prism_streaming.stream_prism_to_cube([str(a) for a in archives[::-1]], bbox=BBOX)
+    assert_is_lazy_xarray(ds)
+    assert list(ds.data_vars) == ["ppt"]
+    assert ds["ppt"].dims == ("time", "y", "x")
+    assert list(ds["time"].values) == list(pd.date_range("2020-07-01", periods=3).values)
+
+    expected, rows, cols = _expected_window(grids)
+    np.testing.assert_array_equal(ds["ppt"].values, expected)
+    np.testing.assert_allclose(ds["y"].values, 45.0 - (np.arange(rows.start, rows.stop) + 0.5) * RES)
+    np.testing.assert_allclose(ds["x"].values, -110.0 + (np.arange(cols.start, cols.stop) + 0.5) * RES)
+    assert rasterio.crs.CRS.from_user_input(ds["ppt"].attrs["crs"]).is_geographic
+
+
+def test_stream_maps_nodata_and_filters_time_and_variables(tmp_path):
+    ppt, _ = _daily_archives(tmp_path / "ppt")
+    tmax, grids = _daily_archives(tmp_path / "tmax", variable="tmax", fmt="tif")
+    ds = prism_streaming.stream_prism_to_cube(
+        {"precip": ppt, "tmax": tmax},
+        variables=["tmax"],
+        start="2020-07-02",
+        chunks={"time": 2},
+    )
+    assert list(ds.data_vars) == ["tmax"]
+    assert ds["tmax"].chunks[0] == (2,)
+    values = ds["tmax"].values
+    assert np.isnan(values[:, 0, :]).all()
+    np.testing.assert_array_equal(values[:, 1:, :], grids[1:, 1:, :])
+
+    with pytest.raises(ValueError, match="No PRISM archives"):
+        prism_streaming.stream_prism_to_cube(ppt, variables=["tmean"])
+
+
+def test_stream_rejects_invalid_sources(tmp_path):
+    with pytest.raises(ValueError):
+        prism_streaming.stream_prism_to_cube([])
+    with pytest.raises(ValueError, match="zip archive"):
+        prism_streaming.stream_prism_to_cube(str(tmp_path / "missing.zip"))
+    archives, _ = _daily_archives(tmp_path, days=1)
+    with pytest.raises(ValueError, match="preferred_driver"):
+        prism_streaming.stream_prism_to_cube(archives, preferred_driver="fsspec")
+    with pytest.raises(ValueError, match="Several"):
+        prism_streaming.stream_prism_to_cube(archives * 2)
+
+
+def test_remote_archives_go_through_download_cache(tmp_path):
+    remote = tmp_path / "remote"
+    archives, grids = _daily_archives(remote)
+    with LocalServer(remote) as server:
+        urls = [f"{server.url}/{a.name}" for a in archives]
+        ds = prism_streaming.stream_prism_to_cube(urls, bbox=BBOX, cache_dir=tmp_path / "cache")
+        np.testing.assert_array_equal(ds["ppt"].values, _expected_window(grids)[0])
+        requests = server.handler.requests
+        prism_streaming.stream_prism_to_cube(urls, bbox=BBOX, cache_dir=tmp_path / "cache").compute()
+        assert server.handler.requests == requests  # cached archives are not revalidated
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_cold_archives_download_when_their_step_is_read(tmp_path, ranges):
+    remote = tmp_path / "remote"
+    archives, grids = _daily_archives(remote)
+    cache = prism_streaming.download_cache.DownloadCache(tmp_path / "cache")
+    with LocalServer(remote) as server:
+        server.handler.support_ranges = ranges
+        urls = [f"{server.url}/{a.name}" for a in archives]
+        ds = prism_streaming.stream_prism_to_cube(urls, bbox=BBOX, cache_dir=cache.root)
+        # Only the archive defining the grid is downloaded up front, unless
+        # the server cannot serve the zip directories by range.
+        assert len(cache.entries()) == (1 if ranges else 3)
+        np.testing.assert_array_equal(ds["ppt"].values, _expected_window(grids)[0])
+        assert len(cache.entries()) == 3
+
+
+def test_service_urls_are_not_requested_until_read(tmp_path, monkeypatch):
+    remote = tmp_path / "remote"
+    archives, grids = _daily_archives(remote / "ppt")
+    days = pd.date_range("2020-07-01", periods=3)
+    for archive, day in zip(archives, days):
+        archive.rename(remote / "ppt" / f"{day:%Y%m%d}")
+    with LocalServer(remote) as server:
+        monkeypatch.setattr(prism_streaming, "PRISM_BASE_URL", server.url)
+        urls = prism_streaming.prism_archive_urls("ppt", days[0], days[-1])
+        ds = prism_streaming.stream_prism_to_cube(urls, bbox=BBOX, cache_dir=tmp_path / "cache")
+        assert server.handler.requests == 1
+        assert ds["time"].values.tolist() == days.values.tolist()
+        np.testing.assert_array_equal(ds["ppt"].values, _expected_window(grids)[0])
+        assert server.handler.requests == 3
+
+
+def test_vsicurl_reads_only_part_of_remote_archives(tmp_path):
+    remote = tmp_path / "remote"
+    archives, grids = _daily_archives(remote, days=2, fmt="tif", shape=(480, 960))
+    with LocalServer(remote) as server:
+        urls = [f"{server.url}/{a.name}" for a in archives]
+        ds = prism_streaming.stream_prism_to_cube(urls, bbox=BBOX, preferred_driver="vsicurl")
+        np.testing.assert_array_equal(ds["ppt"].values, _expected_window(grids)[0])
+        assert server.handler.served < sum(a.stat().st_size for a in archives) / 10
+
+
+def test_load_prism_cube_streams_daily_archives(tmp_path, monkeypatch):
+    remote = tmp_path / "remote"
+    archives, grids = _daily_archives(remote / "ppt")
+    for archive, day in zip(archives, pd.date_range("2020-07-01", periods=3)):
+        archive.rename(remote / "ppt" / f"{day:%Y%m%d}")
+    monkeypatch.setattr("cubedynamics.cache._DEFAULT", None)
+    monkeypatch.setenv("CUBEDYNAMICS_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr("cubedynamics.cache.DEFAULT_CACHE_DIR", tmp_path / "cache")
+    with LocalServer(remote) as server:
+        monkeypatch.setattr(prism_streaming, "PRISM_BASE_URL", server.url)
+        ds = prism_loader.load_prism_cube(
+            bbox=BBOX, start="2020-07-01", end="2020-07-03", variable="ppt", freq="D", show_progress=False
+        )
+        assert ds.attrs["source"] == "prism_streaming"
+        assert isinstance(ds, xr.Dataset)
+        assert ds.sizes["time"] == 3
+        expected = _expected_window(grids)[0]
+        cube = ds["ppt"].values
+        assert cube.shape[1] <= expected.shape[1] and cube.shape[2] <= expected.shape[2]
+        assert np.isin(cube, expected).all()
+
+        grid = {"west": -110.0, "north": 45.0, "resolution": RES, "width": SHAPE[1], "height": SHAPE[0]}
+        monkeypatch.setattr(prism_streaming, "PRISM_GRID", grid)
+        probe = prism_loader.prism_cube_coords(bbox=BBOX, start="2020-07-01", end="2020-07-03", freq="D")
+        for dim in ("time", "y", "x"):
+            np.testing.assert_allclose(probe[dim].astype(float), ds[dim].values.astype(float))
+
+
+def test_load_prism_cube_fails_loudly_when_streaming_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr("cubedynamics.cache._DEFAULT", prism_streaming.download_cache.DownloadCache(tmp_path / "cache"))
+    with LocalServer(tmp_path) as server:
+        monkeypatch.setattr(prism_streaming, "PRISM_BASE_URL", server.url)
+        with pytest.raises(RuntimeError, match="allow_synthetic"):
+            prism_loader.load_prism_cube(
+                bbox=BBOX, start="2020-07-01", end="2020-07-02", variable="ppt", freq="D", show_progress=False
+            )
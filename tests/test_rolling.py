@@ -57,3 +57,32 @@ def test_rolling_pairwise_stat_cube_window_growth() -> None:
     assert result.sizes[end_dim] == cube.sizes["time"] - 1
     last_vals = result.isel({end_dim: -1}).values
     assert np.allclose(last_vals, np.zeros_like(last_vals))
+
+
+def test_rolling_corr_cube_matches_pairwise_engine() -> None:
+    from cubedynamics.stats.correlation import pearson_corr_stat
+    from cubedynamics.stats.rolling import rolling_corr_cube
+
+    rng = np.random.default_rng(3)
+    time = np.arange("2000-01-01", "2000-03-01", dtype="datetime64[D]")
+    data = 280.0 + rng.normal(size=(time.size, 3, 4))
+    data[5:9, 0, 0] = np.nan
+    data[20:40, 1, 1] = 290.0
+    cube = xr.DataArray(
+        data,
+        coords={"time": time, "y": np.arange(3), "x": np.arange(4)},
+        dims=("time", "y", "x"),
+        name="temp",
+    )
+    ref = cube.isel(y=2, x=3) + rng.normal(scale=0.5, size=time.size)
+
+    expected = rolling_pairwise_stat_cube(cube, ref, pearson_corr_stat, window_days=10, min_t=4)
+    fast = rolling_corr_cube(cube, ref, window_days=10, min_t=4)
+
+    assert fast.dims == expected.dims
+    np.testing.assert_array_equal(fast["time_window_end"].values, expected["time_window_end"].values)
+    np.testing.assert_allclose(fast.values, expected.values, atol=1e-5, equal_nan=True)
+    assert np.isnan(fast.sel(y=1, x=1).isel(time_window_end=35)).item()
+
+    lazy = rolling_corr_cube(cube.chunk({"time": 10, "y": 1}), ref, window_days=10, min_t=4)
+    np.testing.assert_allclose(lazy.compute().values, fast.values, equal_nan=True)
@@ -57,3 +57,22 @@ def test_temperature_streaming_strategy_auto_switches(monkeypatch, tiny_temp_cub
     monkeypatch.setattr(variables, "estimate_cube_size", lambda *args, **kwargs: 1e12)
     large = variables.temperature(lat=40.0, lon=-105.0, start="2020-01-01", end="2020-01-02", streaming_strategy="auto")
     assert isinstance(large, VirtualCube)
+
+
+def test_temperature_probe_matches_loaded_tiles(monkeypatch):
+    monkeypatch.setattr(variables, "estimate_cube_size", lambda *args, **kwargs: 1e12)
+    temp = variables.temperature(
+        bbox=[-105.5, 39.5, -104.5, 40.5],
+        start="2020-01-01",
+        end="2020-01-20",
+        freq="D",
+        show_progress=False,
+        streaming_strategy="virtual",
+        time_chunk="10D",
+        spatial_tile=0.5,
+    )
+    assert temp.coords_probe is not None
+    for kwargs, labels in temp.tile_coords():
+        tile = temp.loader(**kwargs)
+        for dim in temp.dims:
+            np.testing.assert_array_equal(labels[dim], tile[dim].values)
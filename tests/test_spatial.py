@@ -6,8 +6,11 @@ import numpy as np
 import xarray as xr
 
 from cubedynamics.stats.spatial import (
+    gaussian_kernel,
     mask_by_threshold,
+    spatial_box_filter,
     spatial_coarsen_mean,
+    spatial_gaussian_filter,
     spatial_smooth_mean,
 )
 
@@ -38,6 +41,71 @@ def test_spatial_smooth_mean_basic() -> None:
     assert 0.0 < center_value < 1.0
 
 
+def _noisy_cube() -> xr.DataArray:
+    rng = np.random.default_rng(0)
+    data = rng.random((2, 19, 23))
+    data[0, 4, 5] = np.nan
+    data[1, 10:12, 0] = np.nan
+    return xr.DataArray(data, dims=("time", "y", "x"))
+
+
+def test_spatial_smooth_mean_matches_rolling_mean() -> None:
+    cube = _noisy_cube()
+    expected = cube.rolling(y=5, x=5, center=True).mean()
+    xr.testing.assert_allclose(spatial_smooth_mean(cube, kernel_size=5), expected)
+
+
+def test_box_and_gaussian_filters_match_direct_nan_normalized_sums() -> None:
+    cube = _noisy_cube()
+    values = cube.values
+    kernel = gaussian_kernel(1.2)
+    radius = kernel.size // 2
+    weights = np.outer(kernel, kernel)
+
+    box = spatial_box_filter(cube, size=(3, 5))
+    gauss = spatial_gaussian_filter(cube, sigma=1.2)
+    for iy in (0, 4, 9, 18):
+        for ix in (0, 5, 22):
+            window = values[:, max(iy - 1, 0) : iy + 2, max(ix - 2, 0) : ix + 3]
+            np.testing.assert_allclose(box.values[:, iy, ix], np.nanmean(window, axis=(1, 2)))
+
+            ys = slice(max(iy - radius, 0), min(iy + radius + 1, 19))
+            xs = slice(max(ix - radius, 0), min(ix + radius + 1, 23))
+            wy = slice(ys.start - iy + radius, ys.stop - iy + radius)
+            wx = slice(xs.start - ix + radius, xs.stop - ix + radius)
+            w = weights[wy, wx]
+            patch = values[:, ys, xs]
+            ok = np.isfinite(patch)
+            expected = (np.where(ok, patch, 0) * w).sum(axis=(1, 2)) / (ok * w).sum(axis=(1, 2))
+            np.testing.assert_allclose(gauss.values[:, iy, ix], expected)
+
+
+def test_spatial_filters_are_exact_across_dask_chunks() -> None:
+    cube = _noisy_cube()
+    chunked = cube.chunk({"y": 5, "x": 6})
+    for filt in (
+        lambda d: spatial_box_filter(d, size=7),
+        lambda d: spatial_gaussian_filter(d, sigma=(1.0, 1.2)),
+        lambda d: spatial_smooth_mean(d, kernel_size=3),
+    ):
+        lazy = filt(chunked)
+        assert lazy.chunks == chunked.chunks
+        xr.testing.assert_allclose(lazy.compute(), filt(cube))
+
+
+def test_spatial_filters_keep_float_dtype() -> None:
+    cube = _noisy_cube()
+    single = cube.astype(np.float32)
+    expected = spatial_smooth_mean(cube, kernel_size=3)
+    for data in (single, single.chunk({"y": 5, "x": 6})):
+        smoothed = spatial_smooth_mean(data, kernel_size=3)
+        assert smoothed.dtype == np.float32
+        computed = smoothed.compute()
+        assert computed.dtype == np.float32
+        np.testing.assert_allclose(computed.values, expected.values, rtol=1e-5, atol=1e-6)
+    assert spatial_box_filter(cube.fillna(0).astype(int), size=3).dtype == np.float64
+
+
 def test_mask_by_threshold() -> None:
     data = xr.DataArray(
         [0.0, 1.0, 2.0, 3.0],
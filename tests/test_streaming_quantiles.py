@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from cubedynamics import pipe, verbs as v
+from cubedynamics.streaming import HistogramState, VirtualCube
+
+
+def _make_cube():
+    rng = np.random.default_rng(42)
+    times = pd.date_range("2000-01-01", periods=200, freq="D")
+    data = rng.normal(loc=290.0, scale=5.0, size=(200, 2, 3))
+    data[5, 0, 0] = np.nan
+    return xr.DataArray(
+        data,
+        coords={"time": times, "y": np.arange(2), "x": np.arange(3)},
+        dims=("time", "y", "x"),
+        name="tmmx",
+    )
+
+
+def _virtual(cube):
+    def loader(t0=None, **_kwargs):
+        return cube.isel(time=slice(t0, t0 + 50))
+
+    return VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata={},
+        loader=loader,
+        loader_kwargs={},
+        time_tiler=lambda _kw: ({"t0": t0} for t0 in range(0, 200, 50)),
+        spatial_tiler=lambda _kw: [{}],
+    )
+
+
+def test_histogram_state_merge_is_additive():
+    data = np.arange(20.0).reshape(10, 2)
+    edges = np.linspace(0.0, 20.0, 5)
+    merged = HistogramState.from_array(data[:4], edges, axis=0).merge(
+        HistogramState.from_array(data[4:], edges, axis=0)
+    )
+    whole = HistogramState.from_array(data, edges, axis=0)
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    np.testing.assert_array_equal(merged.total, [10, 10])
+
+
+def test_histogram_quantile_skips_empty_leading_bins():
+    edges = np.linspace(0.0, 10.0, 11)
+    state = HistogramState.from_array(np.array([[4.2, 4.7, 6.1, 8.9]]), edges, axis=-1)
+
+    np.testing.assert_allclose(state.quantile(0.0), [4.0])
+    np.testing.assert_allclose(state.quantile(1.0), [9.0])
+    np.testing.assert_allclose(state.quantile([0.0, 0.25, 0.5]), [[4.0], [4.5], [5.0]])
+
+    below = HistogramState.from_array(np.array([-3.0, 2.5]), edges)
+    assert below.quantile(0.0) == edges[0]
+
+
+def test_streaming_quantile_within_documented_error():
+    cube = _make_cube()
+    streamed = (pipe(_virtual(cube)) | v.quantile(0.9, dim="time", bins=512)).unwrap()
+    exact = (pipe(cube) | v.quantile(0.9, dim="time")).unwrap()
+
+    assert streamed.dims == ("y", "x")
+    bound = streamed.attrs["quantile_max_abs_error"]
+    assert np.all(np.abs(streamed.values - exact.values) <= bound)
+
+
+def test_streaming_global_quantiles_and_histogram():
+    cube = _make_cube()
+    vc = _virtual(cube)
+    streamed = (pipe(vc) | v.quantile([0.1, 0.5], dim=None, value_range=(260.0, 320.0), bins=600)).unwrap()
+    exact = cube.quantile([0.1, 0.5], skipna=True)
+    np.testing.assert_allclose(streamed.values, exact.values, atol=0.1)
+
+    hist_virtual = (pipe(vc) | v.histogram(bins=30, value_range=(260.0, 320.0))).unwrap()
+    hist_dense = (pipe(cube) | v.histogram(bins=30, value_range=(260.0, 320.0))).unwrap()
+    assert hist_virtual.dims == ("y", "x", "bin")
+    np.testing.assert_array_equal(hist_virtual.values, hist_dense.values)
+    assert int(hist_dense.sum()) == int(np.isfinite(cube.values).sum())
+
+
+def test_histogram_rejects_bad_edges():
+    with pytest.raises(ValueError):
+        (pipe(_make_cube()) | v.histogram(bins=[1.0, 1.0, 2.0])).unwrap()
@@ -0,0 +1,108 @@
+import warnings
+
+import numpy as np
+import pytest
+import pandas as pd
+import xarray as xr
+
+from cubedynamics import pipe, verbs as v
+from cubedynamics.streaming import MomentState, VirtualCube, merge_states
+
+
+def test_moment_state_merge_matches_numpy_in_any_order():
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(12, 3, 4))
+    data[2, 0, 0] = np.nan
+    data[:, 1, 1] = np.nan
+
+    chunks = [data[0:5], data[5:7], data[7:12]]
+    states = [MomentState.from_array(chunk, axis=0) for chunk in chunks]
+
+    forward = merge_states(states)
+    backward = merge_states(reversed(states))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        expected_mean = np.nanmean(data, axis=0)
+        expected_var = np.nanvar(data, axis=0)
+
+    for state in (forward, backward):
+        np.testing.assert_allclose(state.finalize_mean(), expected_mean)
+        np.testing.assert_allclose(state.variance(), expected_var)
+    assert forward.count[1, 1] == 0
+
+
+def test_moment_state_empty_is_merge_identity():
+    data = np.arange(6.0).reshape(2, 3)
+    state = MomentState.from_array(data, axis=0)
+    merged = MomentState.empty(state.count.shape).merge(state)
+    np.testing.assert_allclose(merged.mean, state.mean)
+    np.testing.assert_allclose(merged.m2, state.m2)
+
+
+def test_space_variance_merges_tiles_with_different_time_coverage():
+    times = pd.date_range("2000-01-01", periods=3, freq="D")
+    cube = xr.DataArray(
+        np.arange(3 * 2 * 2, dtype=float).reshape(3, 2, 2),
+        coords={"time": times, "y": [0, 1], "x": [0, 1]},
+        dims=("time", "y", "x"),
+    )
+
+    def loader(x_index=None, **_kwargs):
+        tile = cube.isel(x=[x_index])
+        return tile if x_index == 0 else tile.isel(time=slice(1, None))
+
+    vc = VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata={},
+        loader=loader,
+        loader_kwargs={},
+        time_tiler=lambda _kw: [{}],
+        spatial_tiler=lambda _kw: [{"x_index": 0}, {"x_index": 1}],
+    )
+
+    streamed = (pipe(vc) | v.variance(dim=("y", "x"), keep_dim=False)).unwrap()
+    expected = xr.concat(
+        [cube.isel(time=[0], x=[0]), cube.isel(time=slice(1, None))], dim="time"
+    ).var(dim=("y", "x"))
+    np.testing.assert_allclose(streamed.values, expected.values)
+    np.testing.assert_array_equal(streamed.time.values, times.values)
+
+
+def _process_cube():
+    times = pd.date_range("2000-01-01", periods=6, freq="D")
+    data = np.arange(6 * 2 * 3, dtype=float).reshape(6, 2, 3) ** 1.5
+    return xr.DataArray(
+        data,
+        coords={"time": times, "y": np.arange(2), "x": np.arange(3)},
+        dims=("time", "y", "x"),
+        name="fake",
+    )
+
+
+def _process_loader(index=None, column=None, **_kwargs):
+    cube = _process_cube()
+    if index is not None:
+        cube = cube.isel(time=[index])
+    if column is not None:
+        cube = cube.isel(x=[column])
+    return cube
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_pool_executors_match_serial_reduction(executor):
+    cube = _process_cube()
+    vc = VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata={},
+        loader=_process_loader,
+        loader_kwargs={},
+        time_tiler=lambda _kw: ({"index": i} for i in range(6)),
+        spatial_tiler=lambda _kw: ({"column": i} for i in range(3)),
+    )
+
+    mean = (pipe(vc) | v.mean(dim="time", keep_dim=False, executor=executor, max_workers=2)).unwrap()
+    var = (pipe(vc) | v.variance(dim=("y", "x"), executor=executor, max_workers=2)).unwrap()
+
+    xr.testing.assert_allclose(mean, cube.mean(dim="time").rename("mean"))
+    np.testing.assert_allclose(var.values, cube.var(dim=("y", "x")).values)
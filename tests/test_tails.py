@@ -3,8 +3,9 @@
 from __future__ import annotations
 
 import numpy as np
+import xarray as xr
 
-from cubedynamics.stats.tails import _rank_1d, partial_tail_spearman
+from cubedynamics.stats.tails import _rank_1d, partial_tail_spearman, rolling_tail_dep_vs_center
 
 
 def test_rank_1d_monotone() -> None:
@@ -31,3 +32,31 @@ def test_partial_tail_spearman_noise_symmetry() -> None:
     assert abs(diff) < 0.2
     assert np.isfinite(left)
     assert np.isfinite(right)
+
+
+def test_rolling_tail_dep_vs_center_matches_per_pixel() -> None:
+    rng = np.random.default_rng(7)
+    time = np.arange("2001-01-01", "2001-03-01", dtype="datetime64[D]")
+    data = rng.standard_normal((time.size, 3, 3))
+    data[:, 0, 0] = data[:, 1, 1] + 0.3 * rng.standard_normal(time.size)
+    data[10:14, 2, 0] = np.nan
+    cube = xr.DataArray(
+        data,
+        coords={"time": time, "y": np.arange(3), "x": np.arange(3)},
+        dims=("time", "y", "x"),
+    )
+
+    bottom, top, diff = rolling_tail_dep_vs_center(cube, window_days=20, min_t=5, b=0.5)
+    assert bottom.dims == ("time_window_end", "y", "x")
+
+    ref = data[:, 1, 1]
+    for k, t_end in enumerate(bottom["time_window_end"].values):
+        window = (time >= t_end - np.timedelta64(20, "D")) & (time <= t_end)
+        for iy in range(3):
+            for ix in range(3):
+                expected = partial_tail_spearman(data[window, iy, ix], ref[window], b=0.5, min_t=5)
+                got = (bottom.values[k, iy, ix], top.values[k, iy, ix], diff.values[k, iy, ix])
+                np.testing.assert_allclose(got, expected, atol=1e-6, equal_nan=True)
+
+    lazy = rolling_tail_dep_vs_center(cube.chunk({"y": 1}), window_days=20, min_t=5, b=0.5)
+    np.testing.assert_allclose(lazy[2].compute().values, diff.values, equal_nan=True)
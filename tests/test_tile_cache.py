@@ -0,0 +1,136 @@
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+import pytest
+
+from cubedynamics import pipe, verbs as v
+from cubedynamics.cache import DownloadCache
+from cubedynamics.streaming import TileCache, VirtualCube
+from cubedynamics.streaming.cache import loader_token, tile_key
+from cubedynamics.verbs.stats import _StandardizedLoader
+
+
+def _make_cube():
+    times = pd.date_range("2000-01-01", periods=4, freq="D")
+    data = np.arange(4 * 2 * 3, dtype=float).reshape(4, 2, 3)
+    return xr.DataArray(
+        data,
+        coords={"time": times, "y": np.arange(2), "x": np.arange(3)},
+        dims=("time", "y", "x"),
+        name="fake",
+    )
+
+
+def test_tile_key_is_stable_and_order_independent():
+    a = tile_key(None, {"start": pd.Timestamp("2000-01-01"), "bbox": (1, 2, 3, 4)})
+    b = tile_key(None, {"bbox": (1, 2, 3, 4), "start": np.datetime64("2000-01-01")})
+    c = tile_key(None, {"bbox": (1, 2, 3, 5), "start": np.datetime64("2000-01-01")})
+    assert a == b
+    assert a != c
+
+
+def _slice_loader(index=None, offset=0, **_kwargs):
+    return _make_cube().isel(time=[index]) + offset
+
+
+def test_tile_key_tells_loaders_apart_and_refuses_anonymous_ones(tmp_path):
+    kwargs = {"index": 0}
+    plain = tile_key(_slice_loader, kwargs)
+    assert plain != tile_key(functools.partial(_slice_loader, offset=1), kwargs)
+
+    baseline = _make_cube().mean("time")
+    standardized = [_StandardizedLoader(_slice_loader, baseline + shift, None, "") for shift in (0.0, 1.0)]
+    keys = {tile_key(loader, kwargs) for loader in standardized}
+    assert len(keys) == 2 and plain not in keys
+    assert tile_key(standardized[0], kwargs) == tile_key(
+        _StandardizedLoader(_slice_loader, baseline.copy(), None, ""), kwargs
+    )
+
+    def closure(index=None, **_kwargs):
+        return _make_cube().isel(time=[index])
+
+    for anonymous in (closure, lambda **_kw: None, _StandardizedLoader(closure, baseline, None, "")):
+        assert loader_token(anonymous) is None
+        with pytest.raises(ValueError, match="cache_token"):
+            tile_key(anonymous, kwargs)
+
+    cache = TileCache(tmp_path)
+    with pytest.warns(RuntimeWarning, match="cannot be identified"):
+        assert cache.wrap(closure) is closure
+    closure.cache_token = "closure-v1"
+    assert cache.wrap(closure)(index=1).sizes["time"] == 1
+
+
+def test_virtual_cube_reuses_cached_tiles(tmp_path):
+    cube = _make_cube()
+    calls = []
+
+    def loader(index=None, **_kwargs):
+        calls.append(index)
+        return cube.isel(time=[index])
+
+    loader.cache_token = "test-fake-cube"
+    cache = TileCache(tmp_path)
+    vc = VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata={},
+        loader=loader,
+        loader_kwargs={"variable": "fake"},
+        time_tiler=lambda _kw: ({"index": i} for i in range(4)),
+        spatial_tiler=lambda _kw: [{}],
+        tile_cache=cache,
+    )
+
+    mean = (pipe(vc) | v.mean(dim="time", keep_dim=False)).unwrap()
+    var = (pipe(vc) | v.variance(dim="time", keep_dim=False)).unwrap()
+
+    assert calls == [0, 1, 2, 3]
+    assert cache.misses == 4 and cache.hits == 4
+    xr.testing.assert_allclose(mean, cube.mean(dim="time").rename("mean"))
+    xr.testing.assert_allclose(var, cube.var(dim="time").rename("variance"))
+
+
+def test_tile_cache_evicts_least_recently_used(tmp_path):
+    cube = _make_cube()
+    cache = TileCache(tmp_path)
+    for idx in range(3):
+        cache.put(f"k{idx}", cube.isel(time=[idx]))
+        os.utime(cache.path_for(f"k{idx}"), (idx, idx))
+    paths = [cache.path_for(f"k{idx}") for idx in range(3)]
+
+    # Touch k0 so k1 becomes the oldest entry.
+    assert cache.get("k0") is not None
+    sizes = [path.stat().st_size for path in paths]
+    cache.max_bytes = sizes[0] + sizes[2]
+    cache.put("k2", cube.isel(time=[2]))
+
+    assert paths[0].exists()
+    assert not paths[1].exists() and cache.path_for("k1") is None
+    assert cache.info()["evictions"] == 1
+    assert cache.info()["tiles"] == 2
+
+
+def test_tiles_share_the_download_cache(tmp_path):
+    cube = _make_cube()
+    downloads = DownloadCache(tmp_path)
+    member = tmp_path / "fired.gpkg"
+    member.write_bytes(b"x" * 100)
+    downloads.put("https://example.org/fired.zip#fired.gpkg", member)
+
+    cache = TileCache(tmp_path)
+    cache.put("k0", cube.isel(time=[0]))
+    path = cache.path_for("k0")
+    assert path.parent.parent == tmp_path / "blobs"
+    assert any(entry["url"] == "tile:k0" for entry in downloads.entries())
+
+    path.write_bytes(b"corrupt")
+    assert cache.get("k0") is None and cache.path_for("k0") is None
+
+    cache.put("k1", cube.isel(time=[1]))
+    cache.clear()
+    assert cache.info()["tiles"] == 0
+    assert downloads.lookup("https://example.org/fired.zip#fired.gpkg") is not None
@@ -0,0 +1,92 @@
+"""Tests for the vectorized trend engine and the trend verb."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from cubedynamics import pipe, verbs as v
+from cubedynamics.stats.trend import mann_kendall, normal_two_sided_p, sample_pairs
+from cubedynamics.streaming import VirtualCube
+
+
+def _trend_cube(periods: int = 30) -> xr.DataArray:
+    rng = np.random.default_rng(0)
+    time = pd.date_range("1991-01-01", periods=periods, freq="YS")
+    years = np.arange(periods, dtype=float)
+    slopes = np.array([[0.0, 0.05], [0.2, -0.1]])
+    data = slopes[None] * years[:, None, None] + rng.normal(scale=0.05, size=(periods, 2, 2))
+    data[3, 1, 1] = np.nan
+    return xr.DataArray(
+        data,
+        dims=("time", "y", "x"),
+        coords={"time": time, "y": [40.0, 39.0], "x": [-106.0, -105.0]},
+        name="tmmx",
+    )
+
+
+def test_ols_trend_matches_polyfit_per_pixel():
+    cube = _trend_cube()
+    out = (pipe(cube) | v.trend("ols")).unwrap()
+
+    years = (cube.time - cube.time[0]).dt.days.values / 365.25
+    for iy in range(2):
+        for ix in range(2):
+            series = cube.values[:, iy, ix]
+            ok = np.isfinite(series)
+            slope, intercept = np.polyfit(years[ok], series[ok], 1)
+            np.testing.assert_allclose(out["slope"].values[iy, ix], slope, rtol=1e-10)
+            np.testing.assert_allclose(out["intercept"].values[iy, ix], intercept, atol=1e-10)
+    assert out["slope_stderr"].notnull().all()
+    assert out["p_value"].values[1, 0] < 1e-6
+
+
+def test_theil_sen_is_robust_and_subsampling_stays_close():
+    cube = _trend_cube(60)
+    cube[10, 0, 1] = 100.0
+    full = (pipe(cube) | v.trend("theil_sen", max_pairs=None)).unwrap()
+    sampled = (pipe(cube.chunk({"y": 1})) | v.trend("theil_sen", max_pairs=500)).unwrap()
+
+    assert "slope_stderr" not in full
+    np.testing.assert_allclose(full["slope"].values[0, 1], 0.05, atol=0.005)
+    np.testing.assert_allclose(sampled["slope"].values, full["slope"].values, atol=0.01)
+
+
+def test_mann_kendall_matches_direct_computation():
+    y = np.array([1.0, 3.0, 2.0, 5.0, 4.0, 6.0, 8.0, 7.0])
+    pairs = sample_pairs(y.size, None)
+    tau, p = mann_kendall(y[None], pairs)
+
+    s = sum(np.sign(y[j] - y[i]) for i in range(8) for j in range(i + 1, 8))
+    var_s = 8 * 7 * 21 / 18
+    z = (s - 1) / np.sqrt(var_s)
+    np.testing.assert_allclose(tau[0], s / 28)
+    np.testing.assert_allclose(p[0], normal_two_sided_p(z), rtol=1e-12)
+    np.testing.assert_allclose(normal_two_sided_p(1.959964), 0.05, atol=1e-6)
+
+
+def test_sample_pairs_are_unique_upper_triangle():
+    i, j = sample_pairs(50, 300, seed=1)
+    assert i.size == 300
+    assert np.all(i < j) and np.all(j < 50)
+    assert len(set(zip(i.tolist(), j.tolist()))) == 300
+
+
+def test_trend_on_virtual_cube_uses_spatial_tiles():
+    cube = _trend_cube()
+
+    def loader(x=None, **_):
+        return cube if x is None else cube.sel(x=[x])
+
+    vc = VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata={},
+        loader=loader,
+        loader_kwargs={},
+        time_tiler=lambda _kw: ({} for _ in [None]),
+        spatial_tiler=lambda _kw: ({"x": x} for x in cube.x.values),
+    )
+    streamed = (pipe(vc) | v.trend()).unwrap()
+    direct = (pipe(cube) | v.trend()).unwrap()
+    xr.testing.assert_allclose(streamed, direct)
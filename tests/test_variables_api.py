@@ -120,6 +120,42 @@ def test_temperature_anomaly_mean_centered(monkeypatch):
     np.testing.assert_allclose(anom.values, np.array([-1.0, 0.0, 1.0]))
 
 
+def test_temperature_anomaly_streams_a_baseline_window(monkeypatch):
+    from cubedynamics import variables
+    from cubedynamics.streaming import VirtualCube
+
+    time = pd.date_range("2000-01-01", periods=20, freq="D")
+    cube = xr.DataArray(
+        np.arange(20 * 4, dtype=float).reshape(20, 2, 2) ** 1.5,
+        coords={"time": time, "y": [1.0, 0.0], "x": [0.0, 1.0]},
+        dims=("time", "y", "x"),
+        name="tmmx",
+    )
+    loads = []
+
+    def fake_loader(**kwargs):
+        loads.append((pd.Timestamp(kwargs["start"]), pd.Timestamp(kwargs["end"])))
+        return cube.sel(time=slice(kwargs["start"], kwargs["end"]))
+
+    monkeypatch.setattr(variables, "_load_temperature", fake_loader)
+
+    anom = cd.temperature_anomaly(
+        bbox=[0.0, 0.0, 1.0, 1.0],
+        start="2000-01-01",
+        end="2000-01-20",
+        baseline_start="2000-01-03",
+        baseline_end="2000-01-08",
+        streaming_strategy="virtual",
+        time_chunk="5D",
+    )
+
+    assert isinstance(anom, VirtualCube)
+    assert all(t1 <= pd.Timestamp("2000-01-08") for _, t1 in loads)
+    assert loads[0][0] == pd.Timestamp("2000-01-03")
+    expected = cube - cube.sel(time=slice("2000-01-03", "2000-01-08")).mean("time")
+    xr.testing.assert_allclose(anom.materialize(), expected.transpose(*cube.dims))
+
+
 def test_ndvi_uses_sentinel_ndvi_helper(monkeypatch):
     called = {}
 
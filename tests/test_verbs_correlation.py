@@ -0,0 +1,118 @@
+"""Tests for the correlation verbs."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from cubedynamics import pipe, verbs as v
+
+
+def _cube(seed: int = 0, periods: int = 120) -> xr.DataArray:
+    rng = np.random.default_rng(seed)
+    time = pd.date_range("2001-01-01", periods=periods, freq="D")
+    return xr.DataArray(
+        rng.normal(size=(periods, 3, 4)),
+        dims=("time", "y", "x"),
+        coords={"time": time, "y": np.arange(3), "x": np.arange(4)},
+        name="ndvi",
+    )
+
+
+def test_reference_correlation_verb_adds_reference_dim():
+    cube = _cube()
+    out = (pipe(cube) | v.reference_correlation([(0, 1), (2, 3)])).unwrap()
+    assert out.dims == ("reference", "y", "x")
+    np.testing.assert_allclose(out.sel(reference="ref1", y=2, x=3).item(), 1.0)
+
+
+def _expected_matrix(cube: xr.DataArray) -> np.ndarray:
+    flat = cube.stack(pixel=("y", "x")).transpose("time", "pixel").values
+    return np.corrcoef(flat.T)
+
+
+def test_correlation_matrix_npy_matches_corrcoef_in_small_blocks(tmp_path):
+    cube = _cube(1)
+    out = (pipe(cube) | v.correlation_matrix(tmp_path / "corr.npy", memory_budget=12 * 64 * 3)).unwrap()
+
+    assert out.dims == ("pixel_i", "pixel_j")
+    np.testing.assert_allclose(out.values, _expected_matrix(cube), atol=1e-6)
+    assert out["y_i"].values.tolist() == [0] * 4 + [1] * 4 + [2] * 4
+
+
+def test_correlation_matrix_zarr_and_flattened_input(tmp_path):
+    cube = _cube(2)
+    flat = (pipe(cube) | v.flatten_space()).unwrap()
+    out = (pipe(flat) | v.correlation_matrix(tmp_path / "corr.zarr")).unwrap()
+    np.testing.assert_allclose(out.values, _expected_matrix(cube), atol=1e-6)
+
+
+def test_correlation_matrix_threshold_returns_sparse_edges():
+    cube = _cube(3)
+    cube[:, 0, 1] = cube[:, 2, 3] * 2.0 + 0.01 * cube[:, 1, 1]
+    edges = (pipe(cube) | v.correlation_matrix(threshold=0.9)).unwrap()
+
+    assert edges.sizes["edge"] == 1
+    edge = edges.isel(edge=0)
+    assert (int(edge["row"]), int(edge["col"])) == (1, 11)
+    assert float(edge["correlation"]) > 0.9
+    assert int(edges["indptr"][-1]) == 1
+    assert (int(edge["y_row"]), int(edge["x_row"])) == (0, 1)
+
+
+def test_correlation_matrix_threshold_blocks_match_dense_with_gaps(tmp_path):
+    cube = _cube(4)
+    cube[::7, 1, 2] = np.nan
+    cube[:30, 0, 0] = np.nan
+    dense = (pipe(cube) | v.correlation_matrix(tmp_path / "corr.npy")).unwrap().values
+    edges = (pipe(cube) | v.correlation_matrix(threshold=0.05, memory_budget=1)).unwrap()
+
+    i, j = np.nonzero(np.triu(np.abs(dense) >= 0.05, k=1))
+    np.testing.assert_array_equal(edges["row"].values, i)
+    np.testing.assert_array_equal(edges["col"].values, j)
+    np.testing.assert_allclose(edges["correlation"].values, dense[i, j], atol=1e-6)
+
+
+def test_lagged_correlation_matches_shifted_corr_and_finds_lead():
+    cube = _cube(4, periods=200)
+    driver = _cube(5, periods=200).rename("pr")
+    # NDVI follows precipitation seven days later.
+    cube = cube + 3.0 * driver.shift(time=7).fillna(0.0)
+    cube[20:25, 1, 2] = np.nan
+
+    out = (pipe(cube) | v.lagged_correlation(driver, max_lag=15, min_lag=-3)).unwrap()
+
+    assert out["correlation"].dims == ("lag", "y", "x")
+    assert out["lag"].values.tolist() == list(range(-3, 16))
+    for lag in (-2, 0, 7, 15):
+        expected = xr.corr(cube, driver.shift(time=lag), dim="time")
+        np.testing.assert_allclose(out["correlation"].sel(lag=lag).values, expected.values, atol=1e-6)
+    assert (out["best_lag"] == 7).all()
+
+    series = driver.isel(y=0, x=0, drop=True)
+    lazy = (pipe(cube.chunk({"y": 1})) | v.lagged_correlation(series, max_lag=5)).unwrap()
+    assert lazy["correlation"].chunks is not None
+    assert lazy["correlation"].compute().dims == ("lag", "y", "x")
+
+
+def test_lagged_correlation_blocks_numpy_pixels_and_shares_series_spectrum(monkeypatch):
+    from cubedynamics.stats import correlation as corr_mod
+
+    cube = _cube(6, periods=120)
+    series = _cube(7, periods=120).isel(y=0, x=0, drop=True).rename("pr")
+    whole = (pipe(cube) | v.lagged_correlation(series, max_lag=10)).unwrap()
+
+    transformed = []
+    spectra = corr_mod._lag_spectra
+    monkeypatch.setattr(
+        corr_mod, "_lag_spectra", lambda values, nfft: transformed.append(values.shape) or spectra(values, nfft)
+    )
+    blocked = (pipe(cube) | v.lagged_correlation(series, max_lag=10, memory_budget=20_000)).unwrap()
+
+    n_pixels = cube.sizes["y"] * cube.sizes["x"]
+    assert transformed[0] == (1, 120)
+    assert len(transformed) > 2
+    assert sum(shape[0] for shape in transformed[1:]) == n_pixels
+    assert max(shape[0] for shape in transformed[1:]) < n_pixels
+    xr.testing.assert_allclose(blocked["correlation"], whole["correlation"])
@@ -0,0 +1,95 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+from cubedynamics import pipe, verbs as v
+from cubedynamics.streaming import VirtualCube
+
+
+def _make_cube():
+    times = pd.date_range("2000-01-01", periods=8, freq="D")
+    data = np.arange(8 * 2 * 3, dtype=float).reshape(8, 2, 3)
+    return xr.DataArray(
+        data,
+        coords={"time": times, "y": np.arange(2), "x": np.arange(3)},
+        dims=("time", "y", "x"),
+        name="fake",
+    )
+
+
+class _TrackingLoader:
+    def __init__(self, cube):
+        self.cube = cube
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, index=None, **_kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        # Later tiles finish first to exercise ordering.
+        time.sleep(0.002 * (8 - index))
+        with self.lock:
+            self.active -= 1
+        return self.cube.isel(time=[index])
+
+
+def _virtual(loader, **kwargs):
+    return VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata={},
+        loader=loader,
+        loader_kwargs={},
+        time_tiler=lambda _kw: ({"index": i} for i in range(8)),
+        spatial_tiler=lambda _kw: [{}],
+        **kwargs,
+    )
+
+
+def test_prefetch_preserves_tile_order_and_results():
+    cube = _make_cube()
+    loader = _TrackingLoader(cube)
+    vc = _virtual(loader, max_workers=4, prefetch=4)
+
+    tiles = list(vc.iter_time_tiles())
+    assert [int(t.time.dt.day.item()) for t in tiles] == list(range(1, 9))
+    assert loader.peak > 1
+
+    streamed = (pipe(vc) | v.mean(dim="time", keep_dim=False)).unwrap()
+    xr.testing.assert_allclose(streamed, cube.mean(dim="time").rename("mean"))
+
+
+def test_memory_budget_limits_tiles_in_flight():
+    cube = _make_cube()
+    calls = []
+
+    def loader(index=None, **_kwargs):
+        calls.append(index)
+        return cube.isel(time=[index])
+
+    tile_bytes = cube.isel(time=[0]).nbytes
+    vc = _virtual(loader, max_workers=4, prefetch=4, memory_budget=tile_bytes)
+
+    for position, tile in enumerate(vc.iter_tiles()):
+        assert int(tile.time.dt.day.item()) == position + 1
+        # The first tile loads alone; afterwards only one unconsumed tile
+        # fits into the budget.
+        assert len(calls) <= position + 1
+
+
+def test_memory_budget_loads_first_tile_alone_before_widening():
+    cube = _make_cube()
+    loader = _TrackingLoader(cube)
+    tile_bytes = cube.isel(time=[0]).nbytes
+    vc = _virtual(loader, max_workers=4, prefetch=4, memory_budget=tile_bytes * 4)
+
+    tiles = vc.iter_tiles()
+    next(tiles)
+    assert loader.peak == 1
+    rest = list(tiles)
+    assert len(rest) == 7
+    assert loader.peak > 1
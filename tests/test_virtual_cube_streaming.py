@@ -104,3 +104,16 @@ def test_temperature_streaming_strategy(monkeypatch):
     )
     assert isinstance(virtual, VirtualCube)
     xr.testing.assert_allclose(virtual.materialize(), base)
+
+
+def _days_per_tile(start, end, freq):
+    days = pd.date_range(start, end, freq="D")
+    tiles = list(make_time_tiler(start, end, freq=freq, inclusive=False)({}))
+    return [int(((days >= t["start"]) & (days <= t["end"])).sum()) for t in tiles], tiles
+
+
+def test_exclusive_time_tiles_stay_within_freq_when_end_is_a_boundary():
+    counts, tiles = _days_per_tile("2000-01-01", "2000-01-21", "10D")
+    assert counts == [10, 10, 1]
+    assert tiles[-1] == {"start": pd.Timestamp("2000-01-21"), "end": pd.Timestamp("2000-01-21")}
+    assert _days_per_tile("2000-01-01", "2000-01-25", "10D")[0] == [10, 10, 5]
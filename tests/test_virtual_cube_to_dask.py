@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from cubedynamics import pipe, verbs as v
+from cubedynamics.streaming import VirtualCube, make_time_tiler
+from tests.helpers.virtual_cubes import make_cube, tiled_virtual_cube
+
+dsa = pytest.importorskip("dask.array")
+
+
+def test_to_dask_is_lazy_with_one_chunk_per_tile():
+    cube = make_cube()
+    calls = []
+    lazy = tiled_virtual_cube(cube, calls).to_dask()
+
+    assert isinstance(lazy.data, dsa.Array)
+    assert lazy.chunks == ((3, 3), (2, 2), (3,))
+    assert calls == []
+
+    xr.testing.assert_identical(lazy.compute(), cube)
+    assert sorted(calls) == [(0, 0), (0, 2), (3, 0), (3, 2)]
+
+
+def test_to_dask_feeds_existing_verbs():
+    cube = make_cube()
+    lazy = tiled_virtual_cube(cube, []).to_dask()
+    result = (pipe(lazy) | v.anomaly(dim="time")).unwrap()
+    xr.testing.assert_allclose(result.compute(), cube - cube.mean("time"))
+
+
+def test_to_dask_without_probe_reads_layout_from_tiles():
+    cube = make_cube()
+    calls = []
+    lazy = tiled_virtual_cube(cube, calls, probe=False).to_dask()
+    assert len(calls) == 4
+    assert lazy.chunks == ((3, 3), (2, 2), (3,))
+    xr.testing.assert_allclose(lazy.compute(), cube)
+
+
+def test_to_dask_drops_boundary_labels_shared_by_inclusive_tiles():
+    cube = make_cube()
+    calls = []
+
+    def loader(start=None, end=None, **_kwargs):
+        calls.append((start, end))
+        return cube.sel(time=slice(start, end))
+
+    virtual = VirtualCube(
+        dims=("time", "y", "x"),
+        coords_metadata={"name": "tmmx"},
+        loader=loader,
+        loader_kwargs={},
+        time_tiler=make_time_tiler("2000-01-01", "2000-01-06", freq="2D"),
+        spatial_tiler=lambda _kw: [{}],
+        coords_probe=lambda start=None, end=None, **_kw: {
+            "time": cube.time.sel(time=slice(start, end)).values,
+            "y": cube.y.values,
+            "x": cube.x.values,
+        },
+    )
+    lazy = virtual.to_dask()
+    assert calls == []
+    assert lazy.chunks[0] == (3, 2, 1)
+    xr.testing.assert_identical(lazy.compute(), cube)
+
+
+def test_temperature_to_dask_defers_every_load(monkeypatch):
+    from cubedynamics import variables
+
+    monkeypatch.setattr(variables, "estimate_cube_size", lambda *args, **kwargs: 1e12)
+    temp = variables.temperature(
+        bbox=[-105.5, 39.5, -104.5, 40.5],
+        start="2020-01-01",
+        end="2020-01-20",
+        freq="D",
+        show_progress=False,
+        streaming_strategy="virtual",
+        time_chunk="10D",
+        spatial_tile=1.0,
+    )
+    calls = []
+    loader = temp.loader
+    temp.loader = lambda **kwargs: calls.append(kwargs) or loader(**kwargs)
+
+    lazy = temp.to_dask()
+    assert calls == []
+    assert lazy.chunks[0] == (10, 10)
+    assert not np.isnan(lazy.values).any()
+    assert len(calls) == 2
@@ -0,0 +1,70 @@
+import pytest
+import xarray as xr
+
+from tests.helpers.virtual_cubes import make_cube, tiled_virtual_cube
+
+zarr = pytest.importorskip("zarr")
+
+
+def test_to_zarr_streams_tiles_into_regions(tmp_path):
+    cube = make_cube()
+    calls = []
+    store = tiled_virtual_cube(cube, calls).to_zarr(tmp_path / "cube.zarr")
+
+    written = xr.open_zarr(store)["tmmx"].load()
+    xr.testing.assert_allclose(written, cube)
+    assert len(calls) == 4
+
+
+def test_to_zarr_resumes_after_interruption(tmp_path):
+    cube = make_cube()
+    store = tmp_path / "cube.zarr"
+    calls = []
+    with pytest.raises(RuntimeError):
+        tiled_virtual_cube(cube, calls, fail_on=(3, 0)).to_zarr(store)
+    assert calls == [(0, 0), (0, 2)]
+
+    calls.clear()
+    tiled_virtual_cube(cube, calls).to_zarr(store)
+    assert calls == [(3, 0), (3, 2)]
+    xr.testing.assert_allclose(xr.open_zarr(store)["tmmx"].load(), cube)
+
+
+def test_to_zarr_lays_out_store_from_coords_metadata(tmp_path):
+    cube = make_cube()
+    calls = []
+    coords = {dim: cube[dim].values for dim in cube.dims}
+    virtual = tiled_virtual_cube(cube, calls, probe=False, coords_metadata={"coords": coords})
+    store = virtual.to_zarr(tmp_path / "cube.zarr")
+    assert len(calls) == 4
+    xr.testing.assert_allclose(xr.open_zarr(store)["tmmx"].load(), cube)
+
+
+def test_resume_loads_only_missing_tiles_without_probe(tmp_path):
+    cube = make_cube()
+    store = tmp_path / "cube.zarr"
+    with pytest.raises(RuntimeError):
+        tiled_virtual_cube(cube, [], fail_on=(3, 0)).to_zarr(store)
+
+    calls = []
+    tiled_virtual_cube(cube, calls, probe=False).to_zarr(store)
+    assert calls == [(3, 0), (3, 2)]
+    xr.testing.assert_allclose(xr.open_zarr(store)["tmmx"].load(), cube)
+
+
+def test_each_written_tile_leaves_its_own_marker(tmp_path):
+    cube = make_cube()
+    store = tmp_path / "cube.zarr"
+    tiled_virtual_cube(cube, []).to_zarr(store)
+
+    markers = sorted(p.name for p in (store / ".cubedynamics_written_tiles").iterdir())
+    assert len(markers) == 4
+    assert all(p.stat().st_size == 0 for p in (store / ".cubedynamics_written_tiles").iterdir())
+
+    calls = []
+    tiled_virtual_cube(cube, calls).to_zarr(store)
+    assert calls == []
+
+    tiled_virtual_cube(cube, calls).to_zarr(store, resume=False)
+    assert len(calls) == 4
+    assert sorted(p.name for p in (store / ".cubedynamics_written_tiles").iterdir()) == markers